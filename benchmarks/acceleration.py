@@ -0,0 +1,44 @@
+import json
+import os
+import sys
+import tempfile
+import time
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.acceleration import AccelerationSettings
+from core.engine import DownloadEngine, DownloadTask, EngineListener
+from benchmarks.media_server import MediaServer
+
+class MetricsListener(EngineListener):
+    def __init__(self):
+        self.metrics={}
+    def on_metrics(self,task_id,metrics):
+        self.metrics[task_id]=metrics
+
+def download(url,folder,fragments):
+    listener=MetricsListener()
+    engine=DownloadEngine(1,listener,acceleration=AccelerationSettings(fragments))
+    task=DownloadTask(url,"720p",os.path.join(folder,str(fragments)))
+    engine.submit(task)
+    started=time.perf_counter()
+    engine.wait()
+    metrics=listener.metrics.get(task.task_id,{})
+    return {"seconds":round(time.perf_counter()-started,3),"throughput_kb_s":round(metrics.get("throughput",0)/1024,1)}
+
+def run(fragment_counts=(1,2,4,8),segments=16,segment_size=128*1024,connection_rate=512*1024):
+    results={}
+    cwd=os.getcwd()
+    with tempfile.TemporaryDirectory() as directory, MediaServer(rate=connection_rate) as server:
+        os.chdir(directory)
+        try:
+            url=server.add_hls(segments=segments,segment_size=segment_size)
+            for fragments in fragment_counts:
+                results[fragments]=download(url,directory,fragments)
+        finally:
+            os.chdir(cwd)
+    baseline=results[fragment_counts[0]]["seconds"]
+    for result in results.values():
+        result["gain"]=round(baseline/result["seconds"],2)
+    return results
+
+if __name__=="__main__":
+    print(json.dumps(run(),indent=4))
@@ -0,0 +1,46 @@
+import json
+import os
+import sys
+import time
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.engine import DownloadTask
+from core.scheduler import DownloadScheduler
+
+def per_task_us(started,count):
+    return round((time.perf_counter()-started)*1000000/count,3)
+
+def run(count=10000,max_concurrent=4):
+    started_tasks=[]
+    scheduler=DownloadScheduler(max_concurrent,started_tasks.append)
+    tasks=[DownloadTask("https://youtu.be/%011d"%index,"720p","downloads",priority=index%3+1) for index in range(count)]
+    results={"queued":count}
+    started=time.perf_counter()
+    for task in tasks:
+        scheduler.submit(task)
+    results["submit_us_per_task"]=per_task_us(started,count)
+    started=time.perf_counter()
+    for task in tasks[::2]:
+        scheduler.set_priority(task.task_id,1)
+    results["reprioritize_us_per_task"]=per_task_us(started,count//2)
+    started=time.perf_counter()
+    for _ in range(100):
+        scheduler.count("queued")
+    results["count_queued_ms"]=round((time.perf_counter()-started)*10,3)
+    started=time.perf_counter()
+    dispatched=0
+    while scheduler.running:
+        scheduler.finish(next(iter(scheduler.running)))
+        dispatched+=1
+    results["dispatch_us_per_task"]=per_task_us(started,dispatched)
+    results["dispatched"]=dispatched
+    held=DownloadScheduler(max_concurrent)
+    for task in tasks:
+        held.submit(task,hold=True)
+    started=time.perf_counter()
+    held.release_held()
+    results["release_held_ms"]=round((time.perf_counter()-started)*1000,3)
+    return results
+
+if __name__=="__main__":
+    count=int(sys.argv[1]) if len(sys.argv)>1 else 10000
+    print(json.dumps(run(count),indent=4))
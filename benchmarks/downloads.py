@@ -0,0 +1,69 @@
+import json
+import os
+import sys
+import tempfile
+import time
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.engine import DownloadEngine, DownloadTask, EngineListener
+from benchmarks.media_server import MediaServer
+
+class BenchmarkListener(EngineListener):
+    def __init__(self):
+        self.statuses={}
+        self.metrics={}
+    def on_status(self,task_id,status):
+        self.statuses[task_id]=status
+    def on_metrics(self,task_id,metrics):
+        self.metrics[task_id]=metrics
+
+def download_all(urls,folder,workers):
+    listener=BenchmarkListener()
+    engine=DownloadEngine(workers,listener)
+    started=time.perf_counter()
+    tasks=[DownloadTask(url,"720p",folder,output_format="mp4") for url in urls]
+    for task in tasks:
+        engine.submit(task)
+    engine.wait()
+    seconds=time.perf_counter()-started
+    failed=sum(1 for task in tasks if listener.statuses.get(task.task_id)!="Download Completed")
+    if failed:
+        raise RuntimeError(str(failed)+" of "+str(len(tasks))+" benchmark downloads failed")
+    return seconds,[listener.metrics[task.task_id] for task in tasks]
+
+def single_download(server,folder,size,rate,latency):
+    server.set_rate(rate)
+    server.set_latency(latency)
+    name="single-%d-%s-%s"%(size,rate,latency)
+    seconds,(metrics,)=download_all([server.add_video(name,size)],os.path.join(folder,name),1)
+    return {"seconds":round(seconds,3),"extract_seconds":metrics["extract"],"first_byte_seconds":metrics["first_byte"],"throughput_kb_s":round(metrics["throughput"]/1024,1)}
+
+def concurrency_scaling(server,folder,files,size,rate,workers):
+    server.set_rate(rate)
+    server.set_latency(0)
+    urls=[server.add_video("scale-%d"%index,size) for index in range(files)]
+    results={}
+    for count in workers:
+        seconds,_=download_all(urls,os.path.join(folder,"workers-%d"%count),count)
+        results[count]={"seconds":round(seconds,3),"throughput_kb_s":round(files*size/seconds/1024,1)}
+    baseline=results[workers[0]]["throughput_kb_s"]
+    for count,result in results.items():
+        result["gain"]=round(result["throughput_kb_s"]/baseline,2)
+    return results
+
+def run(sizes=(1024**2,8*1024**2),rates=(None,2*1024**2),latency=0.05,files=10,scale_size=1024**2,scale_rate=2*1024**2,workers=(1,2,4,6,8,10)):
+    results={"single":{},"scaling":{}}
+    cwd=os.getcwd()
+    with tempfile.TemporaryDirectory() as directory, MediaServer() as server:
+        os.chdir(directory)
+        try:
+            single_download(server,directory,64*1024,None,0)
+            for size in sizes:
+                for rate in rates:
+                    results["single"]["%d_kb_%s"%(size//1024,"%d_kb_s"%(rate//1024) if rate else "uncapped")]=single_download(server,directory,size,rate,latency)
+            results["scaling"]=concurrency_scaling(server,directory,files,scale_size,scale_rate,workers)
+        finally:
+            os.chdir(cwd)
+    return results
+
+if __name__=="__main__":
+    print(json.dumps(run(),indent=4))
@@ -0,0 +1,94 @@
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM","offscreen")
+from core.history import HistoryStore
+
+QUERIES=["rick","never gonna","zzz-no-match","channel 42","download completed","youtu"]
+FIRST_QUERY_TARGET_MS=5.0
+
+def fill_store(store,count):
+    store.add_many({"title":"Video %d never gonna give"%index if index%97==0 else "Video %d"%index,"channel":"Channel %d"%(index%500),"url":"https://www.youtube.com/watch?v=%011d"%index,"status":"Download Completed" if index%3 else "Download Error"} for index in range(count))
+
+def time_queries(search):
+    timings={}
+    for query in QUERIES:
+        samples=[]
+        for _ in range(5):
+            started=time.perf_counter()
+            search(query)
+            samples.append((time.perf_counter()-started)*1000)
+        timings[query]=round(statistics.median(samples),3)
+    return timings
+
+def run(count=100000,legacy=False):
+    from PyQt5.QtWidgets import QApplication
+    from ui.history_model import HistoryTableModel
+    application=QApplication.instance() or QApplication([])
+    results={"rows":count}
+    with tempfile.TemporaryDirectory() as directory:
+        store=HistoryStore(os.path.join(directory,"history.db"))
+        fill_store(store,count)
+        model=HistoryTableModel(store,["Title","Channel","URL","Status"])
+        started=time.perf_counter()
+        model.refresh()
+        results["model_first_page_ms"]=round((time.perf_counter()-started)*1000,3)
+        started=time.perf_counter()
+        deadline=time.time()+60
+        while model.search_index is None and time.time()<deadline:
+            application.processEvents()
+            time.sleep(0.001)
+        if model.search_index is None:
+            raise RuntimeError("history index was not built within 60 s")
+        results["index_build_ms"]=round((time.perf_counter()-started)*1000,3)
+        first={}
+        for query in QUERIES:
+            started=time.perf_counter()
+            model.set_filter(query)
+            first[query]=round((time.perf_counter()-started)*1000,3)
+        results["first_query_ms"]=first
+        results["search_ms"]=time_queries(model.set_filter)
+        model.set_filter("")
+        keystrokes=[]
+        for length in range(1,len("never gonna")+1):
+            started=time.perf_counter()
+            model.set_filter("never gonna"[:length])
+            keystrokes.append((time.perf_counter()-started)*1000)
+        results["keystroke_ms"]={"max":round(max(keystrokes),3),"mean":round(statistics.mean(keystrokes),3)}
+        if legacy:
+            results["legacy"]=run_legacy(store.entries())
+        store.close()
+    slowest=max(first,key=first.get)
+    if first[slowest]>FIRST_QUERY_TARGET_MS:
+        raise RuntimeError("first query for "+repr(slowest)+" took "+str(first[slowest])+" ms at "+str(count)+" rows, target is "+str(FIRST_QUERY_TARGET_MS)+" ms")
+    return results
+
+def run_legacy(entries):
+    from PyQt5.QtWidgets import QTableWidget, QTableWidgetItem
+    table=QTableWidget()
+    table.setColumnCount(4)
+    started=time.perf_counter()
+    for entry in entries:
+        row=table.rowCount()
+        table.insertRow(row)
+        for column,field in enumerate(("title","channel","url","status")):
+            table.setItem(row,column,QTableWidgetItem(entry[field]))
+    populate_ms=round((time.perf_counter()-started)*1000,3)
+    def search(text):
+        for row in range(table.rowCount()):
+            hide=True
+            for column in range(table.columnCount()):
+                item=table.item(row,column)
+                if item and text in item.text().lower():
+                    hide=False
+                    break
+            table.setRowHidden(row,hide)
+    return {"populate_ms":populate_ms,"search_ms":time_queries(search)}
+
+if __name__=="__main__":
+    count=int(sys.argv[1]) if len(sys.argv)>1 else 100000
+    print(json.dumps(run(count,"--legacy" in sys.argv),indent=4))
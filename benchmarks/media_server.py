@@ -0,0 +1,158 @@
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class MediaRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self.respond(head=True)
+
+    def do_GET(self):
+        self.respond(head=False)
+
+    def respond(self, head):
+        server = self.server
+        path = self.path.split("?", 1)[0]
+        if server.latency:
+            time.sleep(server.latency)
+        with server.lock:
+            server.requests.append((path, self.headers.get("Range")))
+            failure = server.failures.get(path)
+            if failure:
+                server.failures[path] = (failure[0] - 1, failure[1]) if failure[0] > 1 else None
+        if failure:
+            self.send_error(failure[1])
+            return
+        if path not in server.files:
+            self.send_error(404)
+            return
+        body, content_type = server.files[path]
+        start, end = 0, len(body) - 1
+        match = re.match(r"bytes=(\d*)-(\d*)$", self.headers.get("Range") or "")
+        if match and server.ranges:
+            if match.group(1):
+                start = int(match.group(1))
+                end = min(int(match.group(2)), end) if match.group(2) else end
+            else:
+                start = max(len(body) - int(match.group(2)), 0)
+            if start > end:
+                self.send_response(416)
+                self.send_header("Content-Range", "bytes */%d" % len(body))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", "bytes %d-%d/%d" % (start, end, len(body)))
+        else:
+            self.send_response(200)
+        if server.ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        if not head:
+            self.send_body(body[start:end + 1])
+
+    def send_body(self, data):
+        rate = self.server.rate
+        block = self.server.block_size
+        started = time.monotonic()
+        sent = 0
+        try:
+            while sent < len(data):
+                chunk = data[sent:sent + block]
+                self.wfile.write(chunk)
+                sent += len(chunk)
+                if rate:
+                    delay = sent / rate - (time.monotonic() - started)
+                    if delay > 0:
+                        time.sleep(delay)
+                if self.server.stop_after is not None and sent >= self.server.stop_after:
+                    self.close_connection = True
+                    return
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+class MediaHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass
+
+class MediaServer:
+    def __init__(self, rate=None, ranges=True, block_size=16 * 1024, latency=0):
+        self.httpd = MediaHTTPServer(("127.0.0.1", 0), MediaRequestHandler)
+        self.httpd.files = {}
+        self.httpd.requests = []
+        self.httpd.lock = threading.Lock()
+        self.httpd.rate = rate
+        self.httpd.ranges = ranges
+        self.httpd.block_size = block_size
+        self.httpd.stop_after = None
+        self.httpd.failures = {}
+        self.httpd.latency = latency
+        self.thread = None
+
+    @property
+    def requests(self):
+        with self.httpd.lock:
+            return list(self.httpd.requests)
+
+    def set_rate(self, rate):
+        self.httpd.rate = rate
+
+    def set_latency(self, latency):
+        self.httpd.latency = latency
+
+    def drop_connections_after(self, size):
+        self.httpd.stop_after = size
+
+    def fail_requests(self, path, count=1, code=503):
+        self.httpd.failures[path] = (count, code)
+
+    def add_file(self, path, data=None, size=None, content_type="video/mp4"):
+        if data is None:
+            data = os.urandom(size)
+        self.httpd.files[path] = (data, content_type)
+        return self.url(path)
+
+    def add_hls(self, name="stream", segments=8, segment_size=64 * 1024, duration=4):
+        lines = ["#EXTM3U", "#EXT-X-VERSION:3", "#EXT-X-TARGETDURATION:%d" % duration, "#EXT-X-MEDIA-SEQUENCE:0"]
+        for index in range(segments):
+            segment = "/%s/segment%04d.ts" % (name, index)
+            self.add_file(segment, size=segment_size, content_type="video/mp2t")
+            lines.append("#EXTINF:%d.0," % duration)
+            lines.append(segment)
+        lines.append("#EXT-X-ENDLIST")
+        return self.add_file("/%s.m3u8" % name, ("\n".join(lines) + "\n").encode(), content_type="application/vnd.apple.mpegurl")
+
+    def add_video(self, name, size, title=None, channel="Media Server"):
+        media_url = self.add_file("/media/%s.mp4" % name, size=size)
+        video = {"@context": "https://schema.org", "@type": "VideoObject", "name": title or name, "contentUrl": media_url, "author": {"@type": "Person", "name": channel}, "uploadDate": "2026-01-01"}
+        page = "<html><head><title>%s</title><script type=\"application/ld+json\">%s</script></head><body></body></html>" % (title or name, json.dumps(video))
+        return self.add_file("/watch/%s" % name, page.encode(), content_type="text/html")
+
+    def url(self, path):
+        return "http://127.0.0.1:%d%s" % (self.httpd.server_address[1], path)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
@@ -0,0 +1,62 @@
+import json
+import os
+import sys
+import tempfile
+import time
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.profile import UserProfile
+
+class LegacyProfile:
+    def __init__(self,profile_path):
+        self.profile_path=profile_path
+        self.data={"name":"","theme":"Dark","rate_limit":None,"history":[]}
+        self.write_count=0
+    def save_profile(self):
+        with open(self.profile_path,"w",encoding="utf-8") as f:
+            json.dump(self.data,f,indent=4)
+        self.write_count+=1
+    def set_rate_limit(self,rate_limit):
+        self.data["rate_limit"]=rate_limit
+        self.save_profile()
+    def add_history_entry(self,title,channel,url,status):
+        self.data["history"].append({"title":title,"channel":channel,"url":url,"status":status})
+        self.save_profile()
+    def update_history_entry(self,url,new_title,new_channel,new_status=None):
+        for entry in self.data["history"]:
+            if entry["url"]==url:
+                entry["title"]=new_title
+                entry["channel"]=new_channel
+                if new_status is not None:
+                    entry["status"]=new_status
+        self.save_profile()
+
+def simulate_import(profile,count):
+    urls=["https://www.youtube.com/watch?v=%011d"%index for index in range(count)]
+    for url in urls:
+        profile.add_history_entry("Fetching...","Fetching...",url,"Queued")
+    for index,url in enumerate(urls):
+        profile.update_history_entry(url,"Title %d"%index,"Channel")
+        if index%50==0:
+            profile.set_rate_limit(str(index)+"K")
+    for url in urls:
+        profile.update_history_entry(url,"Title","Channel","Download Completed")
+
+def run(count=500):
+    results={}
+    with tempfile.TemporaryDirectory() as directory:
+        legacy=LegacyProfile(os.path.join(directory,"legacy.json"))
+        started=time.perf_counter()
+        simulate_import(legacy,count)
+        results["before"]={"profile_writes":legacy.write_count,"history_commits":0,"seconds":round(time.perf_counter()-started,4)}
+        profile=UserProfile(os.path.join(directory,"profile.json"),save_delay=0.5)
+        profile.flush()
+        profile.write_count=0
+        started=time.perf_counter()
+        simulate_import(profile,count)
+        profile.close()
+        results["after"]={"profile_writes":profile.write_count,"history_commits":profile.history.write_count,"seconds":round(time.perf_counter()-started,4)}
+    return results
+
+if __name__=="__main__":
+    count=int(sys.argv[1]) if len(sys.argv)>1 else 500
+    print(json.dumps(run(count),indent=4))
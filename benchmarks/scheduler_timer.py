@@ -0,0 +1,38 @@
+import datetime
+import json
+import os
+import sys
+import time
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.timer_scheduler import TimerScheduler, format_time, parse_time
+
+def build(count,now):
+    rows=[]
+    scheduler=TimerScheduler()
+    for index in range(count):
+        data={"time":format_time(now+datetime.timedelta(minutes=index+1)),"url":"https://youtu.be/%011d"%index,"recurrence":"daily" if index%2 else None}
+        rows.append([data["time"],"Scheduled"])
+        scheduler.add(index,data)
+    return rows,scheduler
+
+def scan_tick(rows,now):
+    return [row for row in rows if parse_time(row[0])<=now and row[1]=="Scheduled"]
+
+def run(counts=(100,1000,10000),ticks=60):
+    now=datetime.datetime(2026,1,1)
+    results={}
+    for count in counts:
+        rows,scheduler=build(count,now)
+        started=time.perf_counter()
+        for tick in range(ticks):
+            scan_tick(rows,now+datetime.timedelta(seconds=10*tick))
+        scan_ms=(time.perf_counter()-started)*1000/ticks
+        started=time.perf_counter()
+        for tick in range(ticks):
+            scheduler.pop_due(now+datetime.timedelta(minutes=tick,seconds=30))
+        heap_ms=(time.perf_counter()-started)*1000/ticks
+        results[count]={"table_scan_ms_per_tick":round(scan_ms,3),"heap_ms_per_wakeup":round(heap_ms,4)}
+    return results
+
+if __name__=="__main__":
+    print(json.dumps(run(),indent=4))
@@ -0,0 +1,75 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM","offscreen")
+from core.progress import ProgressAggregator
+
+def drain(application,done,timeout=60):
+    deadline=time.monotonic()+timeout
+    while not done() and time.monotonic()<deadline:
+        application.processEvents()
+    if not done():
+        raise RuntimeError("signals were not delivered within "+str(timeout)+" s")
+
+def time_signal(application,signal,args,count):
+    from PyQt5.QtCore import QObject
+    class Receiver(QObject):
+        def __init__(self):
+            super().__init__()
+            self.received=0
+        def receive(self,*values):
+            self.received+=1
+    receiver=Receiver()
+    signal.connect(receiver.receive)
+    emitted={}
+    def emit():
+        started=time.perf_counter()
+        try:
+            for index in range(count):
+                signal.emit(*args(index))
+        except Exception as e:
+            emitted["error"]=e
+            return
+        emitted["seconds"]=time.perf_counter()-started
+        emitted["finished"]=time.perf_counter()
+    started=time.perf_counter()
+    thread=threading.Thread(target=emit)
+    thread.start()
+    drain(application,lambda:receiver.received==count or "error" in emitted)
+    thread.join()
+    if "error" in emitted:
+        signal.disconnect(receiver.receive)
+        raise emitted["error"]
+    total=time.perf_counter()-started
+    signal.disconnect(receiver.receive)
+    return {"emit_us_per_event":round(emitted["seconds"]*1000000/count,3),"delivered_us_per_event":round(total*1000000/count,3),"drain_ms_after_last_emit":round(max(time.perf_counter()-emitted["finished"],0)*1000,3)}
+
+def time_aggregator(count,tasks=10):
+    progress=ProgressAggregator()
+    def update():
+        for index in range(count):
+            progress.update(index%tasks,index%tasks,index,count,1024.0,1)
+    started=time.perf_counter()
+    thread=threading.Thread(target=update)
+    thread.start()
+    thread.join()
+    seconds=time.perf_counter()-started
+    started=time.perf_counter()
+    for _ in range(1000):
+        progress.snapshot(force=True)
+    return {"update_us_per_event":round(seconds*1000000/count,3),"snapshot_us":round((time.perf_counter()-started)*1000,3)}
+
+def run(count=100000):
+    from PyQt5.QtWidgets import QApplication
+    from core.downloader import WorkerSignals
+    application=QApplication.instance() or QApplication([])
+    signals=WorkerSignals()
+    return {"events":count,"progress_signal":time_signal(application,signals.progress,lambda index:(index%10,index/count*100,1024.0,1),count),"log_signal":time_signal(application,signals.log,lambda index:("line %d"%index,logging.INFO),count),"aggregator":time_aggregator(count)}
+
+if __name__=="__main__":
+    count=int(sys.argv[1]) if len(sys.argv)>1 else 100000
+    print(json.dumps(run(count),indent=4))
@@ -0,0 +1,127 @@
+import argparse
+import importlib
+import json
+import os
+import platform
+import re
+import sys
+import time
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BENCHMARKS={
+    "downloads":({},{"sizes":(256*1024,),"rates":(None,1024**2),"latency":0.02,"files":4,"scale_size":256*1024,"scale_rate":1024**2,"workers":(1,2,4)}),
+    "dispatch":({},{"count":2000}),
+    "signals":({},{"count":10000}),
+    "profile_writes":({},{"count":100}),
+    "history_search":({},{"count":5000}),
+    "scheduler_timer":({},{"counts":(100,1000),"ticks":10}),
+    "acceleration":({},{"fragment_counts":(1,4),"segments":8,"segment_size":64*1024}),
+}
+HIGHER_IS_BETTER=("throughput","gain")
+LOWER_IS_BETTER=("ms","us","seconds","writes","commits")
+NOISE_FLOORS={"ms":2.0,"us":1.0,"seconds":0.05}
+BASELINE_DIR=os.path.join(os.path.dirname(os.path.abspath(__file__)),"baselines")
+
+def flatten(results,prefix=""):
+    values={}
+    for key,value in results.items():
+        path=prefix+str(key)
+        if isinstance(value,dict):
+            values.update(flatten(value,path+"."))
+        elif isinstance(value,(int,float)) and not isinstance(value,bool):
+            values[path]=value
+    return values
+
+def direction(path):
+    tokens=re.split(r"[._]",path)
+    if any(token in HIGHER_IS_BETTER for token in tokens):
+        return 1
+    if any(token in LOWER_IS_BETTER for token in tokens):
+        return -1
+    return 0
+
+def noise_floor(path):
+    return max((NOISE_FLOORS.get(token,0) for token in re.split(r"[._]",path)),default=0)
+
+def compare(baseline,current,tolerance=0.25):
+    rows=[]
+    old_values=flatten(baseline)
+    for path,value in flatten(current).items():
+        sign=direction(path)
+        old=old_values.get(path)
+        if not sign or old is None:
+            continue
+        change=(value-old)/abs(old) if old else 0
+        worse=-sign*(value-old)
+        if worse>abs(old)*tolerance and worse>noise_floor(path):
+            verdict="regression"
+        elif -worse>abs(old)*tolerance and -worse>noise_floor(path):
+            verdict="improvement"
+        else:
+            verdict="ok"
+        rows.append({"metric":path,"baseline":old,"current":value,"change":round(change,3),"verdict":verdict})
+    return rows
+
+def baseline_path(name,quick=False,directory=BASELINE_DIR):
+    return os.path.join(directory,name+("-quick" if quick else "")+".json")
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path,"r",encoding="utf-8") as f:
+        return json.load(f)
+
+def save_baseline(path,results):
+    os.makedirs(os.path.dirname(path),exist_ok=True)
+    data={"recorded_at":time.strftime("%Y-%m-%dT%H:%M:%S"),"python":platform.python_version(),"machine":platform.platform(),"results":results}
+    temp_path=path+".tmp"
+    with open(temp_path,"w",encoding="utf-8") as f:
+        json.dump(data,f,indent=4,sort_keys=True)
+    os.replace(temp_path,path)
+
+def run_benchmark(name,quick=False):
+    module=importlib.import_module("benchmarks."+name)
+    full,small=BENCHMARKS[name]
+    started=time.perf_counter()
+    results=module.run(**(small if quick else full))
+    return json.loads(json.dumps(results)),time.perf_counter()-started
+
+def format_row(row):
+    return "  "+row["verdict"].upper().ljust(12)+row["metric"].ljust(48)+str(row["baseline"]).rjust(12)+" -> "+str(row["current"]).ljust(12)+f"{row['change']*100:+.1f}%"
+
+def main(argv=None):
+    parser=argparse.ArgumentParser(description="Run the offline benchmarks and compare them with saved JSON baselines")
+    parser.add_argument("names",nargs="*",metavar="NAME",help="benchmarks to run (default: all of "+", ".join(BENCHMARKS)+")")
+    parser.add_argument("--quick",action="store_true",help="small workloads for a fast smoke run; compared against separate -quick baselines")
+    parser.add_argument("--save",action="store_true",help="store these results as the new baselines")
+    parser.add_argument("--tolerance",type=float,default=0.25,help="relative change that counts as a regression (default: 0.25)")
+    parser.add_argument("--baselines",default=BASELINE_DIR,help="folder holding the baseline JSON files")
+    parser.add_argument("--output",help="also write all results and comparisons to this JSON file")
+    args=parser.parse_args(argv)
+    unknown=[name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error("unknown benchmark: "+", ".join(unknown))
+    report={}
+    regressions=0
+    for name in args.names or BENCHMARKS:
+        results,seconds=run_benchmark(name,args.quick)
+        path=baseline_path(name,args.quick,args.baselines)
+        baseline=load_baseline(path)
+        rows=compare(baseline["results"],results,args.tolerance) if baseline else []
+        report[name]={"seconds":round(seconds,3),"results":results,"comparison":rows}
+        changed=[row for row in rows if row["verdict"]!="ok"]
+        regressions+=sum(1 for row in rows if row["verdict"]=="regression")
+        print(f"{name}: {seconds:.1f} s, "+(f"{len(rows)} metrics compared, {len(changed)} changed" if baseline else "no baseline"))
+        for row in changed:
+            print(format_row(row))
+        if args.save:
+            save_baseline(path,results)
+    if args.output:
+        with open(args.output,"w",encoding="utf-8") as f:
+            json.dump(report,f,indent=4)
+    if regressions:
+        print(str(regressions)+" regression(s) beyond "+f"{args.tolerance*100:.0f}%")
+    return 1 if regressions else 0
+
+if __name__=="__main__":
+    sys.exit(main())
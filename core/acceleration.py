@@ -0,0 +1,64 @@
+import shutil
+from core.utils import parse_rate
+
+EXTERNAL_DOWNLOADER_ARGS={"aria2c":["--min-split-size=1M","--max-connection-per-server={connections}","--split={connections}"],"axel":["--num-connections={connections}"]}
+
+class AccelerationSettings:
+    def __init__(self,concurrent_fragments=1,http_chunk_size=None,external_downloader=None,connections=8):
+        self.concurrent_fragments=max(int(concurrent_fragments or 1),1)
+        self.http_chunk_size=http_chunk_size or None
+        self.external_downloader=external_downloader or None
+        self.connections=max(int(connections or 1),1)
+    def external_available(self):
+        return self.external_downloader is not None and shutil.which(self.external_downloader) is not None
+    def to_options(self,log=None):
+        options={"concurrent_fragment_downloads":self.concurrent_fragments}
+        chunk_size=parse_rate(self.http_chunk_size)
+        if chunk_size:
+            options["http_chunk_size"]=chunk_size
+        if self.external_downloader:
+            if self.external_available():
+                args=[arg.format(connections=self.connections) for arg in EXTERNAL_DOWNLOADER_ARGS.get(self.external_downloader,[])]
+                options["external_downloader"]={"default":self.external_downloader,"m3u8":"native","m3u8_native":"native"}
+                options["external_downloader_args"]={self.external_downloader:args}
+            elif log is not None:
+                log(self.external_downloader+" not found, using the built-in downloader")
+        return options
+    def describe(self):
+        parts=[f"{self.concurrent_fragments} fragments"]
+        if self.http_chunk_size:
+            parts.append(f"{self.http_chunk_size} chunks")
+        if self.external_downloader:
+            parts.append(f"{self.external_downloader} x{self.connections}"+("" if self.external_available() else " (missing)"))
+        return ", ".join(parts)
+    def to_dict(self):
+        return {"concurrent_fragments":self.concurrent_fragments,"http_chunk_size":self.http_chunk_size,"external_downloader":self.external_downloader,"connections":self.connections}
+    @classmethod
+    def from_dict(cls,data):
+        data=data or {}
+        return cls(data.get("concurrent_fragments",1),data.get("http_chunk_size"),data.get("external_downloader"),data.get("connections",8))
+
+class ThroughputMeter:
+    def __init__(self,resumed=0):
+        self.files={}
+        self.resumed=resumed
+        self.started=None
+        self.updated=None
+    def update(self,filename,downloaded,now):
+        if self.started is None:
+            self.started=now
+        self.files[filename]=max(downloaded,self.files.get(filename,0))
+        self.updated=now
+    @property
+    def downloaded(self):
+        return max(sum(self.files.values())-self.resumed,0)
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0
+        return self.updated-self.started
+    @property
+    def rate(self):
+        return self.downloaded/self.elapsed if self.elapsed>0 else 0
+    def describe(self):
+        return f"{self.downloaded/1024**2:.2f} MB in {self.elapsed:.2f} s ({self.rate/1024**2:.2f} MB/s)"
@@ -0,0 +1,69 @@
+import sqlite3
+import threading
+import time
+from core.utils import extract_video_id
+
+ANY_PROFILE="*"
+
+def archive_profile(task):
+    return "audio-"+task.audio_format if task.audio_only else "video-"+(task.output_format or "mp4").lower()
+
+def archive_wildcard(task):
+    return task.parent_id is not None
+
+def archive_key(url):
+    video_id=extract_video_id(url)
+    return ("youtube",video_id) if video_id else None
+
+def info_key(info):
+    extractor=info.get("extractor_key") or info.get("ie_key") or info.get("extractor")
+    if not extractor or info.get("id") is None:
+        return None
+    return (extractor.lower(),str(info["id"]))
+
+class DownloadArchive:
+    def __init__(self,path="download_archive.db"):
+        self.path=path
+        self.lock=threading.Lock()
+        self.connection=sqlite3.connect(path,check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS archive(extractor TEXT,video_id TEXT,profile TEXT,title TEXT,completed_at REAL,PRIMARY KEY(extractor,video_id,profile))")
+        self.connection.commit()
+        self.keys=set(self.connection.execute("SELECT extractor,video_id,profile FROM archive"))
+        self.hits=0
+    def __len__(self):
+        return len(self.keys)
+    def contains(self,key,profile,wildcard=True):
+        if key is None:
+            return False
+        extractor,video_id=key
+        found=(extractor,video_id,profile) in self.keys or wildcard and (extractor,video_id,ANY_PROFILE) in self.keys
+        if found:
+            self.hits+=1
+        return found
+    def contains_url(self,url,profile,wildcard=True):
+        return self.contains(archive_key(url),profile,wildcard)
+    def contains_info(self,info,profile,wildcard=True):
+        return self.contains(info_key(info),profile,wildcard)
+    def add(self,key,profile,title=None):
+        if key is None:
+            return False
+        self.add_many([(key,profile,title)])
+        return True
+    def add_info(self,info,profile):
+        return self.add(info_key(info),profile,info.get("title"))
+    def add_many(self,items):
+        rows=[(key[0],key[1],profile,title,time.time()) for key,profile,title in items if key is not None]
+        with self.lock:
+            self.connection.executemany("INSERT OR REPLACE INTO archive VALUES(?,?,?,?,?)",rows)
+            self.connection.commit()
+            self.keys.update((extractor,video_id,profile) for extractor,video_id,profile,title,completed_at in rows)
+        return len(rows)
+    def import_history(self,history,profile=ANY_PROFILE):
+        items=[(("youtube",entry["video_id"]),profile,entry["title"]) for entry in history.entries_with_status("Download Completed") if entry["video_id"]]
+        before=len(self.keys)
+        self.add_many(items)
+        return len(self.keys)-before
+    def close(self):
+        with self.lock:
+            self.connection.close()
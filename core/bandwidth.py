@@ -0,0 +1,99 @@
+import threading
+import time
+
+class BandwidthShare:
+    def __init__(self,weight,cap=None):
+        self.weight=weight
+        self.cap=cap
+        self.rate=cap
+        self.tokens=0
+        self.downloaded=0
+        self.updated=time.monotonic()
+
+class BandwidthManager:
+    def __init__(self,total_rate=None,weighted=True,burst_seconds=0.5,max_wait=0.25):
+        self.lock=threading.Lock()
+        self.changed=threading.Condition(self.lock)
+        self.total_rate=total_rate
+        self.weighted=weighted
+        self.burst_seconds=burst_seconds
+        self.max_wait=max_wait
+        self.shares={}
+    def weight_for(self,priority):
+        if not self.weighted:
+            return 1
+        return 1/max(priority or 1,1)
+    def register(self,key,priority=1,cap=None):
+        with self.lock:
+            self.shares[key]=BandwidthShare(self.weight_for(priority),cap)
+            self.rebalance()
+    def unregister(self,key):
+        with self.lock:
+            if self.shares.pop(key,None) is not None:
+                self.rebalance()
+    def set_priority(self,key,priority):
+        with self.lock:
+            share=self.shares.get(key)
+            if share is not None:
+                share.weight=self.weight_for(priority)
+                self.rebalance()
+    def set_total_rate(self,total_rate):
+        with self.lock:
+            self.total_rate=total_rate
+            self.rebalance()
+    def rate(self,key):
+        with self.lock:
+            share=self.shares.get(key)
+            return share.rate if share else None
+    def rates(self):
+        with self.lock:
+            return {key:share.rate for key,share in self.shares.items()}
+    def rebalance(self):
+        if self.total_rate is None:
+            for share in self.shares.values():
+                share.rate=share.cap
+        else:
+            remaining=self.total_rate
+            pending=sorted(self.shares.values(),key=lambda share:float("inf") if share.cap is None else share.cap/share.weight)
+            weight_sum=sum(share.weight for share in pending)
+            while pending:
+                share=pending[0]
+                fair=remaining*share.weight/weight_sum
+                if share.cap is None or share.cap>=fair:
+                    break
+                share.rate=share.cap
+                remaining-=share.cap
+                weight_sum-=share.weight
+                pending.pop(0)
+            for share in pending:
+                share.rate=max(int(remaining*share.weight/weight_sum),1)
+        self.changed.notify_all()
+    def wake(self):
+        with self.lock:
+            self.changed.notify_all()
+    def consume(self,key,downloaded,stop=None):
+        waited=0
+        with self.lock:
+            share=self.shares.get(key)
+            if share is None:
+                return 0
+            delta=downloaded-share.downloaded if downloaded>=share.downloaded else downloaded
+            share.downloaded=downloaded
+            self.refill(share)
+            share.tokens-=delta
+            while share.tokens<0 and share.rate is not None and key in self.shares:
+                if stop is not None and stop():
+                    break
+                delay=min(-share.tokens/share.rate,self.max_wait)
+                started=time.monotonic()
+                self.changed.wait(delay)
+                waited+=time.monotonic()-started
+                self.refill(share)
+            if share.rate is None:
+                share.tokens=0
+        return waited
+    def refill(self,share):
+        now=time.monotonic()
+        if share.rate is not None:
+            share.tokens=min(share.tokens+(now-share.updated)*share.rate,share.rate*self.burst_seconds)
+        share.updated=now
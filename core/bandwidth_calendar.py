@@ -0,0 +1,117 @@
+import datetime
+from core.utils import parse_rate
+
+DAY_NAMES=["Mon","Tue","Wed","Thu","Fri","Sat","Sun"]
+
+def parse_clock(text):
+    hours,minutes=str(text).strip().split(":")
+    return datetime.time(int(hours),int(minutes))
+
+class TimeWindow:
+    def __init__(self,start,end,days=None,rate=None,max_concurrent=None,name=""):
+        self.start=parse_clock(start) if not isinstance(start,datetime.time) else start
+        self.end=parse_clock(end) if not isinstance(end,datetime.time) else end
+        self.days=sorted(set(days)) if days else list(range(7))
+        self.rate=rate or None
+        self.max_concurrent=max_concurrent
+        self.name=name
+    @property
+    def wraps(self):
+        return self.end<=self.start
+    def contains(self,now):
+        current=now.time()
+        if not self.wraps:
+            return now.weekday() in self.days and self.start<=current<self.end
+        if current>=self.start:
+            return now.weekday() in self.days
+        return current<self.end and (now.weekday()-1)%7 in self.days
+    def boundaries(self,now,days_ahead=8):
+        today=now.date()
+        for offset in range(-1,days_ahead):
+            day=today+datetime.timedelta(days=offset)
+            if day.weekday() not in self.days:
+                continue
+            start=datetime.datetime.combine(day,self.start)
+            end=datetime.datetime.combine(day+datetime.timedelta(days=1) if self.wraps else day,self.end)
+            yield start
+            yield end
+    def days_text(self):
+        if len(self.days)==7:
+            return "Every day"
+        if self.days==[0,1,2,3,4]:
+            return "Weekdays"
+        if self.days==[5,6]:
+            return "Weekends"
+        return ",".join(DAY_NAMES[day] for day in self.days)
+    def describe(self):
+        rate=self.rate or "unlimited"
+        concurrency="paused" if self.max_concurrent==0 else ("default" if self.max_concurrent is None else str(self.max_concurrent))
+        return f"{self.name or self.days_text()} {self.start:%H:%M}-{self.end:%H:%M}, {rate}, {concurrency} downloads"
+    def to_dict(self):
+        return {"name":self.name,"days":self.days,"start":f"{self.start:%H:%M}","end":f"{self.end:%H:%M}","rate":self.rate,"max_concurrent":self.max_concurrent}
+    @classmethod
+    def from_dict(cls,data):
+        return cls(data["start"],data["end"],data.get("days"),data.get("rate"),data.get("max_concurrent"),data.get("name",""))
+
+class BandwidthCalendar:
+    def __init__(self,windows=None):
+        self.windows=list(windows or [])
+    def active_window(self,now=None):
+        now=now or datetime.datetime.now()
+        for window in self.windows:
+            if window.contains(now):
+                return window
+        return None
+    def next_change(self,now=None):
+        now=now or datetime.datetime.now()
+        candidates=[moment for window in self.windows for moment in window.boundaries(now) if moment>now]
+        return min(candidates) if candidates else None
+    def to_list(self):
+        return [window.to_dict() for window in self.windows]
+    @classmethod
+    def from_list(cls,items):
+        return cls([TimeWindow.from_dict(item) for item in items or []])
+
+class CalendarController:
+    def __init__(self,calendar,bandwidth,scheduler,workers,default_rate=None,default_concurrency=3,listener=None):
+        self.calendar=calendar
+        self.bandwidth=bandwidth
+        self.scheduler=scheduler
+        self.workers=workers
+        self.default_rate=default_rate
+        self.default_concurrency=default_concurrency
+        self.listener=listener
+        self.window=None
+        self.paused=set()
+    def limits(self,now=None):
+        window=self.calendar.active_window(now)
+        if window is None:
+            return parse_rate(self.default_rate),self.default_concurrency,None
+        concurrency=self.default_concurrency if window.max_concurrent is None else window.max_concurrent
+        return parse_rate(window.rate),concurrency,window
+    def apply(self,now=None):
+        rate,concurrency,window=self.limits(now)
+        if window is not self.window and self.listener is not None:
+            self.listener("Bandwidth window: "+(window.describe() if window else "default limits"))
+        self.window=window
+        self.bandwidth.set_total_rate(rate)
+        self.paused&=set(self.scheduler.running)
+        running=sorted(self.scheduler.running,key=lambda task_id:(self.scheduler.tasks[task_id].priority,task_id))
+        for task_id in running[concurrency:]:
+            worker=self.workers.get(task_id)
+            if task_id not in self.paused and worker is not None:
+                worker.pause_download()
+                self.paused.add(task_id)
+        for task_id in running[:concurrency]:
+            worker=self.workers.get(task_id)
+            if task_id in self.paused and worker is not None:
+                worker.resume_download()
+                self.paused.discard(task_id)
+        self.scheduler.set_max_concurrent(concurrency)
+        return window
+    def seconds_until_change(self,now=None,max_wait=60):
+        now=now or datetime.datetime.now()
+        moment=self.calendar.next_change(now)
+        if moment is None:
+            return max_wait
+        return max(min((moment-now).total_seconds(),max_wait),0.5)
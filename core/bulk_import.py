@@ -0,0 +1,139 @@
+import csv
+import logging
+import re
+import threading
+import urllib.parse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from core.engine import EngineListener, MetadataFetcher
+from core.utils import extract_video_id
+
+HOST_PATTERN=re.compile(r"^[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)+(?::\d+)?(?:[/?#]|$)")
+IMPORT_BATCH=500
+
+def normalize_url(text):
+    text=(text or "").strip().strip("\"'<>").strip()
+    if not text or any(char.isspace() for char in text):
+        return None
+    if "://" not in text and HOST_PATTERN.match(text):
+        text="https://"+text
+    try:
+        parts=urllib.parse.urlsplit(text)
+        parts.port
+    except ValueError:
+        return None
+    if parts.scheme.lower() not in ("http","https") or not parts.hostname:
+        return None
+    video_id=extract_video_id(text)
+    if video_id:
+        return "https://www.youtube.com/watch?v="+video_id
+    return urllib.parse.urlunsplit((parts.scheme.lower(),parts.netloc.lower(),parts.path,parts.query,""))
+
+def url_key(url):
+    video_id=extract_video_id(url)
+    return "youtube:"+video_id if video_id else url.rstrip("/")
+
+def iter_import_rows(path):
+    with open(path,encoding="utf-8-sig",errors="replace",newline="") as f:
+        if path.lower().endswith(".csv"):
+            for line_number,row in enumerate(csv.reader(f),1):
+                cells=[cell.strip() for cell in row if cell.strip()]
+                if cells and not cells[0].startswith("#"):
+                    yield line_number,cells
+        else:
+            for line_number,line in enumerate(f,1):
+                line=line.strip()
+                if line and not line.startswith("#"):
+                    yield line_number,[line]
+
+class ImportResult:
+    def __init__(self,path):
+        self.path=path
+        self.accepted=[]
+        self.duplicates=Counter()
+        self.invalid=[]
+        self.invalid_count=0
+        self.rows=0
+        self.error=None
+    @property
+    def duplicate_count(self):
+        return sum(self.duplicates.values())
+    def add_invalid(self,line_number,text,limit=20):
+        self.invalid_count+=1
+        if len(self.invalid)<limit:
+            self.invalid.append((line_number,text))
+
+def scan_import_file(path,history=None,known_keys=(),batch_size=IMPORT_BATCH):
+    result=ImportResult(path)
+    seen=set(known_keys)
+    batch=[]
+    def flush():
+        existing_ids,existing_urls=history.existing([extract_video_id(url) for url,key in batch if key.startswith("youtube:")],[url for url,key in batch if not key.startswith("youtube:")]) if history is not None else (set(),set())
+        for url,key in batch:
+            if url in existing_urls or extract_video_id(url) in existing_ids:
+                result.duplicates["history"]+=1
+            else:
+                result.accepted.append(url)
+        batch.clear()
+    try:
+        for line_number,cells in iter_import_rows(path):
+            result.rows+=1
+            url=next((url for url in map(normalize_url,cells) if url),None)
+            if url is None:
+                if line_number==1 and path.lower().endswith(".csv"):
+                    result.rows-=1
+                else:
+                    result.add_invalid(line_number,cells[0])
+                continue
+            key=url_key(url)
+            if key in seen:
+                result.duplicates["queue" if key in known_keys else "file"]+=1
+                continue
+            seen.add(key)
+            batch.append((url,key))
+            if len(batch)>=batch_size:
+                flush()
+        flush()
+    except (OSError,csv.Error) as e:
+        result.error=str(e)
+    return result
+
+class MetadataValidator:
+    def __init__(self,listener=None,metadata_cache=None,max_workers=4):
+        self.listener=listener or EngineListener()
+        self.metadata_cache=metadata_cache
+        self.executor=ThreadPoolExecutor(max_workers,thread_name_prefix="validate")
+        self.fetcher=MetadataFetcher(metadata_cache)
+        self.cancelled=threading.Event()
+        self.lock=threading.Lock()
+        self.pending=0
+    def submit(self,task_id,url):
+        with self.lock:
+            self.pending+=1
+        self.executor.submit(self.validate,task_id,url)
+    def submit_many(self,items):
+        for task_id,url in items:
+            self.submit(task_id,url)
+    def validate(self,task_id,url):
+        try:
+            if self.cancelled.is_set():
+                return
+            try:
+                info=self.fetcher.fetch(url)[0]
+            except Exception as e:
+                self.listener.on_log_record("Invalid URL "+url+": "+str(e),logging.WARNING)
+                self.listener.on_status(task_id,"Invalid URL")
+                return
+            self.listener.on_info(task_id,info.get("title") or url,info.get("uploader") or info.get("channel") or "Unknown Channel")
+            self.listener.on_status(task_id,"Validated")
+        finally:
+            with self.lock:
+                self.pending-=1
+    def active_count(self):
+        with self.lock:
+            return self.pending
+    def cancel(self):
+        self.cancelled.set()
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown(wait=False,cancel_futures=True)
@@ -0,0 +1,167 @@
+import argparse
+import json
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from core.acceleration import AccelerationSettings
+from core.bandwidth_calendar import BandwidthCalendar
+from core.engine import AUDIO_FORMATS, DownloadEngine, DownloadTask, EngineListener
+from core.archive import DownloadArchive
+from core.journal import QueueJournal
+from core.log_buffer import RotatingLogWriter
+from core.metadata_cache import MetadataCache
+from core.prefetch import MetadataPrefetcher
+from core.telemetry import TelemetryStats
+
+class JsonLinesListener(EngineListener):
+    terminal_statuses=("Download Completed","Already Downloaded","Download Error","Info Extraction Error","Download Cancelled")
+    def __init__(self,stream=None,verbose=False,log_writer=None):
+        self.stream=stream or sys.stdout
+        self.verbose=verbose
+        self.log_writer=log_writer
+        self.lock=threading.Lock()
+        self.results={}
+        self.telemetry=TelemetryStats()
+    def emit(self,event,**fields):
+        fields["event"]=event
+        fields["time"]=round(time.time(),3)
+        line=json.dumps(fields,ensure_ascii=False)
+        with self.lock:
+            self.stream.write(line+"\n")
+            self.stream.flush()
+    def on_status(self,task_id,status):
+        if status in self.terminal_statuses or status.startswith("Playlist Completed") or status in ("Playlist Error","Playlist Cancelled"):
+            self.results[task_id]=status
+        self.emit("status",task=task_id,status=status)
+    def on_log(self,text):
+        self.on_log_record(text,logging.INFO)
+    def on_log_record(self,text,level):
+        if self.log_writer is not None:
+            self.log_writer.write(time.time(),level,text)
+        if self.verbose:
+            self.emit("log",message=text,level=logging.getLevelName(level).lower())
+    def on_info(self,task_id,title,channel):
+        self.emit("info",task=task_id,title=title,channel=channel)
+    def on_entry(self,parent_id,task_id,url,title):
+        self.emit("entry",parent=parent_id,task=task_id,url=url,title=title)
+    def on_metrics(self,task_id,metrics):
+        self.telemetry.add(metrics)
+        self.emit("metrics",task=task_id,**metrics)
+
+def iter_urls(urls,input_path):
+    for url in urls:
+        yield url
+    if not input_path:
+        return
+    stream=sys.stdin if input_path=="-" else open(input_path,encoding="utf-8")
+    try:
+        for line in stream:
+            url=line.strip()
+            if url and not url.startswith("#"):
+                yield url
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+def metrics_paths(path):
+    return path,os.path.splitext(path)[0]+".prom"
+
+def report_progress(engine,listener,interval,stopped,metrics_path=None):
+    while not stopped.wait(interval):
+        if metrics_path:
+            listener.telemetry.write(*metrics_paths(metrics_path))
+        snapshot=engine.progress.snapshot()
+        if snapshot is not None and snapshot.active:
+            fields={"tasks":{str(task_id):round(percent,1) for task_id,percent in snapshot.rows.items()},"percent":round(snapshot.percent,1),"speed":int(snapshot.speed),"eta":snapshot.eta,"active":snapshot.active}
+            playlists=engine.playlist_progress(snapshot.rows)
+            if playlists:
+                fields["playlists"]={str(parent_id):round(percent,1) for parent_id,percent in playlists.items()}
+            listener.emit("progress",**fields)
+
+def build_parser():
+    parser=argparse.ArgumentParser(prog="python -m core.cli",description="Headless YoutubeGO download engine. Prints one JSON event per line.")
+    parser.add_argument("urls",nargs="*",help="URLs to download")
+    parser.add_argument("-i","--input",help="file with one URL per line, '-' for stdin")
+    parser.add_argument("--daemon",action="store_true",help="keep reading URLs from stdin until EOF")
+    parser.add_argument("-o","--output",default=os.getcwd(),help="download folder")
+    parser.add_argument("-j","--concurrency",type=int,default=3,help="concurrent downloads")
+    parser.add_argument("--audio",action="store_true",help="extract audio only")
+    parser.add_argument("--audio-format",default="mp3",choices=AUDIO_FORMATS,help="audio codec for --audio; m4a, opus and best keep the source stream without re-encoding when it already matches")
+    parser.add_argument("--playlist",action="store_true",help="expand playlists and download their entries in parallel")
+    parser.add_argument("--subtitles",action="store_true",help="download subtitles")
+    parser.add_argument("--format",default="mp4",help="video container (mp4, mkv, webm...)")
+    parser.add_argument("--resolution",default="720p")
+    parser.add_argument("--priority",type=int,default=1)
+    parser.add_argument("--rate-limit",help="per-download rate cap like 500K or 2M")
+    parser.add_argument("--total-rate",help="bandwidth budget shared by all downloads, weighted by priority")
+    parser.add_argument("--fragments",type=int,default=1,help="concurrent fragment downloads for HLS/DASH")
+    parser.add_argument("--chunk-size",help="download progressive files in HTTP range chunks like 10M")
+    parser.add_argument("--external-downloader",help="hand plain HTTP downloads to a segmented downloader like aria2c when installed")
+    parser.add_argument("--connections",type=int,default=8,help="connections for the external downloader")
+    parser.add_argument("--calendar",help="JSON list of time windows (days, start, end, rate, max_concurrent) that switch the bandwidth budget and concurrency")
+    parser.add_argument("--archive",help="SQLite download archive; videos already in it (same extractor, ID and audio/video format) are skipped, and finished ones are added")
+    parser.add_argument("--journal",help="append-only queue journal; unfinished tasks in it are resumed from their partial files on the next run")
+    parser.add_argument("--metrics",help="JSON file with aggregate download timings and throughput, refreshed every progress interval; a Prometheus text copy is written next to it with a .prom extension")
+    parser.add_argument("--progress-interval",type=float,default=1.0,help="seconds between progress events")
+    parser.add_argument("--cache",default="metadata_cache.db",help="metadata cache path")
+    parser.add_argument("--no-cache",action="store_true",help="disable the metadata cache")
+    parser.add_argument("--prefetch",type=int,default=2,help="metadata extractions run ahead of the download slots to fill the cache for queued tasks; 0 disables")
+    parser.add_argument("-v","--verbose",action="store_true",help="include log events")
+    parser.add_argument("--log-file",help="write the full log, debug lines included, to this file from a background thread; rotated at 5 MB with three backups")
+    return parser
+
+def main(argv=None):
+    parser=build_parser()
+    args=parser.parse_args(argv)
+    input_path=args.input or ("-" if args.daemon else None)
+    if not args.urls and not input_path and not args.journal:
+        parser.error("no URLs given")
+    listener=JsonLinesListener(verbose=args.verbose,log_writer=RotatingLogWriter(args.log_file) if args.log_file else None)
+    metadata_cache=None if args.no_cache else MetadataCache(args.cache)
+    acceleration=AccelerationSettings(args.fragments,args.chunk_size,args.external_downloader,args.connections)
+    journal=QueueJournal(args.journal) if args.journal else None
+    archive=DownloadArchive(args.archive) if args.archive else None
+    prefetcher=MetadataPrefetcher(listener,metadata_cache,args.prefetch) if metadata_cache is not None and args.prefetch>0 else None
+    engine=DownloadEngine(args.concurrency,listener,metadata_cache,args.total_rate,acceleration,journal,archive,prefetcher)
+    if args.calendar:
+        with open(args.calendar,encoding="utf-8") as f:
+            engine.set_calendar(BandwidthCalendar.from_list(json.load(f)))
+    stop=engine.suspend if journal is not None else engine.cancel_all
+    signal.signal(signal.SIGTERM,lambda signum,frame:stop())
+    stopped=threading.Event()
+    reporter=threading.Thread(target=report_progress,args=(engine,listener,args.progress_interval,stopped,args.metrics),daemon=True)
+    reporter.start()
+    submitted=0
+    for task in engine.restore():
+        listener.emit("queued",task=task.task_id,url=task.url,restored=True)
+        submitted+=1
+    try:
+        for url in iter_urls(args.urls,input_path):
+            task=DownloadTask(url,args.resolution,args.output,args.audio,args.playlist,args.subtitles,args.format,True,args.priority,None,args.rate_limit,None,args.audio_format)
+            engine.submit(task)
+            listener.emit("queued",task=task.task_id,url=url)
+            submitted+=1
+        engine.wait()
+    except KeyboardInterrupt:
+        stop()
+        engine.wait(10)
+    stopped.set()
+    if prefetcher is not None:
+        prefetcher.shutdown()
+    if args.metrics:
+        listener.telemetry.write(*metrics_paths(args.metrics),force=True)
+    if journal is not None:
+        journal.close()
+    if listener.log_writer is not None:
+        listener.log_writer.close()
+    completed=sum(1 for status in listener.results.values() if status in ("Download Completed","Playlist Completed"))
+    skipped=sum(1 for status in listener.results.values() if status=="Already Downloaded")
+    failed=len(listener.results)-completed-skipped
+    listener.emit("finished",submitted=submitted,completed=completed,skipped=skipped,failed=failed)
+    return 1 if failed else 0
+
+if __name__=="__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+import json
+import logging
+import os
+import re
+import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from core.engine import EngineListener
+
+CONVERT_FORMATS=("mp4","mp3","mkv")
+MEDIA_EXTENSIONS=(".mp4",".mkv",".webm",".mov",".avi",".flv",".m4v",".ts",".mp3",".m4a",".aac",".opus",".ogg",".wav",".flac")
+DURATION_PATTERN=re.compile(r"Duration: (\d+):(\d\d):(\d\d(?:\.\d+)?)")
+FINISHED_STATUSES=("Conversion Completed","Conversion Error","Conversion Cancelled")
+CONTAINER_CODECS={"mp4":{"video":{"h264","hevc","av1","vp9","mpeg4"},"audio":{"aac","mp3","alac","opus","flac","ac3","eac3"},"subtitle":{"mov_text"}},"mkv":{"video":None,"audio":None,"subtitle":{"subrip","ass","ssa","webvtt","hdmv_pgs_subtitle","dvd_subtitle"}},"mp3":{"audio":{"mp3"}}}
+
+def parse_duration(line):
+    match=DURATION_PATTERN.search(line)
+    if match is None:
+        return None
+    hours,minutes,seconds=match.groups()
+    return int(hours)*3600+int(minutes)*60+float(seconds)
+
+def ffprobe_path_for(ffmpeg_path):
+    folder,name=os.path.split(ffmpeg_path)
+    return os.path.join(folder,name.replace("ffmpeg","ffprobe")) if "ffmpeg" in name else "ffprobe"
+
+def probe_media(path,ffprobe_path="ffprobe",timeout=30):
+    result=subprocess.run([ffprobe_path,"-v","error","-show_entries","format=duration:stream=codec_type,codec_name:stream_disposition=attached_pic","-of","json",path],stdin=subprocess.DEVNULL,capture_output=True,text=True,timeout=timeout)
+    if result.returncode!=0:
+        raise RuntimeError(result.stderr.strip() or "ffprobe exited with code "+str(result.returncode))
+    data=json.loads(result.stdout or "{}")
+    streams=[(stream.get("codec_type"),stream.get("codec_name")) for stream in data.get("streams",[]) if not stream.get("disposition",{}).get("attached_pic")]
+    duration=data.get("format",{}).get("duration")
+    return {"duration":float(duration) if duration not in (None,"N/A") else None,"streams":streams}
+
+def stream_copy_plan(streams,target_format):
+    allowed=CONTAINER_CODECS.get(target_format,{})
+    args=[]
+    copied=[]
+    encoded=[]
+    for codec_type in ("video","audio","subtitle"):
+        codecs=[codec for kind,codec in streams if kind==codec_type]
+        if codec_type not in allowed:
+            args.append("-"+codec_type[0]+"n")
+        elif codecs and (allowed[codec_type] is None or all(codec in allowed[codec_type] for codec in codecs)):
+            args+=["-c:"+codec_type[0],"copy"]
+            copied.append(codec_type)
+        elif codecs:
+            encoded.append(codec_type)
+    plan="copy" if copied and not encoded else "partial copy" if copied else "transcode"
+    return plan,args
+
+def collect_inputs(paths,extensions=MEDIA_EXTENSIONS):
+    files=[]
+    for path in paths:
+        if os.path.isdir(path):
+            for root,dirs,names in os.walk(path):
+                dirs.sort()
+                files.extend(os.path.join(root,name) for name in sorted(names) if os.path.splitext(name)[1].lower() in extensions)
+        elif os.path.isfile(path):
+            files.append(path)
+    return list(dict.fromkeys(os.path.abspath(path) for path in files))
+
+def output_path_for(input_path,target_format,output_dir=None,reserved=()):
+    base=os.path.splitext(os.path.basename(input_path))[0]
+    folder=output_dir or os.path.dirname(input_path)
+    output_path=os.path.join(folder,base+"."+target_format)
+    counter=1
+    while os.path.exists(output_path) or output_path in reserved or os.path.abspath(output_path)==os.path.abspath(input_path):
+        output_path=os.path.join(folder,f"{base} ({counter}).{target_format}")
+        counter+=1
+    return output_path
+
+class ConversionJob:
+    def __init__(self,job_id,input_path,target_format,output_path=None,listener=None,ffmpeg_path="ffmpeg"):
+        self.job_id=job_id
+        self.input_path=input_path
+        self.target_format=target_format
+        self.output_path=output_path or output_path_for(input_path,target_format)
+        self.listener=listener or EngineListener()
+        self.ffmpeg_path=ffmpeg_path
+        self.cancelled=threading.Event()
+        self.process=None
+        self.duration=None
+        self.position=0
+        self.status="Queued"
+        self.error_lines=deque(maxlen=20)
+        self.elapsed=0
+        self.plan="transcode"
+        self.codec_args=["-vn","-sn"] if target_format=="mp3" else []
+    def command(self):
+        return [self.ffmpeg_path,"-hide_banner","-nostdin","-n","-i",self.input_path,*self.codec_args,"-progress","pipe:1","-nostats",self.output_path]
+    def choose_plan(self):
+        try:
+            probe=probe_media(self.input_path,ffprobe_path_for(self.ffmpeg_path))
+        except (OSError,RuntimeError,ValueError,subprocess.TimeoutExpired) as e:
+            self.listener.on_log_record("Could not probe "+self.input_path+", transcoding: "+str(e),logging.WARNING)
+            return
+        self.duration=probe["duration"]
+        self.plan,self.codec_args=stream_copy_plan(probe["streams"],self.target_format)
+        codecs=", ".join(codec for kind,codec in probe["streams"] if codec)
+        self.listener.on_log("Conversion plan for "+self.input_path+" ("+codecs+") to "+self.target_format+": "+self.plan)
+    def set_status(self,status):
+        self.status=status
+        self.listener.on_status(self.job_id,status)
+    def run(self):
+        if self.cancelled.is_set():
+            self.set_status("Conversion Cancelled")
+            return
+        self.set_status("Converting")
+        started=time.monotonic()
+        self.choose_plan()
+        try:
+            self.process=subprocess.Popen(self.command(),stdin=subprocess.DEVNULL,stdout=subprocess.PIPE,stderr=subprocess.PIPE,text=True,errors="replace")
+        except OSError as e:
+            self.listener.on_log_record("Conversion error: "+str(e),logging.ERROR)
+            self.set_status("Conversion Error")
+            return
+        if self.cancelled.is_set():
+            self.process.terminate()
+        reader=threading.Thread(target=self.read_errors,daemon=True)
+        reader.start()
+        for line in self.process.stdout:
+            key,_,value=line.strip().partition("=")
+            if key=="out_time_us" and value.isdigit():
+                self.report(int(value)/1000000,time.monotonic()-started)
+        code=self.process.wait()
+        reader.join()
+        self.elapsed=time.monotonic()-started
+        if self.cancelled.is_set() or code!=0:
+            self.remove_output()
+        if self.cancelled.is_set():
+            self.listener.on_log("Conversion cancelled: "+self.input_path)
+            self.set_status("Conversion Cancelled")
+        elif code==0:
+            self.listener.on_progress(self.job_id,100.0,self.position/self.elapsed if self.elapsed else 0,0)
+            self.listener.on_log("Converted "+self.input_path+" to "+self.output_path+" by "+self.plan+f" in {self.elapsed:.1f} s")
+            self.set_status("Conversion Completed")
+        else:
+            self.listener.on_log_record("Conversion error for "+self.input_path+": "+(self.error_lines[-1] if self.error_lines else "ffmpeg exited with code "+str(code)),logging.ERROR)
+            self.set_status("Conversion Error")
+    def read_errors(self):
+        for line in self.process.stderr:
+            line=line.strip()
+            if not self.duration:
+                self.duration=parse_duration(line)
+            if line:
+                self.error_lines.append(line)
+    def report(self,position,elapsed):
+        self.position=position
+        speed=position/elapsed if elapsed>0 else 0
+        if not self.duration:
+            self.listener.on_progress(self.job_id,0.0,speed,-1)
+            return
+        percent=min(position/self.duration*100,99.9)
+        eta=max(int((self.duration-position)/speed),0) if speed>0 else -1
+        self.listener.on_progress(self.job_id,percent,speed,eta)
+    def remove_output(self):
+        try:
+            os.remove(self.output_path)
+        except OSError:
+            pass
+    def cancel(self):
+        self.cancelled.set()
+        process=self.process
+        if process is not None and process.poll() is None:
+            process.terminate()
+
+class BatchConverter:
+    def __init__(self,listener=None,max_workers=None,ffmpeg_path="ffmpeg"):
+        self.listener=listener or EngineListener()
+        self.max_workers=max_workers or os.cpu_count() or 1
+        self.ffmpeg_path=ffmpeg_path
+        self.executor=ThreadPoolExecutor(self.max_workers,thread_name_prefix="convert")
+        self.lock=threading.Lock()
+        self.jobs={}
+        self.futures={}
+        self.next_id=1
+    def submit(self,input_path,target_format,output_dir=None):
+        with self.lock:
+            reserved={job.output_path for job in self.jobs.values() if job.status not in FINISHED_STATUSES}
+            job=ConversionJob(self.next_id,input_path,target_format,output_path_for(input_path,target_format,output_dir,reserved),self.listener,self.ffmpeg_path)
+            self.next_id+=1
+            self.jobs[job.job_id]=job
+            self.futures[job.job_id]=self.executor.submit(job.run)
+        return job
+    def submit_many(self,paths,target_format,output_dir=None):
+        return [self.submit(path,target_format,output_dir) for path in collect_inputs(paths)]
+    def cancel(self,job_id):
+        job=self.jobs.get(job_id)
+        if job is None or job.status in FINISHED_STATUSES:
+            return False
+        job.cancel()
+        if self.futures[job_id].cancel():
+            job.set_status("Conversion Cancelled")
+        return True
+    def cancel_all(self):
+        return sum(self.cancel(job_id) for job_id in list(self.jobs))
+    def active_count(self):
+        return sum(job.status not in FINISHED_STATUSES for job in self.jobs.values())
+    def wait(self,timeout=None):
+        return not wait(list(self.futures.values()),timeout).not_done
+    def shutdown(self):
+        self.cancel_all()
+        self.executor.shutdown(wait=False,cancel_futures=True)
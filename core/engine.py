@@ -0,0 +1,731 @@
+import functools
+import glob
+import logging
+import time
+import os
+import threading
+import types
+from core.acceleration import AccelerationSettings, ThroughputMeter
+from core.archive import archive_profile, archive_wildcard
+from core.bandwidth import BandwidthManager
+from core.bandwidth_calendar import CalendarController
+from core.playlist import PlaylistTracker, entry_url, iter_playlist_entries
+from core.progress import ProgressAggregator
+from core.scheduler import DownloadScheduler
+from core.telemetry import TaskTelemetry
+from core.utils import parse_rate
+
+AUDIO_FORMATS=("mp3","m4a","opus","best")
+AUDIO_FORMAT_CODECS={"mp3":"mp3","m4a":"aac","opus":"opus"}
+AUDIO_FORMAT_SELECTORS={"m4a":"bestaudio[acodec^=mp4a]/bestaudio/best","opus":"bestaudio[acodec=opus]/bestaudio/best"}
+
+def audio_extraction_plan(acodec,audio_format):
+    codec=(acodec or "").split(".")[0].lower()
+    if codec=="mp4a":
+        codec="aac"
+    return "copy" if audio_format=="best" or codec==AUDIO_FORMAT_CODECS.get(audio_format) else "transcode"
+
+class DownloadTask:
+    def __init__(self,url,resolution,folder,audio_only=False,playlist=False,subtitles=False,output_format="mp4",from_queue=False,priority=1,recurrence=None,max_rate=None,acceleration=None,audio_format="mp3"):
+        self.url=url
+        self.resolution=resolution
+        self.folder=folder
+        self.audio_only=audio_only
+        self.playlist=playlist
+        self.subtitles=subtitles
+        self.output_format=output_format
+        self.from_queue=from_queue
+        self.priority=priority
+        self.recurrence=recurrence
+        self.max_rate=max_rate
+        self.acceleration=acceleration
+        self.audio_format=audio_format
+        self.throughput=None
+        self.metrics=None
+        self.extractor_calls=0
+        self.task_id=None
+        self.queued_at=None
+        self.parent_id=None
+        self.journal_id=None
+    def child(self,url):
+        task=DownloadTask(url,self.resolution,self.folder,self.audio_only,False,self.subtitles,self.output_format,self.from_queue,self.priority,None,self.max_rate,self.acceleration,self.audio_format)
+        task.parent_id=self.task_id
+        return task
+    def to_dict(self):
+        return {"url":self.url,"resolution":self.resolution,"folder":self.folder,"audio_only":self.audio_only,"playlist":self.playlist,"subtitles":self.subtitles,"output_format":self.output_format,"from_queue":self.from_queue,"priority":self.priority,"recurrence":self.recurrence,"max_rate":self.max_rate,"acceleration":self.acceleration.to_dict() if self.acceleration is not None else None,"audio_format":self.audio_format}
+    @classmethod
+    def from_dict(cls,data):
+        acceleration=AccelerationSettings.from_dict(data["acceleration"]) if data.get("acceleration") else None
+        return cls(data["url"],data.get("resolution","720p"),data.get("folder",os.getcwd()),data.get("audio_only",False),data.get("playlist",False),data.get("subtitles",False),data.get("output_format","mp4"),data.get("from_queue",False),data.get("priority",1),data.get("recurrence"),data.get("max_rate"),acceleration,data.get("audio_format","mp3"))
+
+class EngineListener:
+    def on_status(self,task_id,status):
+        pass
+    def on_log(self,text):
+        pass
+    def on_log_record(self,text,level):
+        self.on_log(text)
+    def on_info(self,task_id,title,channel):
+        pass
+    def on_progress(self,task_id,percent,speed,eta):
+        pass
+    def on_entry(self,parent_id,task_id,url,title):
+        pass
+    def on_metrics(self,task_id,metrics):
+        pass
+
+class TelemetryLogger:
+    def __init__(self,telemetry,listener):
+        self.telemetry=telemetry
+        self.listener=listener
+    def count_retry(self,message):
+        if "Retrying" in message:
+            self.telemetry.retries+=1
+    def debug(self,message):
+        self.count_retry(message)
+    def info(self,message):
+        pass
+    def warning(self,message):
+        self.count_retry(message)
+        self.listener.on_log_record(message,logging.WARNING)
+    def error(self,message):
+        pass
+
+class ProcessRegistry:
+    def __init__(self):
+        self.lock=threading.Lock()
+        self.processes={}
+    def add(self,process):
+        with self.lock:
+            self.processes.setdefault(threading.get_ident(),set()).add(process)
+    def discard(self,process):
+        with self.lock:
+            self.processes.get(threading.get_ident(),set()).discard(process)
+    def thread_processes(self,thread_ident):
+        with self.lock:
+            return list(self.processes.get(thread_ident,()))
+    def kill_thread_processes(self,thread_ident):
+        processes=self.thread_processes(thread_ident)
+        for process in processes:
+            if process.poll() is None:
+                process.kill()
+        return len(processes)
+
+process_registry=ProcessRegistry()
+yt_dlp_api=None
+yt_dlp_lock=threading.Lock()
+cookie_lock=threading.RLock()
+
+def load_yt_dlp():
+    global yt_dlp_api
+    if yt_dlp_api is not None:
+        return yt_dlp_api
+    with yt_dlp_lock:
+        if yt_dlp_api is None:
+            yt_dlp_api=import_yt_dlp()
+    return yt_dlp_api
+
+def import_yt_dlp():
+    from yt_dlp import YoutubeDL
+    from yt_dlp.utils import DownloadError, Popen
+    import yt_dlp.postprocessor.ffmpeg as ffmpeg_postprocessor
+    class TrackedPopen(Popen):
+        def __init__(self,*args,**kwargs):
+            super().__init__(*args,**kwargs)
+            process_registry.add(self)
+        def __exit__(self,*args):
+            process_registry.discard(self)
+            return super().__exit__(*args)
+    class CountingYoutubeDL(YoutubeDL):
+        def __init__(self,params=None,auto_init=True,checkpoint=None):
+            self.extract_count=0
+            self.checkpoint=checkpoint
+            super().__init__(params,auto_init)
+        def extract_info(self,*args,**kwargs):
+            self.extract_count+=1
+            return super().extract_info(*args,**kwargs)
+        def urlopen(self,req):
+            if self.checkpoint is not None:
+                self.checkpoint()
+            return super().urlopen(req)
+        @functools.cached_property
+        def cookiejar(self):
+            with cookie_lock:
+                return YoutubeDL.cookiejar.func(self)
+        def save_cookies(self):
+            with cookie_lock:
+                super().save_cookies()
+    ffmpeg_postprocessor.Popen=TrackedPopen
+    return types.SimpleNamespace(YoutubeDL=YoutubeDL,DownloadError=DownloadError,TrackedPopen=TrackedPopen,CountingYoutubeDL=CountingYoutubeDL)
+
+def ensure_cookie_file(cookie_text,path="youtube_cookies.txt"):
+    with cookie_lock:
+        if os.path.exists(path):
+            return
+        temp_path=path+".tmp"
+        with open(temp_path,"w") as cf:
+            cf.write(cookie_text)
+        os.replace(temp_path,path)
+
+class MetadataFetcher:
+    options={"quiet":True,"no_warnings":True,"noplaylist":True,"skip_download":True,"cookiefile":"youtube_cookies.txt"}
+    def __init__(self,metadata_cache=None):
+        self.metadata_cache=metadata_cache
+        self.local=threading.local()
+    def ydl(self):
+        if getattr(self.local,"ydl",None) is None:
+            ensure_cookie_file(DownloadJob.cookie_text)
+            self.local.ydl=load_yt_dlp().CountingYoutubeDL(dict(self.options))
+        return self.local.ydl
+    def fetch(self,url):
+        if self.metadata_cache is not None:
+            info=self.metadata_cache.get(url,need_formats=True)
+            if info is not None:
+                return info,True
+        ydl=self.ydl()
+        info=ydl.sanitize_info(ydl.extract_info(url,download=False))
+        if self.metadata_cache is not None:
+            self.metadata_cache.put(url,info)
+        return info,False
+
+class DownloadJob:
+    cookie_text="# Netscape HTTP Cookie File\nyoutube.com\tFALSE\t/\tFALSE\t0\tCONSENT\tYES+42\n"
+    def __init__(self,task,task_id,listener=None,metadata_cache=None,progress=None,bandwidth=None,archive=None,prefetcher=None,worker=None):
+        self.task=task
+        self.task_id=task_id
+        self.worker=worker
+        self.listener=listener or EngineListener()
+        self.metadata_cache=metadata_cache
+        self.progress=progress
+        self.bandwidth=bandwidth
+        self.archive=archive
+        self.prefetcher=prefetcher
+        self.meter=ThroughputMeter()
+        self.telemetry=TaskTelemetry(task.queued_at)
+        self.info_from_cache=False
+        self.resume_event=threading.Event()
+        self.resume_event.set()
+        self.cancel_event=threading.Event()
+        self.thread_ident=None
+        self.requested_at={}
+        self.postprocess_started={}
+        self.title="Fetching..."
+        self.channel="Fetching..."
+        self.status=None
+    def report_status(self,status):
+        self.status=status
+        self.listener.on_status(self.task_id,status)
+    def run(self):
+        self.telemetry.start(self.worker)
+        try:
+            self.download()
+        finally:
+            if self.bandwidth is not None:
+                self.bandwidth.unregister(self.task_id)
+        if self.status not in (None,"Already Downloaded"):
+            self.report_metrics()
+    def download(self):
+        if self.archive is not None and self.archive.contains_url(self.task.url,archive_profile(self.task),archive_wildcard(self.task)):
+            self.report_archived(self.task.url)
+            return
+        ensure_cookie_file(self.cookie_text)
+        self.thread_ident=threading.get_ident()
+        api=load_yt_dlp()
+        with api.CountingYoutubeDL(self.build_options(),checkpoint=self.checkpoint) as ydl:
+            try:
+                self.checkpoint()
+                self.telemetry.begin("extract")
+                info=self.fetch_info(ydl)
+                self.telemetry.end("extract")
+                self.title=info.get("title","No Title")
+                self.channel=info.get("uploader","Unknown Channel")
+            except Exception as e:
+                self.task.extractor_calls=ydl.extract_count
+                if self.is_cancelled:
+                    self.report_status("Download Cancelled")
+                    self.listener.on_log("Cancelled during info extraction: "+self.task.url)
+                    return
+                self.listener.on_log_record("Failed to fetch info: "+str(e),logging.ERROR)
+                self.report_status("Info Extraction Error")
+                return
+            self.listener.on_info(self.task_id,self.title,self.channel)
+            if self.archive is not None and self.archive.contains_info(info,archive_profile(self.task),archive_wildcard(self.task)):
+                self.task.extractor_calls=ydl.extract_count
+                self.report_archived(self.title)
+                return
+            if self.bandwidth is not None:
+                self.bandwidth.register(self.task_id,self.task.priority,parse_rate(self.task.max_rate))
+            self.find_partial_download(ydl,info)
+            self.telemetry.begin("download")
+            try:
+                try:
+                    ydl.process_ie_result(info,download=True)
+                except api.DownloadError:
+                    if self.is_cancelled or not self.info_from_cache:
+                        raise
+                    self.listener.on_log_record("Cached info expired, re-extracting: "+self.title,logging.WARNING)
+                    self.telemetry.retries+=1
+                    self.metadata_cache.invalidate(self.task.url)
+                    info=ydl.extract_info(self.task.url,download=False)
+                    self.metadata_cache.put(self.task.url,ydl.sanitize_info(info))
+                    ydl.process_ie_result(info,download=True)
+                self.finish_progress()
+                self.report_throughput()
+                if self.archive is not None:
+                    self.archive.add_info(info,archive_profile(self.task))
+                self.report_status("Download Completed")
+                self.listener.on_log("Completed: "+self.title+" by "+self.channel)
+            except Exception as e:
+                self.finish_progress()
+                if self.is_cancelled:
+                    self.report_status("Download Cancelled")
+                    self.listener.on_log("Cancelled: "+self.title+" by "+self.channel)
+                elif isinstance(e,api.DownloadError):
+                    self.report_status("Download Error")
+                    self.listener.on_log_record("Download Error: "+str(e),logging.ERROR)
+                else:
+                    self.report_status("Download Error")
+                    self.listener.on_log_record("Unexpected Error: "+str(e),logging.ERROR)
+            self.task.extractor_calls=ydl.extract_count
+            self.listener.on_log_record("Extractor calls for "+self.title+": "+str(ydl.extract_count),logging.DEBUG)
+    def report_archived(self,name):
+        self.report_status("Already Downloaded")
+        self.listener.on_log("Skipping "+name+": already in the download archive")
+    def fetch_info(self,ydl):
+        self.info_from_cache=False
+        use_cache=self.metadata_cache is not None and not self.task.playlist
+        if use_cache and self.prefetcher is not None and self.prefetcher.claim(self.task_id,lambda:self.is_cancelled):
+            self.listener.on_log_record("Waited for metadata prefetch: "+self.task.url,logging.DEBUG)
+        if use_cache:
+            info=self.metadata_cache.get(self.task.url,need_formats=True)
+            if info is not None:
+                self.info_from_cache=True
+                self.telemetry.cache_hit=True
+                self.listener.on_log_record("Metadata cache hit: "+self.task.url+" ("+self.metadata_cache.stats_text()+")",logging.DEBUG)
+                return info
+            self.listener.on_log_record("Metadata cache miss: "+self.task.url+" ("+self.metadata_cache.stats_text()+")",logging.DEBUG)
+        info=ydl.extract_info(self.task.url,download=False)
+        if use_cache:
+            self.metadata_cache.put(self.task.url,ydl.sanitize_info(info))
+        return info
+    def find_partial_download(self,ydl,info):
+        try:
+            base=os.path.splitext(ydl.prepare_filename(info))[0]
+        except Exception:
+            return 0
+        partial=sum(os.path.getsize(path) for path in glob.glob(glob.escape(base)+"*.part"))
+        if partial:
+            self.meter.resumed=partial
+            self.listener.on_log("Resuming "+self.title+" from "+f"{partial/1024**2:.2f}"+" MB of partial data")
+        return partial
+    def build_options(self):
+        options={"quiet":True,"noprogress":True,"logger":TelemetryLogger(self.telemetry,self.listener),"continuedl":True,"retries":10,"fragment_retries":10,"outtmpl":os.path.join(self.task.folder,"%(title)s.%(ext)s"),"progress_hooks":[self.progress_hook],"noplaylist":not self.task.playlist,"cookiefile":"youtube_cookies.txt","ratelimit":parse_rate(self.task.max_rate) if self.bandwidth is None else None}
+        if self.task.audio_only:
+            options["format"]=AUDIO_FORMAT_SELECTORS.get(self.task.audio_format,"bestaudio/best")
+            options["postprocessors"]=[{"key":"FFmpegExtractAudio","preferredcodec":self.task.audio_format,"preferredquality":"192"}]
+        else:
+            if self.task.output_format.lower()=="mp4":
+                options["format"]='bestvideo[vcodec*="avc1"]+bestaudio[acodec*="mp4a"]/best'
+                options["merge_output_format"]="mp4"
+            else:
+                options["format"]="bestvideo+bestaudio/best"
+                options["merge_output_format"]=self.task.output_format
+        options["postprocessor_hooks"]=[self.postprocessor_hook]
+        if self.task.subtitles:
+            options["writesubtitles"]=True
+            options["allsubtitles"]=True
+        if self.task.acceleration is not None:
+            options.update(self.task.acceleration.to_options(self.listener.on_log))
+        return options
+    @property
+    def is_paused(self):
+        return not self.resume_event.is_set()
+    @property
+    def is_cancelled(self):
+        return self.cancel_event.is_set()
+    def checkpoint(self):
+        if not self.resume_event.is_set():
+            self.report_latency("pause","Paused")
+            self.resume_event.wait()
+            self.report_latency("resume","Resumed")
+        if self.cancel_event.is_set():
+            self.report_latency("cancel","Cancelled")
+            raise load_yt_dlp().DownloadError("Cancelled")
+    def should_yield(self):
+        return self.is_cancelled or self.is_paused
+    def report_latency(self,action,label):
+        requested_at=self.requested_at.pop(action,None)
+        if requested_at is not None:
+            self.listener.on_log_record(label+" after "+f"{(time.monotonic()-requested_at)*1000:.1f}"+" ms: "+self.title,logging.DEBUG)
+    def postprocessor_hook(self,data):
+        name=data.get("postprocessor")
+        if data["status"]=="started":
+            self.postprocess_started[name]=time.monotonic()
+        elif data["status"]=="finished" and name in self.postprocess_started:
+            info=data.get("info_dict") or {}
+            plan=audio_extraction_plan(info.get("acodec"),self.task.audio_format) if name=="ExtractAudio" else "copy" if name=="Merger" else None
+            seconds=time.monotonic()-self.postprocess_started.pop(name)
+            self.telemetry.add("merge" if name=="Merger" else "postprocess",seconds)
+            self.listener.on_log(name+(" ("+plan+")" if plan else "")+" finished in "+f"{seconds:.2f}"+" s: "+str(info.get("filepath") or self.title))
+    def progress_hook(self,progress_data):
+        self.checkpoint()
+        if progress_data["status"]=="downloading":
+            downloaded=progress_data.get("downloaded_bytes",0) or 0
+            total=progress_data.get("total_bytes") or progress_data.get("total_bytes_estimate",0) or 0
+            speed=progress_data.get("speed",0) or 0
+            eta=progress_data.get("eta",0) or 0
+            self.meter.update(progress_data.get("filename"),downloaded,time.monotonic())
+            self.telemetry.record_progress(downloaded,speed)
+            if self.bandwidth is not None:
+                self.bandwidth.consume(self.task_id,downloaded,self.should_yield)
+            if self.progress is not None:
+                self.progress.update(self,self.task_id,downloaded,total,speed,eta)
+                return
+            percent=(downloaded/total*100) if total else 0
+            if percent>100:
+                percent=100
+            self.listener.on_progress(self.task_id,percent,speed,eta)
+    def report_throughput(self):
+        if not self.meter.downloaded:
+            return
+        self.task.throughput=self.meter.rate
+        setting=self.task.acceleration.describe() if self.task.acceleration is not None else "1 fragments"
+        self.listener.on_log("Throughput for "+self.title+": "+self.meter.describe()+" ["+setting+"]")
+    def report_metrics(self):
+        metrics=self.telemetry.to_dict(self.status,self.meter.downloaded,self.meter.elapsed)
+        metrics["url"]=self.task.url
+        metrics["acceleration"]=self.task.acceleration.describe() if self.task.acceleration is not None else "1 fragments"
+        self.task.metrics=metrics
+        self.listener.on_metrics(self.task_id,metrics)
+    def finish_progress(self):
+        if self.progress is not None:
+            self.progress.remove(self)
+    def pause_download(self):
+        if self.is_cancelled or self.is_paused:
+            return
+        self.requested_at["pause"]=time.monotonic()
+        self.resume_event.clear()
+        self.report_status("Download Paused")
+        self.listener.on_log("Pause requested: "+self.title)
+    def resume_download(self):
+        if not self.is_paused:
+            return
+        self.requested_at.pop("pause",None)
+        self.requested_at["resume"]=time.monotonic()
+        self.resume_event.set()
+        self.report_status("Download Resumed")
+        self.listener.on_log("Resume requested: "+self.title)
+    def cancel_download(self):
+        if self.is_cancelled:
+            return
+        self.requested_at["cancel"]=time.monotonic()
+        self.cancel_event.set()
+        self.resume_event.set()
+        if self.bandwidth is not None:
+            self.bandwidth.wake()
+        self.report_status("Cancelling")
+        self.listener.on_log("Cancel requested: "+self.title)
+        if self.thread_ident is not None and process_registry.kill_thread_processes(self.thread_ident):
+            self.report_latency("cancel","FFmpeg killed, cancelled")
+
+class PlaylistJob:
+    def __init__(self,task,task_id,listener=None,entry_callback=None,archive=None):
+        self.task=task
+        self.task_id=task_id
+        self.listener=listener or EngineListener()
+        self.entry_callback=entry_callback
+        self.archive=archive
+        self.cancel_event=threading.Event()
+        self.count=0
+        self.archived=0
+        self.error=None
+        self.title=task.url
+    @property
+    def is_cancelled(self):
+        return self.cancel_event.is_set()
+    def checkpoint(self):
+        if self.cancel_event.is_set():
+            raise load_yt_dlp().DownloadError("Cancelled")
+    def build_options(self):
+        return {"quiet":True,"noprogress":True,"extract_flat":"in_playlist","cookiefile":"youtube_cookies.txt"}
+    def run(self):
+        self.listener.on_status(self.task_id,"Enumerating Playlist")
+        ensure_cookie_file(DownloadJob.cookie_text)
+        api=load_yt_dlp()
+        started=time.monotonic()
+        try:
+            with api.CountingYoutubeDL(self.build_options(),checkpoint=self.checkpoint) as ydl:
+                info=ydl.extract_info(self.task.url,download=False,process=False)
+                while info.get("_type") in ("url","url_transparent"):
+                    info=ydl.extract_info(info["url"],download=False,process=False,ie_key=info.get("ie_key"))
+                self.title=info.get("title") or self.task.url
+                self.listener.on_info(self.task_id,self.title,info.get("uploader") or info.get("channel") or "Unknown Channel")
+                if info.get("_type") not in ("playlist","multi_video"):
+                    self.add_entry(info.get("webpage_url") or self.task.url,self.title)
+                else:
+                    for entry in iter_playlist_entries(info.get("entries")):
+                        self.checkpoint()
+                        url=entry_url(entry)
+                        if url is None:
+                            self.listener.on_log_record("Skipping playlist entry without URL: "+str(entry.get("id") if isinstance(entry,dict) else entry),logging.WARNING)
+                            continue
+                        if self.archive is not None and (self.archive.contains_info(entry,archive_profile(self.task)) or self.archive.contains_url(url,archive_profile(self.task))):
+                            self.archived+=1
+                            continue
+                        self.add_entry(url,entry.get("title") or url)
+        except Exception as e:
+            if not self.is_cancelled:
+                self.error=str(e)
+                self.listener.on_log_record("Playlist enumeration failed after "+str(self.count)+" entries: "+str(e),logging.ERROR)
+        self.listener.on_log("Enumerated "+str(self.count)+" entries in "+f"{time.monotonic()-started:.1f}"+" s: "+self.title)
+        if self.archived:
+            self.listener.on_log("Skipped "+str(self.archived)+" entries already in the download archive: "+self.title)
+        if self.is_cancelled:
+            self.listener.on_status(self.task_id,"Playlist Cancelled")
+        elif self.error and not self.count and not self.archived:
+            self.listener.on_status(self.task_id,"Playlist Error")
+        else:
+            self.listener.on_status(self.task_id,"Playlist Enumerated")
+    def add_entry(self,url,title):
+        self.count+=1
+        if self.entry_callback is not None:
+            self.entry_callback(self.task_id,url,title)
+    def cancel_download(self):
+        self.cancel_event.set()
+    def pause_download(self):
+        pass
+    def resume_download(self):
+        pass
+
+class DownloadEngine:
+    def __init__(self,max_concurrent=3,listener=None,metadata_cache=None,total_rate=None,acceleration=None,journal=None,archive=None,prefetcher=None):
+        self.listener=listener or EngineListener()
+        self.journal=journal
+        self.archive=archive
+        self.prefetcher=prefetcher
+        self.suspending=False
+        self.acceleration=acceleration
+        self.metadata_cache=metadata_cache
+        self.progress=ProgressAggregator()
+        self.bandwidth=BandwidthManager(parse_rate(total_rate))
+        self.total_rate=total_rate
+        self.calendar=None
+        self.calendar_stop=threading.Event()
+        self.lock=threading.RLock()
+        self.idle=threading.Condition(self.lock)
+        self.jobs={}
+        self.worker_slots=set()
+        self.playlists=PlaylistTracker()
+        self.playlist_tasks={}
+        self.scheduler=DownloadScheduler(max_concurrent,self.start_job,self.start_expansion)
+        if prefetcher is not None and prefetcher.lookahead is None:
+            prefetcher.lookahead=self.prefetch_lookahead
+    def prefetch_lookahead(self):
+        return self.scheduler.max_concurrent
+    def submit(self,task,hold=False,prefetch=True):
+        if task.acceleration is None:
+            task.acceleration=self.acceleration
+        if self.journal is not None and task.parent_id is None and task.journal_id is None:
+            task.journal_id=self.journal.add(task.to_dict(),"queue","held" if hold else "queued")
+        with self.lock:
+            task_id=self.scheduler.submit(task,hold=True)
+        if prefetch:
+            self.prefetch(task)
+        if not hold:
+            with self.lock:
+                self.scheduler.release(task_id)
+        return task_id
+    def prefetch(self,task):
+        if self.prefetcher is None or task.playlist:
+            return
+        if self.archive is not None and self.archive.contains_url(task.url,archive_profile(task),archive_wildcard(task)):
+            return
+        self.prefetcher.submit(task.task_id,task.url,task.priority)
+    def restore(self):
+        if self.journal is None:
+            return []
+        tasks=[]
+        for key,entry in self.journal.pending("queue"):
+            task=DownloadTask.from_dict(entry["data"])
+            task.journal_id=key
+            self.submit(task,entry["state"]=="held")
+            tasks.append(task)
+        if tasks:
+            self.listener.on_log("Restored "+str(len(tasks))+" unfinished tasks from "+self.journal.path)
+        return tasks
+    def finish_journal(self,task,status):
+        if self.journal is None or task is None or task.journal_id is None:
+            return
+        if self.suspending and "Cancelled" in status:
+            return
+        self.journal.finish(task.journal_id,status)
+    def start_queue(self):
+        with self.lock:
+            for task_id,task in self.scheduler.tasks.items():
+                if self.journal is not None and task.journal_id is not None and self.scheduler.state(task_id)=="held":
+                    self.journal.update(task.journal_id,"queued")
+            self.scheduler.release_held()
+    def set_max_concurrent(self,max_concurrent):
+        with self.lock:
+            if self.calendar is not None:
+                self.calendar.default_concurrency=max_concurrent
+                self.calendar.apply()
+            else:
+                self.scheduler.set_max_concurrent(max_concurrent)
+    def set_total_rate(self,total_rate):
+        with self.lock:
+            self.total_rate=total_rate
+            if self.calendar is not None:
+                self.calendar.default_rate=total_rate
+                self.calendar.apply()
+            else:
+                self.bandwidth.set_total_rate(parse_rate(total_rate))
+    def set_calendar(self,calendar):
+        with self.lock:
+            started=self.calendar is not None
+            self.calendar=CalendarController(calendar,self.bandwidth,self.scheduler,self.jobs,self.total_rate,self.scheduler.max_concurrent,self.listener.on_log)
+            self.calendar.apply()
+        if not started:
+            threading.Thread(target=self.run_calendar,name="bandwidth-calendar",daemon=True).start()
+    def run_calendar(self):
+        while not self.calendar_stop.wait(self.calendar.seconds_until_change()):
+            with self.lock:
+                self.calendar.apply()
+    def start_job(self,task):
+        slot=min(set(range(len(self.worker_slots)+1))-self.worker_slots)
+        job=DownloadJob(task,task.task_id,self.listener,self.metadata_cache,self.progress,self.bandwidth,self.archive,self.prefetcher,"worker-"+str(slot))
+        job.worker_slot=slot
+        self.jobs[task.task_id]=job
+        self.worker_slots.add(slot)
+        threading.Thread(target=self.run_job,args=(job,),name=job.worker,daemon=True).start()
+    def start_expansion(self,task):
+        self.playlists.add_parent(task.task_id)
+        self.playlist_tasks[task.task_id]=task
+        job=PlaylistJob(task,task.task_id,self.listener,self.submit_entry,self.archive)
+        self.jobs[task.task_id]=job
+        threading.Thread(target=self.run_expansion,args=(job,),name="playlist-"+str(task.task_id),daemon=True).start()
+    def submit_entry(self,parent_id,url,title):
+        with self.lock:
+            parent=self.scheduler.tasks.get(parent_id)
+            if parent is None:
+                return None
+            child=parent.child(url)
+            self.scheduler.submit(child,hold=True)
+            self.playlists.add_child(parent_id,child.task_id)
+        self.listener.on_entry(parent_id,child.task_id,url,title)
+        self.prefetch(child)
+        with self.lock:
+            self.scheduler.release(child.task_id)
+        return child.task_id
+    def run_expansion(self,job):
+        try:
+            job.run()
+        finally:
+            with self.lock:
+                self.jobs.pop(job.task_id,None)
+                finished=self.playlists.finish_enumeration(job.task_id,job.error,job.is_cancelled)
+                self.scheduler.finish(job.task_id)
+            if finished:
+                self.finish_playlist(job.task_id)
+            with self.lock:
+                self.idle.notify_all()
+    def run_job(self,job):
+        try:
+            job.run()
+        except Exception as e:
+            job.report_status("Download Error")
+            self.listener.on_log_record("Unexpected Error: "+str(e),logging.ERROR)
+        finally:
+            if self.prefetcher is not None:
+                self.prefetcher.discard(job.task_id)
+            with self.lock:
+                self.jobs.pop(job.task_id,None)
+                self.worker_slots.discard(job.worker_slot)
+                parent_id,finished=self.playlists.finish_child(job.task_id,job.status or "Download Error")
+                self.finish_journal(job.task,job.status or "Download Error")
+                self.scheduler.finish(job.task_id)
+                if self.calendar is not None:
+                    self.calendar.apply()
+            if finished:
+                self.finish_playlist(parent_id)
+            with self.lock:
+                self.idle.notify_all()
+    def finish_playlist(self,parent_id):
+        status=self.playlists.status_text(parent_id)
+        self.listener.on_status(parent_id,status)
+        self.playlists.remove(parent_id)
+        self.finish_journal(self.playlist_tasks.pop(parent_id,None),status)
+    def playlist_progress(self,rows=None):
+        with self.playlists.lock:
+            parent_ids=list(self.playlists.parents)
+        return {parent_id:self.playlists.percent(parent_id,rows) for parent_id in parent_ids}
+    def playlist_status(self,rows=None):
+        with self.playlists.lock:
+            parent_ids=list(self.playlists.parents)
+        return {parent_id:self.playlists.status_text(parent_id,rows) for parent_id in parent_ids}
+    def task(self,task_id):
+        with self.lock:
+            return self.scheduler.tasks.get(task_id)
+    def tasks(self):
+        with self.lock:
+            return list(self.scheduler.tasks.values())
+    def state(self,task_id):
+        with self.lock:
+            return self.scheduler.state(task_id)
+    def apply_calendar(self):
+        with self.lock:
+            return self.calendar.apply() if self.calendar is not None else None
+    def cancel(self,task_id,status="Download Cancelled"):
+        if self.playlists.is_parent(task_id):
+            self.playlists.cancel(task_id)
+            for child_id in self.playlists.children(task_id):
+                self.cancel(child_id)
+        job=None
+        finished=False
+        with self.lock:
+            task=self.scheduler.tasks.get(task_id)
+            cancelled=self.scheduler.cancel(task_id)
+            if cancelled:
+                if self.prefetcher is not None:
+                    self.prefetcher.discard(task_id)
+                self.finish_journal(task,status)
+                self.listener.on_status(task_id,status)
+                parent_id,finished=self.playlists.finish_child(task_id,status)
+                self.idle.notify_all()
+            else:
+                job=self.jobs.get(task_id)
+        if finished:
+            self.finish_playlist(parent_id)
+        if job is not None:
+            job.cancel_download()
+        return cancelled
+    def pause_all(self):
+        with self.lock:
+            jobs=list(self.jobs.values())
+        for job in jobs:
+            job.pause_download()
+    def resume_all(self):
+        with self.lock:
+            jobs=list(self.jobs.values())
+        for job in jobs:
+            job.resume_download()
+    def cancel_all(self):
+        with self.lock:
+            task_ids=list(self.scheduler.tasks)
+        for task_id in task_ids:
+            self.cancel(task_id)
+    def suspend(self):
+        self.suspending=True
+        self.cancel_all()
+    def is_idle(self):
+        with self.lock:
+            return len(self.scheduler)==0
+    def wait(self,timeout=None):
+        deadline=None if timeout is None else time.monotonic()+timeout
+        with self.idle:
+            while len(self.scheduler):
+                remaining=None if deadline is None else deadline-time.monotonic()
+                if remaining is not None and remaining<=0:
+                    return False
+                self.idle.wait(remaining)
+        return True
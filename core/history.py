@@ -0,0 +1,89 @@
+import json
+import sqlite3
+import threading
+import time
+from core.utils import extract_video_id
+
+class HistoryStore:
+    columns=("id","title","channel","url","video_id","status","added_at")
+    def __init__(self,path="history.db"):
+        self.path=path
+        self.lock=threading.Lock()
+        self.write_count=0
+        self.connection=sqlite3.connect(path,check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS history(id INTEGER PRIMARY KEY AUTOINCREMENT,title TEXT,channel TEXT,url TEXT,video_id TEXT,status TEXT,added_at REAL)")
+        if "metrics" not in [row[1] for row in self.connection.execute("PRAGMA table_info(history)")]:
+            self.connection.execute("ALTER TABLE history ADD COLUMN metrics TEXT")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS history_url ON history(url)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS history_video_id ON history(video_id)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS history_status ON history(status)")
+        self.connection.commit()
+    def execute(self,sql,params=()):
+        with self.lock:
+            cursor=self.connection.execute(sql,params)
+            self.connection.commit()
+            self.write_count+=1
+            return cursor
+    def query(self,sql,params=()):
+        with self.lock:
+            return self.connection.execute(sql,params).fetchall()
+    def add(self,title,channel,url,status):
+        return self.execute("INSERT INTO history(title,channel,url,video_id,status,added_at) VALUES(?,?,?,?,?,?)",(title,channel,url,extract_video_id(url),status,time.time())).lastrowid
+    def add_many(self,entries):
+        now=time.time()
+        rows=[(entry.get("title",""),entry.get("channel",""),entry.get("url",""),extract_video_id(entry.get("url","")),entry.get("status",""),now) for entry in entries]
+        with self.lock:
+            self.connection.executemany("INSERT INTO history(title,channel,url,video_id,status,added_at) VALUES(?,?,?,?,?,?)",rows)
+            self.connection.commit()
+            self.write_count+=1
+    def update(self,url,title,channel,status=None):
+        if status is None:
+            self.execute("UPDATE history SET title=?,channel=? WHERE url=?",(title,channel,url))
+        else:
+            self.execute("UPDATE history SET title=?,channel=?,status=? WHERE url=?",(title,channel,status,url))
+    def set_status(self,url,status):
+        self.execute("UPDATE history SET status=? WHERE url=?",(status,url))
+    def set_metrics(self,url,metrics):
+        self.execute("UPDATE history SET metrics=? WHERE url=?",(json.dumps(metrics,separators=(",",":")),url))
+    def metrics_for(self,url):
+        rows=self.query("SELECT metrics FROM history WHERE url=? AND metrics IS NOT NULL ORDER BY id DESC LIMIT 1",(url,))
+        return json.loads(rows[0][0]) if rows else None
+    def recent_metrics(self,limit=1000):
+        return [json.loads(row[0]) for row in reversed(self.query("SELECT metrics FROM history WHERE metrics IS NOT NULL ORDER BY id DESC LIMIT ?",(limit,)))]
+    def remove(self,urls):
+        with self.lock:
+            self.connection.executemany("DELETE FROM history WHERE url=?",[(url,) for url in urls])
+            self.connection.commit()
+            self.write_count+=1
+    def clear(self):
+        self.execute("DELETE FROM history")
+    def count(self):
+        return self.query("SELECT COUNT(*) FROM history")[0][0]
+    def entries(self,offset=0,limit=-1):
+        return [dict(zip(self.columns,row)) for row in self.query("SELECT id,title,channel,url,video_id,status,added_at FROM history ORDER BY id LIMIT ? OFFSET ?",(limit,offset))]
+    def entries_with_status(self,status):
+        return [dict(zip(self.columns,row)) for row in self.query("SELECT id,title,channel,url,video_id,status,added_at FROM history WHERE status=? ORDER BY id",(status,))]
+    def entries_with_status_like(self,pattern):
+        return [dict(zip(self.columns,row)) for row in self.query("SELECT id,title,channel,url,video_id,status,added_at FROM history WHERE status LIKE ? ORDER BY id",(pattern,))]
+    def find_by_url(self,url):
+        return [dict(zip(self.columns,row)) for row in self.query("SELECT id,title,channel,url,video_id,status,added_at FROM history WHERE url=? ORDER BY id",(url,))]
+    def find_by_video_id(self,video_id):
+        return [dict(zip(self.columns,row)) for row in self.query("SELECT id,title,channel,url,video_id,status,added_at FROM history WHERE video_id=? ORDER BY id",(video_id,))]
+    def existing(self,video_ids=(),urls=(),batch_size=500):
+        found_ids=set()
+        found_urls=set()
+        retryable="status NOT LIKE '%Error%' AND status NOT LIKE '%Cancel%' AND status NOT LIKE 'Invalid%'"
+        video_ids=list(video_ids)
+        urls=list(urls)
+        for start in range(0,len(video_ids),batch_size):
+            chunk=video_ids[start:start+batch_size]
+            found_ids.update(row[0] for row in self.query("SELECT DISTINCT video_id FROM history WHERE video_id IN ("+",".join("?"*len(chunk))+") AND "+retryable,chunk))
+        for start in range(0,len(urls),batch_size):
+            chunk=urls[start:start+batch_size]
+            found_urls.update(row[0] for row in self.query("SELECT DISTINCT url FROM history WHERE url IN ("+",".join("?"*len(chunk))+") AND "+retryable,chunk))
+        return found_ids,found_urls
+    def close(self):
+        with self.lock:
+            self.connection.close()
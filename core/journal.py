@@ -0,0 +1,111 @@
+import itertools
+import json
+import os
+import tempfile
+import threading
+import time
+
+class QueueJournal:
+    def __init__(self,path="queue_journal.jsonl",sync=True):
+        self.path=path
+        self.sync=sync
+        self.lock=threading.Lock()
+        self.records={}
+        self.keys=itertools.count(1)
+        self.skipped=0
+        self.write_count=0
+        self.stream=None
+        self.replay()
+        self.compact()
+    def replay(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path,encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record=json.loads(line)
+                    self.apply(record)
+                except (ValueError,KeyError,TypeError):
+                    self.skipped+=1
+        self.keys=itertools.count(max(self.records,default=0)+1)
+    def apply(self,record):
+        key=record["key"]
+        op=record["op"]
+        if op=="add":
+            self.records[key]={"kind":record.get("kind","queue"),"state":record.get("state","queued"),"data":record["data"],"added_at":record.get("time")}
+        elif op=="update" and key in self.records:
+            entry=self.records[key]
+            entry["state"]=record.get("state",entry["state"])
+            entry["data"].update(record.get("data",{}))
+        elif op=="done":
+            self.records.pop(key,None)
+    def append(self,record,sync=True):
+        self.append_many([record],sync)
+    def append_many(self,records,sync=True):
+        now=round(time.time(),3)
+        lines=[]
+        for record in records:
+            record["time"]=now
+            lines.append(json.dumps(record,ensure_ascii=False)+"\n")
+        with self.lock:
+            for line in lines:
+                self.apply(json.loads(line))
+            if self.stream is None:
+                self.stream=open(self.path,"a",encoding="utf-8")
+            self.stream.writelines(lines)
+            self.stream.flush()
+            if self.sync and sync:
+                os.fsync(self.stream.fileno())
+            self.write_count+=1
+    def add(self,data,kind="queue",state="queued"):
+        with self.lock:
+            key=next(self.keys)
+        self.append({"op":"add","key":key,"kind":kind,"state":state,"data":data})
+        return key
+    def add_many(self,items,kind="queue",state="queued"):
+        with self.lock:
+            keys=[next(self.keys) for _ in items]
+        self.append_many([{"op":"add","key":key,"kind":kind,"state":state,"data":data} for key,data in zip(keys,items)])
+        return keys
+    def update(self,key,state=None,sync=True,**data):
+        with self.lock:
+            if key not in self.records:
+                return
+        record={"op":"update","key":key,"data":data}
+        if state is not None:
+            record["state"]=state
+        self.append(record,sync)
+    def finish(self,key,status=None):
+        with self.lock:
+            if key not in self.records:
+                return
+        self.append({"op":"done","key":key,"status":status})
+    def pending(self,kind=None):
+        with self.lock:
+            return [(key,dict(entry,data=dict(entry["data"]))) for key,entry in sorted(self.records.items()) if kind is None or entry["kind"]==kind]
+    def compact(self):
+        with self.lock:
+            if self.stream is not None:
+                self.stream.close()
+                self.stream=None
+            lines=[json.dumps({"op":"add","key":key,"kind":entry["kind"],"state":entry["state"],"data":entry["data"],"time":entry["added_at"]},ensure_ascii=False)+"\n" for key,entry in sorted(self.records.items())]
+            fd,temp_path=tempfile.mkstemp(prefix=".journal-",suffix=".tmp",dir=os.path.dirname(os.path.abspath(self.path)))
+            try:
+                with os.fdopen(fd,"w",encoding="utf-8") as f:
+                    f.writelines(lines)
+                    f.flush()
+                    if self.sync:
+                        os.fsync(f.fileno())
+                os.replace(temp_path,self.path)
+            except:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+    def __len__(self):
+        with self.lock:
+            return len(self.records)
+    def close(self):
+        with self.lock:
+            if self.stream is not None:
+                self.stream.close()
+                self.stream=None
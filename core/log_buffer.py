@@ -0,0 +1,69 @@
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+from collections import Counter, deque
+
+LOG_FORMAT="%(asctime)s %(levelname)-7s %(message)s"
+
+def format_entry(entry):
+    created,level,text=entry
+    return time.strftime("%H:%M:%S",time.localtime(created))+" "+logging.getLevelName(level).ljust(7)+" "+text
+
+def make_record(created,level,text):
+    return logging.makeLogRecord({"name":"youtubego","levelno":level,"levelname":logging.getLevelName(level),"msg":text,"created":created,"msecs":(created-int(created))*1000})
+
+class RotatingLogWriter:
+    def __init__(self,path,max_bytes=5*1024**2,backup_count=3):
+        self.path=path
+        self.queue=queue.SimpleQueue()
+        self.handler=logging.handlers.RotatingFileHandler(path,maxBytes=max_bytes,backupCount=backup_count,encoding="utf-8",delay=True)
+        self.handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        self.listener=logging.handlers.QueueListener(self.queue,self.handler)
+        self.listener.start()
+        self.closed=False
+    def write(self,created,level,text):
+        if not self.closed:
+            self.queue.put_nowait(make_record(created,level,text))
+    def close(self):
+        if self.closed:
+            return
+        self.closed=True
+        self.listener.stop()
+        self.handler.close()
+
+class LogBuffer:
+    def __init__(self,capacity=5000,writer=None):
+        self.entries=deque(maxlen=capacity)
+        self.pending=deque(maxlen=capacity)
+        self.lock=threading.Lock()
+        self.writer=writer
+        self.dropped=0
+        self.counts=Counter()
+    def __len__(self):
+        return len(self.entries)
+    def append(self,text,level=logging.INFO):
+        entry=(time.time(),level,text)
+        with self.lock:
+            self.entries.append(entry)
+            if len(self.pending)==self.pending.maxlen:
+                self.dropped+=1
+            self.pending.append(entry)
+            self.counts[level]+=1
+        if self.writer is not None:
+            self.writer.write(*entry)
+    def drain(self):
+        with self.lock:
+            entries=list(self.pending)
+            self.pending.clear()
+            dropped=self.dropped
+            self.dropped=0
+        return entries,dropped
+    def snapshot(self,min_level=logging.DEBUG,limit=None):
+        with self.lock:
+            entries=[entry for entry in self.entries if entry[1]>=min_level]
+        return entries[-limit:] if limit else entries
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
@@ -0,0 +1,85 @@
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from core.utils import extract_video_id
+
+STABLE_FIELDS=("id","title","fulltitle","uploader","uploader_id","channel","channel_id","duration","thumbnail","webpage_url","extractor","extractor_key","upload_date","_type")
+
+class MetadataCache:
+    def __init__(self,path="metadata_cache.db",format_ttl=2*3600,stable_ttl=30*86400,max_bytes=64*1024*1024):
+        self.path=path
+        self.format_ttl=format_ttl
+        self.stable_ttl=stable_ttl
+        self.max_bytes=max_bytes
+        self.hits=0
+        self.misses=0
+        self.lock=threading.Lock()
+        self.connection=sqlite3.connect(path,check_same_thread=False)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS entries(key TEXT PRIMARY KEY,data BLOB,size INTEGER,fetched_at REAL,accessed_at REAL)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed_at)")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS aliases(url TEXT PRIMARY KEY,key TEXT)")
+        self.connection.commit()
+        self.total_size=self.connection.execute("SELECT COALESCE(SUM(size),0) FROM entries").fetchone()[0]
+    def key_for_url(self,url):
+        video_id=extract_video_id(url)
+        if video_id:
+            return "youtube:"+video_id
+        row=self.connection.execute("SELECT key FROM aliases WHERE url=?",(url,)).fetchone()
+        return row[0] if row else None
+    def key_for_info(self,info):
+        extractor=(info.get("extractor_key") or info.get("extractor") or "generic").lower()
+        return extractor+":"+str(info.get("id"))
+    def get(self,url,need_formats=False):
+        with self.lock:
+            key=self.key_for_url(url)
+            row=self.connection.execute("SELECT data,fetched_at FROM entries WHERE key=?",(key,)).fetchone() if key else None
+            now=time.time()
+            if row is None or now-row[1]>self.stable_ttl or (need_formats and now-row[1]>self.format_ttl):
+                self.misses+=1
+                return None
+            self.connection.execute("UPDATE entries SET accessed_at=? WHERE key=?",(now,key))
+            self.connection.commit()
+            self.hits+=1
+        info=json.loads(zlib.decompress(row[0]))
+        if now-row[1]>self.format_ttl:
+            return {field:info[field] for field in STABLE_FIELDS if field in info}
+        return info
+    def put(self,url,info):
+        if info.get("_type","video")!="video" or info.get("id") is None:
+            return
+        key=self.key_for_info(info)
+        data=zlib.compress(json.dumps(info,default=str,separators=(",",":")).encode("utf-8"))
+        now=time.time()
+        with self.lock:
+            old=self.connection.execute("SELECT size FROM entries WHERE key=?",(key,)).fetchone()
+            if old:
+                self.total_size-=old[0]
+            self.connection.execute("INSERT OR REPLACE INTO entries VALUES(?,?,?,?,?)",(key,data,len(data),now,now))
+            if not extract_video_id(url):
+                self.connection.execute("INSERT OR REPLACE INTO aliases VALUES(?,?)",(url,key))
+            self.total_size+=len(data)
+            self.evict()
+            self.connection.commit()
+    def invalidate(self,url):
+        with self.lock:
+            key=self.key_for_url(url)
+            row=self.connection.execute("SELECT size FROM entries WHERE key=?",(key,)).fetchone() if key else None
+            if row:
+                self.connection.execute("DELETE FROM entries WHERE key=?",(key,))
+                self.total_size-=row[0]
+                self.connection.commit()
+    def evict(self):
+        while self.total_size>self.max_bytes:
+            row=self.connection.execute("SELECT key,size FROM entries ORDER BY accessed_at LIMIT 1").fetchone()
+            if row is None:
+                break
+            self.connection.execute("DELETE FROM entries WHERE key=?",(row[0],))
+            self.connection.execute("DELETE FROM aliases WHERE key=?",(row[0],))
+            self.total_size-=row[1]
+    def stats_text(self):
+        return f"hits={self.hits}, misses={self.misses}"
+    def close(self):
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,119 @@
+import threading
+
+def iter_playlist_entries(entries,page_size=50):
+    if entries is None:
+        return
+    if hasattr(entries,"getslice"):
+        start=0
+        while True:
+            page=entries.getslice(start,start+page_size)
+            yield from page
+            if len(page)<page_size:
+                return
+            start+=page_size
+    else:
+        yield from entries
+
+def entry_url(entry):
+    if not isinstance(entry,dict):
+        return None
+    url=entry.get("webpage_url") or entry.get("url")
+    if not url or "://" not in url:
+        return None
+    return url
+
+class PlaylistState:
+    def __init__(self,title=None):
+        self.title=title
+        self.children=[]
+        self.results={}
+        self.enumerated=False
+        self.error=None
+        self.cancelled=False
+    @property
+    def finished(self):
+        return self.enumerated and len(self.results)==len(self.children)
+    @property
+    def failed(self):
+        return sum(1 for status in self.results.values() if "Completed" not in status and status!="Already Downloaded")
+
+class PlaylistTracker:
+    def __init__(self):
+        self.lock=threading.Lock()
+        self.parents={}
+        self.child_parent={}
+    def add_parent(self,parent_id,title=None):
+        with self.lock:
+            self.parents[parent_id]=PlaylistState(title)
+    def add_child(self,parent_id,child_id):
+        with self.lock:
+            state=self.parents.get(parent_id)
+            if state is None:
+                return
+            state.children.append(child_id)
+            self.child_parent[child_id]=parent_id
+    def children(self,parent_id):
+        with self.lock:
+            state=self.parents.get(parent_id)
+            return list(state.children) if state else []
+    def parent_of(self,child_id):
+        with self.lock:
+            return self.child_parent.get(child_id)
+    def is_parent(self,task_id):
+        with self.lock:
+            return task_id in self.parents
+    def finish_enumeration(self,parent_id,error=None,cancelled=False):
+        with self.lock:
+            state=self.parents.get(parent_id)
+            if state is None:
+                return False
+            state.enumerated=True
+            state.error=error
+            state.cancelled=state.cancelled or cancelled
+            return state.finished
+    def cancel(self,parent_id):
+        with self.lock:
+            state=self.parents.get(parent_id)
+            if state is not None:
+                state.cancelled=True
+    def finish_child(self,child_id,status):
+        with self.lock:
+            parent_id=self.child_parent.pop(child_id,None)
+            state=self.parents.get(parent_id)
+            if state is None:
+                return None,False
+            state.results[child_id]=status
+            return parent_id,state.finished
+    def percent(self,parent_id,rows=None):
+        rows=rows or {}
+        with self.lock:
+            state=self.parents.get(parent_id)
+            if state is None or not state.children:
+                return 0
+            done=len(state.results)*100+sum(rows.get(child_id,0) for child_id in state.children if child_id not in state.results)
+            return done/len(state.children)
+    def status_text(self,parent_id,rows=None):
+        percent=self.percent(parent_id,rows)
+        with self.lock:
+            state=self.parents.get(parent_id)
+            if state is None:
+                return ""
+            total=len(state.children)
+            done=len(state.results)
+            failed=state.failed
+            if state.finished:
+                if state.error and not total:
+                    return "Playlist Error"
+                if state.cancelled:
+                    return "Playlist Cancelled"
+                if failed:
+                    return f"Playlist Completed ({failed} failed)"
+                return "Playlist Completed"
+            text=f"{done}/{total}" if state.enumerated else f"{done}/{total}+"
+        return text+f" - {int(percent)}%"
+    def remove(self,parent_id):
+        with self.lock:
+            state=self.parents.pop(parent_id,None)
+            if state is not None:
+                for child_id in state.children:
+                    self.child_parent.pop(child_id,None)
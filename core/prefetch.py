@@ -0,0 +1,112 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from core.engine import EngineListener, MetadataFetcher
+
+class MetadataPrefetcher:
+    def __init__(self,listener=None,metadata_cache=None,max_workers=2,lookahead=None):
+        self.listener=listener or EngineListener()
+        self.metadata_cache=metadata_cache
+        self.max_workers=max_workers
+        self.lookahead=lookahead
+        self.lock=threading.Lock()
+        self.ready=threading.Condition(self.lock)
+        self.heap=[]
+        self.queued={}
+        self.running={}
+        self.ahead=set()
+        self.released=set()
+        self.counter=itertools.count()
+        self.threads=[]
+        self.fetcher=MetadataFetcher(metadata_cache)
+        self.closed=False
+        self.prefetched=0
+        self.failed=0
+    def submit(self,task_id,url,priority=1):
+        if self.metadata_cache is None or self.max_workers<1:
+            return
+        with self.lock:
+            if self.closed or task_id in self.running:
+                return
+            seq=next(self.counter)
+            self.queued[task_id]=seq
+            heapq.heappush(self.heap,(priority,seq,task_id,url))
+            if len(self.threads)<min(self.max_workers,len(self.queued)):
+                thread=threading.Thread(target=self.run,name="prefetch-"+str(len(self.threads)),daemon=True)
+                self.threads.append(thread)
+                thread.start()
+            self.ready.notify()
+    def discard(self,task_id):
+        with self.lock:
+            self.release(task_id)
+    def claim(self,task_id,cancelled=None):
+        with self.lock:
+            self.release(task_id)
+            done=self.running.get(task_id)
+        if done is None:
+            return False
+        while not done.wait(0.1):
+            if cancelled is not None and cancelled():
+                return False
+        return True
+    def pending_count(self):
+        with self.lock:
+            return len(self.queued)+len(self.running)
+    def release(self,task_id):
+        self.queued.pop(task_id,None)
+        self.ahead.discard(task_id)
+        if task_id in self.running:
+            self.released.add(task_id)
+        self.ready.notify()
+    def window_full(self):
+        return self.lookahead is not None and len(self.running)+len(self.ahead)>=self.lookahead()
+    def next_item(self):
+        with self.lock:
+            while not self.closed:
+                while self.heap and not self.window_full():
+                    priority,seq,task_id,url=heapq.heappop(self.heap)
+                    if self.queued.get(task_id)==seq:
+                        del self.queued[task_id]
+                        done=threading.Event()
+                        self.running[task_id]=done
+                        return task_id,url,done
+                self.ready.wait(1 if self.heap else None)
+        return None
+    def run(self):
+        while True:
+            item=self.next_item()
+            if item is None:
+                return
+            task_id,url,done=item
+            try:
+                self.prefetch(task_id,url)
+            finally:
+                with self.lock:
+                    self.running.pop(task_id,None)
+                    if task_id in self.released:
+                        self.released.discard(task_id)
+                    else:
+                        self.ahead.add(task_id)
+                    self.ready.notify()
+                done.set()
+    def prefetch(self,task_id,url):
+        started=time.monotonic()
+        try:
+            info,cached=self.fetcher.fetch(url)
+        except Exception as e:
+            self.failed+=1
+            self.listener.on_log_record("Metadata prefetch failed for "+url+": "+str(e),logging.DEBUG)
+            return
+        if not cached:
+            self.prefetched+=1
+            self.listener.on_log_record("Prefetched metadata for "+url+" in "+f"{(time.monotonic()-started)*1000:.0f}"+" ms",logging.DEBUG)
+        self.listener.on_info(task_id,info.get("title") or url,info.get("uploader") or info.get("channel") or "Unknown Channel")
+    def shutdown(self):
+        with self.lock:
+            self.closed=True
+            self.queued.clear()
+            self.heap.clear()
+            self.ahead.clear()
+            self.ready.notify_all()
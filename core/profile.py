@@ -1,92 +1,148 @@
 import os
 import json
+import atexit
+import tempfile
+import threading
+from core.history import HistoryStore
 
 class UserProfile:
-    def __init__(self,profile_path="user_profile.json"):
+    def __init__(self,profile_path="user_profile.json",history_path=None,save_delay=0.5):
         self.profile_path=profile_path
-        self.data={"name":"","profile_picture":"","default_resolution":"720p","download_path":os.getcwd(),"history_enabled":True,"theme":"Dark","proxy":"","social_media_links":{"instagram":"","twitter":"","youtube":""},"language":"en","rate_limit":None,"history":[]}
+        self.save_delay=save_delay
+        self.save_timer=None
+        self.dirty=False
+        self.write_count=0
+        self.lock=threading.RLock()
+        self.data={"name":"","profile_picture":"","default_resolution":"720p","download_path":os.getcwd(),"history_enabled":True,"theme":"Dark","proxy":"","social_media_links":{"instagram":"","twitter":"","youtube":""},"language":"en","rate_limit":None}
+        self.history=HistoryStore(history_path or os.path.splitext(profile_path)[0]+"_history.db")
         self.load_profile()
+        atexit.register(self.flush)
     def load_profile(self):
-        if os.path.exists(self.profile_path):
+        if not os.path.exists(self.profile_path):
+            self.save_profile()
+            return
+        try:
             with open(self.profile_path,"r",encoding="utf-8") as f:
-                try:
-                    self.data=json.load(f)
-                    if "social_media_links" not in self.data:
-                        self.data["social_media_links"]={"instagram":"","twitter":"","youtube":""}
-                    if "history" not in self.data:
-                        self.data["history"]=[]
-                    self.save_profile()
-                except:
-                    self.save_profile()
-        else:
+                self.data=json.load(f)
+        except:
+            self.save_profile()
+            return
+        changed=False
+        if "social_media_links" not in self.data:
+            self.data["social_media_links"]={"instagram":"","twitter":"","youtube":""}
+            changed=True
+        if "history" in self.data:
+            entries=self.data.pop("history")
+            if self.history.count()==0:
+                self.history.add_many(entries)
+            changed=True
+        if changed:
             self.save_profile()
     def save_profile(self):
-        with open(self.profile_path,"w",encoding="utf-8") as f:
-            json.dump(self.data,f,indent=4)
-    def set_profile(self,name,profile_picture,download_path):
-        self.data["name"]=name
-        self.data["profile_picture"]=profile_picture
-        self.data["download_path"]=download_path
+        with self.lock:
+            self.dirty=True
+            if self.save_delay is not None and self.save_timer is None:
+                self.save_timer=threading.Timer(self.save_delay,self.flush)
+                self.save_timer.daemon=True
+                self.save_timer.start()
+        if self.save_delay is None:
+            self.flush()
+    def flush(self):
+        with self.lock:
+            if self.save_timer is not None:
+                self.save_timer.cancel()
+                self.save_timer=None
+            if not self.dirty:
+                return
+            text=json.dumps(self.data,indent=4)
+            fd,temp_path=tempfile.mkstemp(prefix=".profile-",suffix=".tmp",dir=os.path.dirname(os.path.abspath(self.profile_path)))
+            try:
+                with os.fdopen(fd,"w",encoding="utf-8") as f:
+                    f.write(text)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path,self.profile_path)
+            except:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            self.dirty=False
+            self.write_count+=1
+    def close(self):
+        self.flush()
+        self.history.close()
+    def update_data(self,**values):
+        with self.lock:
+            self.data.update(values)
         self.save_profile()
+    def set_profile(self,name,profile_picture,download_path):
+        self.update_data(name=name,profile_picture=profile_picture,download_path=download_path)
     def set_social_links(self,instagram,twitter,youtube):
-        self.data["social_media_links"]={"instagram":instagram,"twitter":twitter,"youtube":youtube}
-        self.save_profile()
+        self.update_data(social_media_links={"instagram":instagram,"twitter":twitter,"youtube":youtube})
     def remove_profile_picture(self):
         if self.data["profile_picture"] and os.path.exists(self.data["profile_picture"]):
             try:
                 os.remove(self.data["profile_picture"])
             except:
                 pass
-        self.data["profile_picture"]=""
-        self.save_profile()
+        self.update_data(profile_picture="")
     def get_download_path(self):
         return self.data.get("download_path",os.getcwd())
     def get_proxy(self):
         return self.data.get("proxy","")
     def set_proxy(self,proxy):
-        self.data["proxy"]=proxy
-        self.save_profile()
+        self.update_data(proxy=proxy)
     def get_theme(self):
         return self.data.get("theme","Dark")
     def set_theme(self,theme):
-        self.data["theme"]=theme
-        self.save_profile()
+        self.update_data(theme=theme)
     def get_default_resolution(self):
         return self.data.get("default_resolution","720p")
     def set_default_resolution(self,resolution):
-        self.data["default_resolution"]=resolution
-        self.save_profile()
+        self.update_data(default_resolution=resolution)
     def is_history_enabled(self):
         return self.data.get("history_enabled",True)
     def set_history_enabled(self,enabled):
-        self.data["history_enabled"]=enabled
-        self.save_profile()
+        self.update_data(history_enabled=enabled)
     def is_profile_complete(self):
         return bool(self.data["name"])
+    def is_archive_enabled(self):
+        return self.data.get("archive_enabled",True)
+    def set_archive_enabled(self,enabled):
+        self.update_data(archive_enabled=enabled)
     def set_language(self,language):
-        self.data["language"]=language
-        self.save_profile()
+        self.update_data(language=language)
     def get_language(self):
         return self.data.get("language","en")
     def set_rate_limit(self,rate_limit):
-        self.data["rate_limit"]=rate_limit
-        self.save_profile()
+        self.update_data(rate_limit=rate_limit)
     def get_rate_limit(self):
         return self.data.get("rate_limit",None)
+    def set_audio_format(self,audio_format):
+        self.update_data(audio_format=audio_format)
+    def get_audio_format(self):
+        return self.data.get("audio_format","mp3")
+    def set_acceleration(self,acceleration):
+        self.update_data(acceleration=acceleration)
+    def get_acceleration(self):
+        return self.data.get("acceleration",{})
+    def set_bandwidth_calendar(self,windows):
+        self.update_data(bandwidth_calendar=windows)
+    def get_bandwidth_calendar(self):
+        return self.data.get("bandwidth_calendar",[])
+    def get_history(self):
+        return self.history.entries()
     def add_history_entry(self,title,channel,url,status):
-        self.data["history"].append({"title":title,"channel":channel,"url":url,"status":status})
-        self.save_profile()
+        self.history.add(title,channel,url,status)
+    def add_history_entries(self,entries):
+        self.history.add_many(entries)
     def remove_history_entries(self,urls):
-        self.data["history"]=[entry for entry in self.data["history"] if entry["url"] not in urls]
-        self.save_profile()
+        self.history.remove(urls)
     def clear_history(self):
-        self.data["history"]=[]
-        self.save_profile()
+        self.history.clear()
+    def set_history_status(self,url,status):
+        self.history.set_status(url,status)
+    def set_history_metrics(self,url,metrics):
+        self.history.set_metrics(url,metrics)
     def update_history_entry(self,url,new_title,new_channel,new_status=None):
-        for entry in self.data["history"]:
-            if entry["url"]==url:
-                entry["title"]=new_title
-                entry["channel"]=new_channel
-                if new_status is not None:
-                    entry["status"]=new_status
-        self.save_profile()
+        self.history.update(url,new_title,new_channel,new_status)
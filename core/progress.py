@@ -0,0 +1,42 @@
+import threading
+
+class ProgressSnapshot:
+    def __init__(self,slots):
+        self.rows={}
+        downloaded=0
+        total=0
+        self.speed=0
+        self.eta=0
+        for row,done,size,speed,eta in slots.values():
+            percent=min(done/size*100,100) if size else 0
+            if row is not None:
+                self.rows[row]=percent
+            if size:
+                downloaded+=min(done,size)
+                total+=size
+            self.speed+=speed
+            self.eta=max(self.eta,eta)
+        self.active=len(slots)
+        self.percent=downloaded/total*100 if total else 0
+
+class ProgressAggregator:
+    def __init__(self):
+        self.lock=threading.Lock()
+        self.slots={}
+        self.version=0
+        self.seen_version=0
+    def update(self,key,row,downloaded,total,speed,eta):
+        with self.lock:
+            self.slots[key]=(row,downloaded,total,speed,eta)
+            self.version+=1
+    def remove(self,key):
+        with self.lock:
+            if self.slots.pop(key,None) is not None:
+                self.version+=1
+    def snapshot(self,force=False):
+        with self.lock:
+            if self.version==self.seen_version and not force:
+                return None
+            self.seen_version=self.version
+            slots=dict(self.slots)
+        return ProgressSnapshot(slots)
@@ -0,0 +1,94 @@
+import heapq
+import itertools
+import time
+
+class DownloadScheduler:
+    def __init__(self,max_concurrent=3,start_callback=None,expand_callback=None):
+        self.max_concurrent=max_concurrent
+        self.start_callback=start_callback
+        self.expand_callback=expand_callback
+        self.heap=[]
+        self.tasks={}
+        self.states={}
+        self.entries={}
+        self.running=set()
+        self.task_ids=itertools.count(1)
+        self.sequence=itertools.count()
+    def __len__(self):
+        return len(self.tasks)
+    def submit(self,task,hold=False):
+        task.task_id=next(self.task_ids)
+        self.tasks[task.task_id]=task
+        if hold:
+            self.states[task.task_id]="held"
+        else:
+            self.enqueue(task)
+            self.pump()
+        return task.task_id
+    def enqueue(self,task):
+        entry=next(self.sequence)
+        task.queued_at=time.time()
+        self.entries[task.task_id]=entry
+        self.states[task.task_id]="queued"
+        heapq.heappush(self.heap,(task.priority,entry,task.task_id))
+    def release(self,task_id):
+        if self.states.get(task_id)=="held":
+            self.enqueue(self.tasks[task_id])
+        return self.pump()
+    def release_held(self):
+        for task_id,state in list(self.states.items()):
+            if state=="held":
+                self.enqueue(self.tasks[task_id])
+        return self.pump()
+    def pump(self):
+        started=[]
+        expanded=[]
+        while self.heap and (len(self.running)<self.max_concurrent or self.expands(self.tasks.get(self.heap[0][2]))):
+            priority,entry,task_id=heapq.heappop(self.heap)
+            if self.states.get(task_id)!="queued" or self.entries.get(task_id)!=entry:
+                continue
+            task=self.tasks[task_id]
+            if self.expands(task):
+                self.states[task_id]="expanding"
+                expanded.append(task)
+                continue
+            self.states[task_id]="running"
+            self.running.add(task_id)
+            started.append(task)
+        for task in expanded:
+            self.expand_callback(task)
+        if self.start_callback is not None:
+            for task in started:
+                self.start_callback(task)
+        return started
+    def expands(self,task):
+        return self.expand_callback is not None and task is not None and task.playlist
+    def finish(self,task_id):
+        if task_id not in self.tasks:
+            return []
+        self.running.discard(task_id)
+        self.forget(task_id)
+        return self.pump()
+    def cancel(self,task_id):
+        if self.states.get(task_id) in ("queued","held"):
+            self.forget(task_id)
+            return True
+        return False
+    def forget(self,task_id):
+        self.tasks.pop(task_id,None)
+        self.states.pop(task_id,None)
+        self.entries.pop(task_id,None)
+    def set_priority(self,task_id,priority):
+        task=self.tasks.get(task_id)
+        if task is None:
+            return
+        task.priority=priority
+        if self.states.get(task_id)=="queued":
+            self.enqueue(task)
+    def set_max_concurrent(self,max_concurrent):
+        self.max_concurrent=max_concurrent
+        return self.pump()
+    def state(self,task_id):
+        return self.states.get(task_id)
+    def count(self,state):
+        return sum(1 for value in self.states.values() if value==state)
@@ -0,0 +1,70 @@
+import bisect
+from operator import add
+
+class SubstringIndex:
+    row_separator="\x00"
+    block_rows=128
+    def __init__(self,texts=()):
+        self.parts=[]
+        self.offsets=[]
+        self.length=0
+        self.haystack=""
+        self.grams={}
+        self.indexed=0
+        self.dirty=False
+        self.extend(texts)
+    def __len__(self):
+        return len(self.offsets)
+    def extend(self,texts):
+        for text in texts:
+            lowered=text.lower().replace(self.row_separator," ")
+            self.offsets.append(self.length)
+            self.parts.append(lowered)
+            self.length+=len(lowered)+1
+        self.dirty=True
+    def compact(self):
+        if not self.dirty:
+            return
+        self.haystack=self.row_separator.join(self.parts)+self.row_separator
+        offsets=self.offsets
+        count=len(offsets)
+        for first in range(self.indexed-self.indexed%self.block_rows,count,self.block_rows):
+            last=min(first+self.block_rows,count)
+            text=self.haystack[offsets[first]:offsets[last] if last<count else self.length]
+            bit=1<<(first//self.block_rows)
+            for gram in set(map(add,map(add,text,text[1:]),text[2:])):
+                self.grams[gram]=self.grams.get(gram,0)|bit
+        self.indexed=count
+        self.dirty=False
+    def candidate_blocks(self,query):
+        blocks=(1<<-(-len(self.offsets)//self.block_rows))-1
+        for start in range(len(query)-2):
+            blocks&=self.grams.get(query[start:start+3],0)
+            if not blocks:
+                break
+        return blocks
+    def iter_search(self,query):
+        query=query.lower().replace(self.row_separator,"")
+        count=len(self.offsets)
+        if not query:
+            yield from range(count)
+            return
+        self.compact()
+        find=self.haystack.find
+        offsets=self.offsets
+        blocks=self.candidate_blocks(query)
+        while blocks:
+            lowest=blocks&-blocks
+            blocks^=lowest
+            first=(lowest.bit_length()-1)*self.block_rows
+            last=min(first+self.block_rows,count)
+            end=offsets[last] if last<count else self.length
+            position=find(query,offsets[first],end)
+            while position!=-1:
+                row=bisect.bisect_right(offsets,position,first,last)-1
+                yield row
+                if row+1>=last:
+                    break
+                position=find(query,offsets[row+1],end)
+    def search(self,query):
+        return list(self.iter_search(query))
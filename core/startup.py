@@ -0,0 +1,50 @@
+import builtins
+import json
+import sys
+import threading
+import time
+
+class StartupProfiler:
+    def __init__(self):
+        self.started=time.perf_counter()
+        self.thread_ident=threading.get_ident()
+        self.original_import=None
+        self.stack=[]
+        self.imports={}
+        self.marks=[]
+    def install(self):
+        if self.original_import is not None:
+            return
+        self.original_import=builtins.__import__
+        builtins.__import__=self.timed_import
+    def uninstall(self):
+        if self.original_import is None:
+            return
+        builtins.__import__=self.original_import
+        self.original_import=None
+    def timed_import(self,name,globals=None,locals=None,fromlist=(),level=0):
+        if level or name in sys.modules or threading.get_ident()!=self.thread_ident:
+            return self.original_import(name,globals,locals,fromlist,level)
+        self.stack.append(0)
+        started=time.perf_counter()
+        try:
+            return self.original_import(name,globals,locals,fromlist,level)
+        finally:
+            elapsed=time.perf_counter()-started
+            children=self.stack.pop()
+            self.imports[name]=self.imports.get(name,0)+elapsed-children
+            if self.stack:
+                self.stack[-1]+=elapsed
+    def mark(self,label):
+        self.marks.append((label,time.perf_counter()-self.started))
+    def report(self,limit=25):
+        import_total=sum(self.imports.values())
+        return {"marks_ms":{label:round(elapsed*1000,1) for label,elapsed in self.marks},"imports_ms":round(import_total*1000,1),"import_breakdown_ms":{name:round(elapsed*1000,1) for name,elapsed in sorted(self.imports.items(),key=lambda item:item[1],reverse=True)[:limit]},"modules_loaded":len(sys.modules)}
+    def write_report(self,path=None,stream=None):
+        text=json.dumps(self.report(),indent=2)
+        if path:
+            with open(path,"w") as f:
+                f.write(text)
+        if stream is not None:
+            stream.write(text+"\n")
+        return text
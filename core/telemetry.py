@@ -0,0 +1,124 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter, deque
+
+TIMING_FIELDS=("queue_wait","extract","first_byte","seconds","merge","postprocess","total")
+
+def percentile(values,fraction):
+    if not values:
+        return 0
+    ordered=sorted(values)
+    return ordered[max(math.ceil(fraction*len(ordered))-1,0)]
+
+def describe_metrics(metrics):
+    parts=[]
+    for field,label in (("extract","extract"),("first_byte","first byte"),("seconds","transfer"),("merge","merge"),("postprocess","postprocess")):
+        if metrics.get(field):
+            parts.append(f"{label} {metrics[field]:.2f} s")
+    if metrics.get("throughput"):
+        parts.append(f"{metrics['throughput']/1024**2:.2f} MB/s (peak {metrics.get('peak_throughput',0)/1024**2:.2f})")
+    if metrics.get("retries"):
+        parts.append(f"{metrics['retries']} retries")
+    return ", ".join(parts)
+
+def write_atomic(path,text):
+    temp_path=path+".tmp"
+    with open(temp_path,"w",encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temp_path,path)
+
+class TaskTelemetry:
+    def __init__(self,queued_at=None):
+        self.queued_at=queued_at
+        self.started_at=None
+        self.started=None
+        self.marks={}
+        self.phases={}
+        self.first_byte=None
+        self.peak_rate=0
+        self.retries=0
+        self.cache_hit=False
+        self.worker=None
+    def start(self,worker=None):
+        self.started_at=time.time()
+        self.started=time.monotonic()
+        self.worker=worker
+    def begin(self,phase):
+        self.marks[phase]=time.monotonic()
+    def end(self,phase):
+        started=self.marks.pop(phase,None)
+        if started is not None:
+            self.add(phase,time.monotonic()-started)
+    def add(self,phase,seconds):
+        self.phases[phase]=self.phases.get(phase,0)+seconds
+    def record_progress(self,downloaded,speed):
+        if self.first_byte is None and downloaded>0 and "download" in self.marks:
+            self.first_byte=time.monotonic()-self.marks["download"]
+        if speed and speed>self.peak_rate:
+            self.peak_rate=speed
+    def to_dict(self,status,downloaded=0,transfer=0):
+        queue_wait=self.started_at-self.queued_at if self.queued_at and self.started_at else None
+        metrics={"status":status,"queue_wait":queue_wait,"extract":self.phases.get("extract"),"first_byte":self.first_byte,"bytes":downloaded,"seconds":transfer,"throughput":int(downloaded/transfer) if transfer>0 else 0,"peak_throughput":int(self.peak_rate),"merge":self.phases.get("merge"),"postprocess":self.phases.get("postprocess"),"total":time.monotonic()-self.started if self.started is not None else None,"retries":self.retries,"cache_hit":self.cache_hit,"worker":self.worker,"finished_at":time.time()}
+        return {key:round(value,3) if isinstance(value,float) else value for key,value in metrics.items()}
+
+class TelemetryStats:
+    def __init__(self,window=1000):
+        self.samples=deque(maxlen=window)
+        self.lock=threading.Lock()
+        self.version=0
+        self.written_version=-1
+    def __len__(self):
+        return len(self.samples)
+    def add(self,metrics):
+        with self.lock:
+            self.samples.append(metrics)
+            self.version+=1
+    def add_many(self,samples):
+        with self.lock:
+            self.samples.extend(samples)
+            self.version+=1
+    def summary(self):
+        with self.lock:
+            samples=list(self.samples)
+        timings={}
+        for field in TIMING_FIELDS:
+            values=[sample[field] for sample in samples if sample.get(field) is not None]
+            timings[field]={"p50":round(percentile(values,0.5),3),"p95":round(percentile(values,0.95),3),"count":len(values),"sum":round(sum(values),3)}
+        transfers=[sample for sample in samples if sample.get("seconds") and sample.get("bytes")]
+        workers={}
+        for sample in transfers:
+            worker=workers.setdefault(sample.get("worker") or "unknown",[0,0])
+            worker[0]+=sample["bytes"]
+            worker[1]+=sample["seconds"]
+        total_bytes=sum(sample["bytes"] for sample in transfers)
+        total_seconds=sum(sample["seconds"] for sample in transfers)
+        return {"downloads":len(samples),"statuses":dict(Counter(sample.get("status","unknown") for sample in samples)),"timings":timings,"bytes":total_bytes,"mean_throughput":int(total_bytes/total_seconds) if total_seconds else 0,"peak_throughput":max((sample.get("peak_throughput",0) for sample in samples),default=0),"retries":sum(sample.get("retries",0) for sample in samples),"cache_hits":sum(1 for sample in samples if sample.get("cache_hit")),"worker_throughput":{worker:int(done/seconds) for worker,(done,seconds) in sorted(workers.items())},"generated_at":round(time.time(),3)}
+    def to_json(self,summary=None):
+        return json.dumps(summary or self.summary(),indent=2,sort_keys=True)+"\n"
+    def to_prometheus(self,summary=None):
+        summary=summary or self.summary()
+        lines=["# HELP youtubego_downloads_total Finished downloads in the telemetry window by status.","# TYPE youtubego_downloads_total gauge"]
+        lines+=[f'youtubego_downloads_total{{status="{status}"}} {count}' for status,count in sorted(summary["statuses"].items())]
+        for field,timing in summary["timings"].items():
+            name="youtubego_"+("transfer" if field=="seconds" else field)+"_seconds"
+            lines+=[f"# HELP {name} Per-download {field.replace('_',' ')} time.",f"# TYPE {name} summary",f'{name}{{quantile="0.5"}} {timing["p50"]}',f'{name}{{quantile="0.95"}} {timing["p95"]}',f"{name}_sum {timing['sum']}",f"{name}_count {timing['count']}"]
+        lines+=["# HELP youtubego_downloaded_bytes Bytes transferred in the telemetry window.","# TYPE youtubego_downloaded_bytes gauge",f"youtubego_downloaded_bytes {summary['bytes']}"]
+        lines+=["# HELP youtubego_throughput_bytes_per_second Mean and peak download throughput.","# TYPE youtubego_throughput_bytes_per_second gauge",f'youtubego_throughput_bytes_per_second{{kind="mean"}} {summary["mean_throughput"]}',f'youtubego_throughput_bytes_per_second{{kind="peak"}} {summary["peak_throughput"]}']
+        lines+=["# HELP youtubego_worker_bytes_per_second Mean transfer throughput per worker thread.","# TYPE youtubego_worker_bytes_per_second gauge"]
+        lines+=[f'youtubego_worker_bytes_per_second{{worker="{worker}"}} {rate}' for worker,rate in summary["worker_throughput"].items()]
+        lines+=["# HELP youtubego_retries_total Retries in the telemetry window.","# TYPE youtubego_retries_total gauge",f"youtubego_retries_total {summary['retries']}"]
+        return "\n".join(lines)+"\n"
+    def write(self,json_path,prometheus_path=None,force=False):
+        with self.lock:
+            version=self.version
+        if version==self.written_version and not force:
+            return False
+        summary=self.summary()
+        write_atomic(json_path,self.to_json(summary))
+        if prometheus_path:
+            write_atomic(prometheus_path,self.to_prometheus(summary))
+        self.written_version=version
+        return True
@@ -0,0 +1,151 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from core.engine import DownloadJob, ensure_cookie_file, load_yt_dlp
+from core.utils import extract_video_id
+
+def youtube_thumbnail_url(url,quality="mqdefault"):
+    video_id=extract_video_id(url)
+    return f"https://i.ytimg.com/vi/{video_id}/{quality}.jpg" if video_id else None
+
+class ThumbnailCache:
+    def __init__(self,directory="thumbnail_cache",max_bytes=64*1024*1024):
+        self.directory=directory
+        self.max_bytes=max_bytes
+        self.hits=0
+        self.misses=0
+        self.lock=threading.Lock()
+        os.makedirs(directory,exist_ok=True)
+        self.connection=sqlite3.connect(os.path.join(directory,"index.db"),check_same_thread=False)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS blobs(digest TEXT PRIMARY KEY,size INTEGER,accessed_at REAL)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS blobs_accessed ON blobs(accessed_at)")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS urls(url TEXT PRIMARY KEY,digest TEXT)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS urls_digest ON urls(digest)")
+        self.connection.commit()
+        self.total_size=self.connection.execute("SELECT COALESCE(SUM(size),0) FROM blobs").fetchone()[0]
+    def path_for(self,digest):
+        return os.path.join(self.directory,digest[:2],digest)
+    def get(self,url):
+        with self.lock:
+            row=self.connection.execute("SELECT digest FROM urls WHERE url=?",(url,)).fetchone()
+            if row is None:
+                self.misses+=1
+                return None
+            try:
+                with open(self.path_for(row[0]),"rb") as f:
+                    data=f.read()
+            except OSError:
+                self.drop(row[0])
+                self.connection.commit()
+                self.misses+=1
+                return None
+            self.connection.execute("UPDATE blobs SET accessed_at=? WHERE digest=?",(time.time(),row[0]))
+            self.connection.commit()
+            self.hits+=1
+            return data
+    def put(self,url,data):
+        digest=hashlib.sha256(data).hexdigest()
+        path=self.path_for(digest)
+        with self.lock:
+            exists=self.connection.execute("SELECT 1 FROM blobs WHERE digest=?",(digest,)).fetchone()
+            if not exists:
+                os.makedirs(os.path.dirname(path),exist_ok=True)
+                temp_path=path+".tmp"
+                with open(temp_path,"wb") as f:
+                    f.write(data)
+                os.replace(temp_path,path)
+                self.connection.execute("INSERT INTO blobs VALUES(?,?,?)",(digest,len(data),time.time()))
+                self.total_size+=len(data)
+            self.connection.execute("INSERT OR REPLACE INTO urls VALUES(?,?)",(url,digest))
+            self.evict()
+            self.connection.commit()
+        return digest
+    def drop(self,digest):
+        row=self.connection.execute("SELECT size FROM blobs WHERE digest=?",(digest,)).fetchone()
+        self.connection.execute("DELETE FROM blobs WHERE digest=?",(digest,))
+        self.connection.execute("DELETE FROM urls WHERE digest=?",(digest,))
+        if row:
+            self.total_size-=row[0]
+        try:
+            os.remove(self.path_for(digest))
+        except OSError:
+            pass
+    def evict(self):
+        while self.total_size>self.max_bytes:
+            row=self.connection.execute("SELECT digest FROM blobs ORDER BY accessed_at LIMIT 1").fetchone()
+            if row is None:
+                break
+            self.drop(row[0])
+    def stats_text(self):
+        return f"hits={self.hits}, misses={self.misses}, {self.total_size/1024**2:.1f} MB"
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+class ThumbnailService:
+    def __init__(self,cache,metadata_cache=None,max_workers=4,timeout=10):
+        self.cache=cache
+        self.metadata_cache=metadata_cache
+        self.max_workers=max_workers
+        self.timeout=timeout
+        self.executor=ThreadPoolExecutor(max_workers,thread_name_prefix="thumbnail")
+        self.lock=threading.RLock()
+        self.session=None
+        self.inflight={}
+        self.fetch_count=0
+    def http(self):
+        with self.lock:
+            if self.session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                self.session=requests.Session()
+                adapter=HTTPAdapter(pool_connections=self.max_workers,pool_maxsize=self.max_workers,max_retries=2)
+                self.session.mount("http://",adapter)
+                self.session.mount("https://",adapter)
+            return self.session
+    def resolve(self,video_url,extract=False):
+        thumbnail_url=youtube_thumbnail_url(video_url)
+        if thumbnail_url:
+            return thumbnail_url
+        info=self.metadata_cache.get(video_url) if self.metadata_cache is not None else None
+        if info is None and extract:
+            ensure_cookie_file(DownloadJob.cookie_text)
+            with load_yt_dlp().CountingYoutubeDL({"quiet":True,"skip_download":True,"cookiefile":"youtube_cookies.txt"}) as ydl:
+                info=ydl.extract_info(video_url,download=False)
+                if self.metadata_cache is not None:
+                    self.metadata_cache.put(video_url,ydl.sanitize_info(info))
+        return info.get("thumbnail") if info else None
+    def fetch(self,thumbnail_url):
+        data=self.cache.get(thumbnail_url)
+        if data is not None:
+            return data
+        response=self.http().get(thumbnail_url,timeout=self.timeout)
+        response.raise_for_status()
+        self.fetch_count+=1
+        self.cache.put(thumbnail_url,response.content)
+        return response.content
+    def load(self,video_url,extract=False):
+        thumbnail_url=self.resolve(video_url,extract)
+        if thumbnail_url is None:
+            return None
+        return self.fetch(thumbnail_url)
+    def submit(self,video_url,extract=False):
+        key=(video_url,extract)
+        with self.lock:
+            future=self.inflight.get(key)
+            if future is None:
+                future=self.executor.submit(self.load,video_url,extract)
+                self.inflight[key]=future
+                future.add_done_callback(lambda done:self.finish(key))
+            return future
+    def finish(self,key):
+        with self.lock:
+            self.inflight.pop(key,None)
+    def close(self):
+        self.executor.shutdown(wait=False,cancel_futures=True)
+        if self.session is not None:
+            self.session.close()
+        self.cache.close()
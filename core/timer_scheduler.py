@@ -0,0 +1,95 @@
+import calendar
+import datetime
+import heapq
+import itertools
+
+TIME_FORMAT="%Y-%m-%d %H:%M:%S"
+RECURRENCES=("daily","weekly","monthly")
+
+def parse_time(text):
+    return datetime.datetime.strptime(text,TIME_FORMAT)
+
+def format_time(moment):
+    return moment.strftime(TIME_FORMAT)
+
+def add_months(moment,months):
+    month=moment.month-1+months
+    year=moment.year+month//12
+    month=month%12+1
+    return moment.replace(year=year,month=month,day=min(moment.day,calendar.monthrange(year,month)[1]))
+
+def next_occurrence(start,recurrence,after):
+    if start>after:
+        return start
+    if recurrence in ("daily","weekly"):
+        step=datetime.timedelta(days=1 if recurrence=="daily" else 7)
+        return start+step*((after-start)//step+1)
+    if recurrence=="monthly":
+        months=(after.year-start.year)*12+after.month-start.month
+        moment=add_months(start,months)
+        while moment<=after:
+            months+=1
+            moment=add_months(start,months)
+        return moment
+    return None
+
+class ScheduledItem:
+    def __init__(self,key,data):
+        self.key=key
+        self.data=data
+        self.when=parse_time(data["time"])
+        self.start=parse_time(data.get("start") or data["time"])
+        self.recurrence=data.get("recurrence")
+        self.status="Scheduled"
+        self.entry=None
+
+class TimerScheduler:
+    def __init__(self):
+        self.heap=[]
+        self.items={}
+        self.sequence=itertools.count()
+    def __len__(self):
+        return len(self.items)
+    def add(self,key,data):
+        item=ScheduledItem(key,data)
+        self.items[key]=item
+        self.push(item)
+        return item
+    def push(self,item):
+        item.entry=next(self.sequence)
+        heapq.heappush(self.heap,(item.when,item.entry,item.key))
+    def remove(self,key):
+        item=self.items.pop(key,None)
+        if len(self.heap)>2*len(self.items)+64:
+            self.heap=[(when,entry,key) for when,entry,key in self.heap if self.is_current(entry,key)]
+            heapq.heapify(self.heap)
+        return item
+    def is_current(self,entry,key):
+        item=self.items.get(key)
+        return item is not None and item.entry==entry and item.status=="Scheduled"
+    def peek(self):
+        while self.heap and not self.is_current(self.heap[0][1],self.heap[0][2]):
+            heapq.heappop(self.heap)
+        return self.items[self.heap[0][2]] if self.heap else None
+    def next_time(self):
+        item=self.peek()
+        return item.when if item else None
+    def seconds_until_next(self,now=None,max_wait=3600):
+        moment=self.next_time()
+        if moment is None:
+            return None
+        now=now or datetime.datetime.now()
+        return min(max((moment-now).total_seconds(),0),max_wait)
+    def pop_due(self,now=None):
+        now=now or datetime.datetime.now()
+        fired=[]
+        while self.peek() is not None and self.heap[0][0]<=now:
+            item=self.items[heapq.heappop(self.heap)[2]]
+            fired.append(item)
+            if item.recurrence:
+                item.when=next_occurrence(item.start,item.recurrence,now)
+                item.data["time"]=format_time(item.when)
+                self.push(item)
+            else:
+                item.status="Started"
+        return fired
@@ -1,6 +1,9 @@
 import platform
 import subprocess
 import os
+import re
+
+YOUTUBE_ID_PATTERN=re.compile(r"(?:youtube(?:-nocookie)?\.com/(?:watch\?(?:.*&)?v=|embed/|shorts/|live/|v/)|youtu\.be/)([0-9A-Za-z_-]{11})(?![0-9A-Za-z_-])")
 
 def format_time(milliseconds):
     seconds=milliseconds//1000
@@ -18,3 +21,18 @@ def open_download_path(folder):
         subprocess.run(["open",folder])
     else:
         subprocess.run(["xdg-open",folder])
+
+def extract_video_id(url):
+    match=YOUTUBE_ID_PATTERN.search(url or "")
+    return match.group(1) if match else None
+
+def parse_rate(rate):
+    if rate is None or rate=="":
+        return None
+    if isinstance(rate,(int,float)):
+        return int(rate)
+    text=str(rate).strip().upper()
+    multipliers={"K":1024,"M":1024**2,"G":1024**3}
+    if text[-1:] in multipliers:
+        return int(float(text[:-1])*multipliers[text[-1]])
+    return int(float(text))
@@ -4,12 +4,23 @@ import shutil
 import platform
 import subprocess
 import gettext
-from PyQt5.QtWidgets import QApplication
-from ui.main_window import MainWindow
-from core.profile import UserProfile
 
 def main():
-    app = QApplication(sys.argv)
+    profiler = None
+    if any(arg.startswith("--startup-profile") for arg in sys.argv) or os.environ.get("YOUTUBEGO_STARTUP_PROFILE"):
+        from core.startup import StartupProfiler
+        profiler = StartupProfiler()
+        profiler.install()
+    exit_after_paint = "--startup-profile-exit" in sys.argv
+    argv = [arg for arg in sys.argv if not arg.startswith("--startup-profile")]
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication(argv)
+    if profiler:
+        profiler.mark("qapplication")
+    from ui.main_window import MainWindow
+    from core.profile import UserProfile
+    if profiler:
+        profiler.mark("imports")
     user_profile = UserProfile()
     locale_path = os.path.join(os.getcwd(), "assets", "locales")
     language = user_profile.get_language()
@@ -21,6 +32,17 @@ def main():
         gettext.install("base")
         _ = gettext.gettext
     main_window = MainWindow()
+    if profiler:
+        profiler.mark("main_window")
+        from ui.widgets import FirstPaintWatcher
+        def report_first_paint():
+            profiler.mark("first_paint")
+            profiler.uninstall()
+            profiler.write_report("startup_profile.json", sys.stderr)
+            if exit_after_paint:
+                main_window.close()
+                app.quit()
+        main_window.first_paint_watcher = FirstPaintWatcher(main_window, report_first_paint)
     main_window.show()
     sys.exit(app.exec_())
 
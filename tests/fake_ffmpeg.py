@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+
+def main(args):
+    input_path, output_path = args[args.index("-i") + 1], args[-1]
+    duration = float(os.environ.get("FAKE_FFMPEG_DURATION", "10"))
+    steps = int(os.environ.get("FAKE_FFMPEG_STEPS", "5"))
+    delay = float(os.environ.get("FAKE_FFMPEG_DELAY", "0.05"))
+    sys.stderr.write("Input #0, mov,mp4, from '%s':\n  Duration: 00:00:%05.2f, start: 0.000000, bitrate: 1000 kb/s\n" % (input_path, duration))
+    sys.stderr.flush()
+    if "broken" in os.path.basename(input_path):
+        sys.stderr.write("%s: Invalid data found when processing input\n" % input_path)
+        return 1
+    if "-n" in args and os.path.exists(output_path):
+        sys.stderr.write("File '%s' already exists. Exiting.\n" % output_path)
+        return 1
+    with open(output_path, "wb") as output:
+        for step in range(1, steps + 1):
+            time.sleep(delay)
+            output.write(b"x" * 1024)
+            output.flush()
+            sys.stdout.write("out_time_us=%d\nspeed=1.0x\nprogress=%s\n" % (duration * step / steps * 1000000, "end" if step == steps else "continue"))
+            sys.stdout.flush()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
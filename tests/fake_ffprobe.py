@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+import json
+import sys
+
+def main(args):
+    try:
+        with open(args[-1]) as f:
+            probe = json.load(f)
+    except (OSError, ValueError):
+        sys.stderr.write("%s: Invalid data found when processing input\n" % args[-1])
+        return 1
+    sys.stdout.write(json.dumps(probe))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,33 @@
+from core.engine import EngineListener
+
+class RecordingListener(EngineListener):
+    def __init__(self):
+        self.statuses = []
+        self.logs = []
+    def on_status(self, task_id, status):
+        self.statuses.append((task_id, status))
+    def on_log(self, text):
+        self.logs.append(text)
+
+class LevelListener(RecordingListener):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+    def on_log_record(self, text, level):
+        self.records.append((level, text))
+
+class ValidationListener(LevelListener):
+    def __init__(self):
+        super().__init__()
+        self.infos = []
+    def on_info(self, task_id, title, channel):
+        self.infos.append((task_id, title, channel))
+
+class MetricsListener(EngineListener):
+    def __init__(self):
+        self.metrics = {}
+        self.statuses = {}
+    def on_status(self, task_id, status):
+        self.statuses[task_id] = status
+    def on_metrics(self, task_id, metrics):
+        self.metrics[task_id] = metrics
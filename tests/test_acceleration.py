@@ -0,0 +1,41 @@
+import time
+from core.acceleration import AccelerationSettings, ThroughputMeter
+from core.engine import DownloadEngine, DownloadTask
+from benchmarks.media_server import MediaServer
+from tests.helpers import MetricsListener
+
+def test_options_map_to_yt_dlp_params():
+    settings = AccelerationSettings(4, "10M", "no-such-downloader")
+    logs = []
+    options = settings.to_options(logs.append)
+    assert options == {"concurrent_fragment_downloads": 4, "http_chunk_size": 10 * 1024 ** 2}
+    assert logs == ["no-such-downloader not found, using the built-in downloader"]
+    assert AccelerationSettings.from_dict(settings.to_dict()).to_dict() == settings.to_dict()
+
+def test_meter_sums_files():
+    meter = ThroughputMeter()
+    meter.update("video", 100, 1.0)
+    meter.update("video", 300, 2.0)
+    meter.update("audio", 100, 3.0)
+    assert meter.downloaded == 400
+    assert meter.rate == 200
+
+def download_seconds(tmp_path, url, fragments):
+    listener = MetricsListener()
+    engine = DownloadEngine(1, listener, acceleration=AccelerationSettings(fragments))
+    task = DownloadTask(url, "720p", str(tmp_path / str(fragments)))
+    engine.submit(task)
+    started = time.monotonic()
+    assert engine.wait(30)
+    assert listener.statuses[task.task_id] == "Download Completed"
+    assert listener.metrics[task.task_id]["bytes"] == 8 * 64 * 1024
+    return time.monotonic() - started
+
+def test_concurrent_fragments_beat_per_connection_limit(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with MediaServer(rate=256 * 1024) as server:
+        url = server.add_hls(segments=8, segment_size=64 * 1024)
+        sequential = download_seconds(tmp_path, url, 1)
+        parallel = download_seconds(tmp_path, url, 4)
+    assert sequential > 1.8
+    assert sequential / parallel > 1.8
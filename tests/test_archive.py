@@ -0,0 +1,98 @@
+from yt_dlp import YoutubeDL
+from core.archive import ANY_PROFILE, DownloadArchive, archive_key, archive_profile, archive_wildcard
+from core.engine import DownloadEngine, DownloadTask
+from core.history import HistoryStore
+from tests.helpers import RecordingListener
+
+def test_url_variants_share_one_archive_key():
+    keys = {archive_key(url) for url in ["https://youtu.be/dQw4w9WgXcQ", "https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=10", "https://www.youtube.com/watch?list=PL1&v=dQw4w9WgXcQ&index=3", "https://www.youtube.com/shorts/dQw4w9WgXcQ"]}
+    assert keys == {("youtube", "dQw4w9WgXcQ")}
+    assert archive_key("https://example.com/video.mp4") is None
+
+def test_archive_is_keyed_by_profile_and_persists(tmp_path):
+    path = str(tmp_path / "archive.db")
+    archive = DownloadArchive(path)
+    audio = DownloadTask("https://youtu.be/dQw4w9WgXcQ", "720p", str(tmp_path), audio_only=True)
+    assert archive_profile(audio) == "audio-mp3"
+    archive.add_info({"extractor_key": "Youtube", "id": "dQw4w9WgXcQ", "title": "Song"}, archive_profile(audio))
+    archive.close()
+    reopened = DownloadArchive(path)
+    assert reopened.contains_url("https://youtu.be/dQw4w9WgXcQ", "audio-mp3")
+    assert not reopened.contains_url("https://youtu.be/dQw4w9WgXcQ", "video-mp4")
+    assert reopened.contains_info({"ie_key": "Youtube", "id": "dQw4w9WgXcQ"}, "audio-mp3")
+
+def test_imported_history_matches_any_profile_for_playlist_entries_only(tmp_path):
+    history = HistoryStore(str(tmp_path / "history.db"))
+    history.add("A", "C", "https://www.youtube.com/watch?v=aaaaaaaaaaa&t=5", "Download Completed")
+    history.add("B", "C", "https://youtu.be/bbbbbbbbbbb", "Download Error")
+    history.add("C", "C", "https://example.com/c.mp4", "Download Completed")
+    archive = DownloadArchive(str(tmp_path / "archive.db"))
+    assert archive.import_history(history) == 1
+    assert archive.import_history(history) == 0
+    assert archive.contains_url("https://youtu.be/aaaaaaaaaaa", "video-mkv")
+    assert ("youtube", "aaaaaaaaaaa", ANY_PROFILE) in archive.keys
+    assert not archive.contains_url("https://youtu.be/bbbbbbbbbbb", "video-mp4")
+    single = DownloadTask("https://youtu.be/aaaaaaaaaaa", "720p", str(tmp_path), audio_only=True)
+    playlist = DownloadTask("https://www.youtube.com/playlist?list=PL1", "720p", str(tmp_path), audio_only=True, playlist=True)
+    playlist.task_id = 1
+    entry = playlist.child(single.url)
+    assert not archive.contains_url(single.url, archive_profile(single), archive_wildcard(single))
+    assert archive.contains_url(entry.url, archive_profile(entry), archive_wildcard(entry))
+
+def test_explicit_download_ignores_imported_history(tmp_path, monkeypatch):
+    extracted = []
+    def fake_extract_info(self, url, download=True, **kwargs):
+        extracted.append(url)
+        return {"id": url[-11:], "title": "Title", "uploader": "Channel", "extractor_key": "Youtube"}
+    monkeypatch.setattr(YoutubeDL, "extract_info", fake_extract_info)
+    monkeypatch.setattr(YoutubeDL, "process_ie_result", lambda self, info, download=True, extra_info=None: info)
+    monkeypatch.chdir(tmp_path)
+    archive = DownloadArchive(str(tmp_path / "archive.db"))
+    archive.add(("youtube", "aaaaaaaaaaa"), ANY_PROFILE)
+    listener = RecordingListener()
+    engine = DownloadEngine(1, listener, archive=archive)
+    engine.submit(DownloadTask("https://youtu.be/aaaaaaaaaaa", "720p", str(tmp_path), audio_only=True))
+    assert engine.wait(10)
+    assert [status for task_id, status in listener.statuses if status in ("Download Completed", "Already Downloaded")] == ["Download Completed"]
+    assert extracted == ["https://youtu.be/aaaaaaaaaaa"]
+    assert archive.contains_url("https://youtu.be/aaaaaaaaaaa", "audio-mp3", False)
+
+def test_engine_skips_archived_videos_before_extraction(tmp_path, monkeypatch):
+    extracted = []
+    def fake_extract_info(self, url, download=True, **kwargs):
+        extracted.append(url)
+        return {"id": url[-11:], "title": "Title", "uploader": "Channel", "extractor_key": "Youtube"}
+    monkeypatch.setattr(YoutubeDL, "extract_info", fake_extract_info)
+    monkeypatch.setattr(YoutubeDL, "process_ie_result", lambda self, info, download=True, extra_info=None: info)
+    monkeypatch.chdir(tmp_path)
+    archive = DownloadArchive(str(tmp_path / "archive.db"))
+    listener = RecordingListener()
+    engine = DownloadEngine(1, listener, archive=archive)
+    engine.submit(DownloadTask("https://www.youtube.com/watch?v=aaaaaaaaaaa", "720p", str(tmp_path)))
+    assert engine.wait(10)
+    for url in ["https://youtu.be/aaaaaaaaaaa", "https://www.youtube.com/watch?v=aaaaaaaaaaa&t=42"]:
+        engine.submit(DownloadTask(url, "720p", str(tmp_path)))
+    engine.submit(DownloadTask("https://youtu.be/aaaaaaaaaaa", "720p", str(tmp_path), audio_only=True))
+    assert engine.wait(10)
+    assert [status for task_id, status in listener.statuses if status in ("Download Completed", "Already Downloaded")] == ["Download Completed", "Already Downloaded", "Already Downloaded", "Download Completed"]
+    assert extracted == ["https://www.youtube.com/watch?v=aaaaaaaaaaa", "https://youtu.be/aaaaaaaaaaa"]
+
+def test_playlist_enumeration_skips_archived_entries(tmp_path, monkeypatch):
+    def fake_extract_info(self, url, download=True, process=True, **kwargs):
+        if "list=" in url:
+            return {"_type": "playlist", "id": "PL1", "title": "Playlist", "entries": [{"_type": "url", "ie_key": "Youtube", "id": "video%06d" % index, "url": "https://www.youtube.com/watch?v=video%06d" % index} for index in range(4)]}
+        return {"id": url[-11:], "title": "Title", "uploader": "Channel", "extractor_key": "Youtube"}
+    monkeypatch.setattr(YoutubeDL, "extract_info", fake_extract_info)
+    monkeypatch.setattr(YoutubeDL, "process_ie_result", lambda self, info, download=True, extra_info=None: info)
+    monkeypatch.chdir(tmp_path)
+    archive = DownloadArchive(str(tmp_path / "archive.db"))
+    archive.add(("youtube", "video000001"), "video-mp4")
+    archive.add(("youtube", "video000002"), ANY_PROFILE)
+    listener = RecordingListener()
+    engine = DownloadEngine(2, listener, archive=archive)
+    parent_id = engine.submit(DownloadTask("https://www.youtube.com/playlist?list=PL1", "720p", str(tmp_path), playlist=True))
+    assert engine.wait(10)
+    assert (parent_id, "Playlist Completed") in listener.statuses
+    assert len([status for task_id, status in listener.statuses if status == "Download Completed"]) == 2
+    assert any("Skipped 2 entries" in line for line in listener.logs)
+    assert len(archive) == 4
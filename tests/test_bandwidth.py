@@ -0,0 +1,45 @@
+import threading
+import time
+from core.bandwidth import BandwidthManager
+
+def test_budget_is_split_by_priority_and_caps():
+    manager = BandwidthManager(900)
+    manager.register("high", priority=1)
+    manager.register("low", priority=2)
+    assert manager.rates() == {"high": 600, "low": 300}
+    manager.register("capped", priority=1, cap=100)
+    rates = manager.rates()
+    assert rates["capped"] == 100
+    assert rates["high"] == 533 and rates["low"] == 266
+    manager.unregister("capped")
+    manager.set_total_rate(None)
+    assert manager.rates() == {"high": None, "low": None}
+
+def test_consume_enforces_shared_budget():
+    manager = BandwidthManager(400 * 1024, burst_seconds=0.1)
+    downloaded = {"a": 0, "b": 0}
+    def worker(key):
+        manager.register(key)
+        started = time.monotonic()
+        while time.monotonic() - started < 1:
+            downloaded[key] += 16 * 1024
+            manager.consume(key, downloaded[key])
+    threads = [threading.Thread(target=worker, args=(key,)) for key in downloaded]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    total = sum(downloaded.values())
+    assert 300 * 1024 < total < 550 * 1024
+
+def test_raising_the_limit_wakes_throttled_download():
+    manager = BandwidthManager(1024)
+    manager.register("a")
+    waited = []
+    thread = threading.Thread(target=lambda: waited.append(manager.consume("a", 100 * 1024)))
+    thread.start()
+    time.sleep(0.2)
+    manager.set_total_rate(None)
+    thread.join(2)
+    assert not thread.is_alive()
+    assert waited[0] < 1
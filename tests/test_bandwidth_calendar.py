@@ -0,0 +1,52 @@
+import datetime
+from core.bandwidth import BandwidthManager
+from core.bandwidth_calendar import BandwidthCalendar, CalendarController, TimeWindow
+from core.downloader import DownloadTask
+from core.scheduler import DownloadScheduler
+
+MONDAY = datetime.datetime(2026, 10, 12)
+
+class FakeWorker:
+    def __init__(self):
+        self.paused = False
+    def pause_download(self):
+        self.paused = True
+    def resume_download(self):
+        self.paused = False
+
+def at(day, hour, minute=0):
+    return MONDAY + datetime.timedelta(days=day, hours=hour, minutes=minute)
+
+def test_windows_match_days_and_wrap_midnight():
+    business = TimeWindow("09:00", "18:00", [0, 1, 2, 3, 4], "1M", 2)
+    night = TimeWindow("22:00", "06:00", [4])
+    assert business.contains(at(0, 9)) and not business.contains(at(0, 18))
+    assert not business.contains(at(5, 12))
+    assert night.contains(at(4, 23)) and night.contains(at(5, 5, 59))
+    assert not night.contains(at(5, 23))
+    calendar = BandwidthCalendar([business, night])
+    assert calendar.next_change(at(0, 8)) == at(0, 9)
+    assert calendar.next_change(at(4, 18, 30)) == at(4, 22)
+    assert BandwidthCalendar.from_list(calendar.to_list()).windows[1].to_dict() == night.to_dict()
+
+def test_controller_throttles_pauses_and_resumes():
+    workers = {}
+    scheduler = DownloadScheduler(3, lambda task: workers.setdefault(task.task_id, FakeWorker()))
+    bandwidth = BandwidthManager()
+    calendar = BandwidthCalendar([TimeWindow("09:00", "18:00", [0, 1, 2, 3, 4], "1M", 1), TimeWindow("18:00", "20:00", None, None, 0)])
+    controller = CalendarController(calendar, bandwidth, scheduler, workers, "4M", 3)
+    tasks = [DownloadTask("https://youtu.be/video%06d" % index, "720p", "/tmp", priority=2 - (index == 2)) for index in range(3)]
+    for task in tasks:
+        scheduler.submit(task)
+    controller.apply(at(0, 8))
+    assert bandwidth.total_rate == 4 * 1024 ** 2 and not any(worker.paused for worker in workers.values())
+    controller.apply(at(0, 10))
+    assert bandwidth.total_rate == 1024 ** 2
+    assert [task.task_id for task in tasks if workers[task.task_id].paused] == [1, 2]
+    controller.apply(at(0, 19))
+    assert all(worker.paused for worker in workers.values())
+    scheduler.submit(DownloadTask("https://youtu.be/video000009", "720p", "/tmp"))
+    assert len(scheduler.running) == 3
+    controller.apply(at(0, 21))
+    assert not any(worker.paused for worker in workers.values())
+    assert scheduler.max_concurrent == 3
@@ -0,0 +1,49 @@
+import json
+import time
+import urllib.request
+from benchmarks import downloads, signals, suite
+from benchmarks.media_server import MediaServer
+
+def test_compare_flags_regressions_by_metric_direction():
+    baseline = {"single": {"1024_kb": {"seconds": 1.0, "throughput_kb_s": 1000}}, "search_ms": {"rick": 10.0}, "rows": 100, "dispatch_us_per_task": 0.5}
+    current = {"single": {"1024_kb": {"seconds": 2.0, "throughput_kb_s": 1500}}, "search_ms": {"rick": 11.0}, "rows": 900, "dispatch_us_per_task": 0.9, "new_ms": 4.0}
+    rows = {row["metric"]: row["verdict"] for row in suite.compare(baseline, current)}
+    assert rows == {"single.1024_kb.seconds": "regression", "single.1024_kb.throughput_kb_s": "improvement", "search_ms.rick": "ok", "dispatch_us_per_task": "ok"}
+    assert suite.direction("scaling.4.gain") == 1
+    assert suite.direction("before.profile_writes") == -1
+    assert suite.direction("queued") == 0
+
+def test_media_server_latency_and_watch_pages():
+    with MediaServer(latency=0.1) as server:
+        url = server.add_video("clip", 1024, title="Clip", channel="Bench")
+        started = time.monotonic()
+        page = urllib.request.urlopen(url).read().decode()
+        assert time.monotonic() - started >= 0.1
+    video = json.loads(page.split('application/ld+json">', 1)[1].split("</script>", 1)[0])
+    assert video["name"] == "Clip"
+    assert video["author"]["name"] == "Bench"
+    assert video["contentUrl"].endswith("/media/clip.mp4")
+
+def test_download_benchmark_extracts_through_watch_pages():
+    results = downloads.run(sizes=(64 * 1024,), rates=(256 * 1024,), latency=0, files=2, scale_size=64 * 1024, scale_rate=None, workers=(1, 2))
+    single = results["single"]["64_kb_256_kb_s"]
+    assert single["throughput_kb_s"] > 0 and single["extract_seconds"] > 0
+    assert results["scaling"][1]["gain"] == 1.0
+
+def test_suite_saves_and_compares_baselines(tmp_path, capsys):
+    assert suite.main(["dispatch", "--quick", "--save", "--baselines", str(tmp_path)]) == 0
+    with open(tmp_path / "dispatch-quick.json") as f:
+        saved = json.load(f)
+    assert saved["results"]["queued"] == 2000
+    assert "no baseline" in capsys.readouterr().out
+    report = tmp_path / "report.json"
+    assert suite.main(["dispatch", "--quick", "--baselines", str(tmp_path), "--tolerance", "100", "--output", str(report)]) == 0
+    with open(report) as f:
+        comparison = json.load(f)["dispatch"]["comparison"]
+    assert {row["metric"] for row in comparison} >= {"submit_us_per_task", "dispatch_us_per_task"}
+
+def test_signals_benchmark_delivers_every_event():
+    results = signals.run(count=200)
+    assert results["events"] == 200
+    for name in ("progress_signal", "log_signal"):
+        assert results[name]["delivered_us_per_event"] > 0
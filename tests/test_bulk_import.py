@@ -0,0 +1,84 @@
+import logging
+import time
+from core.bulk_import import MetadataValidator, normalize_url, scan_import_file, url_key
+from core.history import HistoryStore
+from core.journal import QueueJournal
+from core.metadata_cache import MetadataCache
+from benchmarks.media_server import MediaServer
+from tests.helpers import ValidationListener
+
+def test_normalize_url_canonicalizes_youtube_links():
+    canonical = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    for text in ["https://youtu.be/dQw4w9WgXcQ?t=10", "www.youtube.com/watch?v=dQw4w9WgXcQ&list=PL1", " <https://m.youtube.com/shorts/dQw4w9WgXcQ> "]:
+        assert normalize_url(text) == canonical
+    assert normalize_url("HTTPS://Example.com/a/b#frag") == "https://example.com/a/b"
+    assert normalize_url("example.com:8080/v") == "https://example.com:8080/v"
+    for text in ["", "not a url", "ftp://example.com/file", "http://", "http://example.com:99999/"]:
+        assert normalize_url(text) is None
+    assert url_key("https://example.com/v/") == url_key("https://example.com/v")
+
+def test_scan_dedupes_against_file_queue_and_history(tmp_path):
+    history = HistoryStore(str(tmp_path / "history.db"))
+    history.add("Old", "Channel", "https://youtu.be/aaaaaaaaaaa", "Download Completed")
+    history.add("Failed", "Channel", "https://example.com/failed", "Download Error: 404")
+    path = tmp_path / "urls.txt"
+    path.write_text("\n".join([
+        "# exported list",
+        "https://www.youtube.com/watch?v=aaaaaaaaaaa",
+        "https://youtu.be/bbbbbbbbbbb",
+        "",
+        "https://www.youtube.com/watch?v=bbbbbbbbbbb&t=3",
+        "https://youtu.be/ccccccccccc",
+        "https://example.com/failed",
+        "just some words",
+    ]))
+    result = scan_import_file(str(path), history, {url_key("https://youtu.be/ccccccccccc")}, batch_size=2)
+    assert result.accepted == ["https://www.youtube.com/watch?v=bbbbbbbbbbb", "https://example.com/failed"]
+    assert result.duplicates == {"history": 1, "file": 1, "queue": 1}
+    assert result.invalid == [(8, "just some words")]
+    assert result.rows == 6
+    history.close()
+
+def test_scan_reads_csv_with_header(tmp_path):
+    path = tmp_path / "urls.csv"
+    path.write_text("title,url\nFirst,https://youtu.be/aaaaaaaaaaa\nSecond,example.com/video\nBroken,nothing here\n", encoding="utf-8-sig")
+    result = scan_import_file(str(path))
+    assert result.accepted == ["https://www.youtube.com/watch?v=aaaaaaaaaaa", "https://example.com/video"]
+    assert result.invalid == [(4, "Broken")]
+    assert scan_import_file(str(tmp_path / "missing.txt")).error
+
+def test_journal_adds_a_batch_with_one_write(tmp_path, monkeypatch):
+    path = str(tmp_path / "journal.jsonl")
+    journal = QueueJournal(path)
+    syncs = []
+    monkeypatch.setattr("core.journal.os.fsync", syncs.append)
+    keys = journal.add_many([{"url": "https://youtu.be/%011d" % index} for index in range(100)], "queue", "held")
+    assert len(syncs) == 1
+    assert keys == list(range(keys[0], keys[0] + 100))
+    journal.close()
+    replayed = QueueJournal(path)
+    assert [entry["state"] for key, entry in replayed.pending()] == ["held"] * 100
+
+def test_validator_reports_metadata_and_invalid_urls(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = MetadataCache(str(tmp_path / "cache.db"))
+    listener = ValidationListener()
+    validator = MetadataValidator(listener, cache, max_workers=2)
+    with MediaServer() as server:
+        watch_url = server.add_video("clip", 4096, title="Clip", channel="Uploader")
+        validator.submit_many([(1, watch_url), (2, server.url("/watch/missing"))])
+        deadline = time.time() + 20
+        while validator.active_count() and time.time() < deadline:
+            time.sleep(0.05)
+        assert validator.active_count() == 0
+        assert sorted(listener.statuses) == [(1, "Validated"), (2, "Invalid URL")]
+        assert listener.infos == [(1, "Clip", "Uploader")]
+        assert any(level == logging.WARNING and "missing" in text for level, text in listener.records)
+        assert cache.get(watch_url, need_formats=True)["title"] == "Clip"
+        requests = len(server.requests)
+        validator.submit(3, watch_url)
+        while validator.active_count():
+            time.sleep(0.05)
+        assert len(server.requests) == requests
+    validator.shutdown()
+    cache.close()
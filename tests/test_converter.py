@@ -0,0 +1,122 @@
+import json
+import os
+import shutil
+import subprocess
+import time
+import pytest
+from core.converter import BatchConverter, collect_inputs, ffprobe_path_for, output_path_for, parse_duration, stream_copy_plan
+from tests.helpers import RecordingListener
+
+FAKE_FFMPEG = os.path.join(os.path.dirname(__file__), "fake_ffmpeg.py")
+
+class ProgressListener(RecordingListener):
+    def __init__(self):
+        super().__init__()
+        self.progress = []
+    def on_progress(self, task_id, percent, speed, eta):
+        self.progress.append((task_id, percent, speed, eta))
+
+def make_inputs(folder, names):
+    os.makedirs(folder, exist_ok=True)
+    for name in names:
+        with open(os.path.join(folder, name), "wb") as f:
+            f.write(b"input")
+
+def test_collect_inputs_walks_folders_and_dedupes(tmp_path):
+    make_inputs(tmp_path / "media", ["b.mkv", "a.mp4", "notes.txt"])
+    make_inputs(tmp_path / "media" / "sub", ["c.webm"])
+    files = collect_inputs([str(tmp_path / "media"), str(tmp_path / "media" / "a.mp4"), str(tmp_path / "missing.mp4")])
+    assert [os.path.relpath(path, tmp_path) for path in files] == [os.path.join("media", "a.mp4"), os.path.join("media", "b.mkv"), os.path.join("media", "sub", "c.webm")]
+    assert parse_duration("  Duration: 01:02:03.50, start: 0.000000") == 3723.5
+    assert parse_duration("Duration: N/A") is None
+
+def test_output_path_never_overwrites(tmp_path):
+    make_inputs(tmp_path, ["clip.mp4", "clip.mp3"])
+    assert output_path_for(str(tmp_path / "clip.mp4"), "mkv") == str(tmp_path / "clip.mkv")
+    assert output_path_for(str(tmp_path / "clip.mp4"), "mp4") == str(tmp_path / "clip (1).mp4")
+    assert output_path_for(str(tmp_path / "clip.mp4"), "mp3") == str(tmp_path / "clip (1).mp3")
+    assert output_path_for(str(tmp_path / "clip.mp4"), "mkv", reserved={str(tmp_path / "clip.mkv")}) == str(tmp_path / "clip (1).mkv")
+
+def test_batch_runs_in_parallel_with_progress(tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_FFMPEG_DELAY", "0.1")
+    make_inputs(tmp_path, ["one.mp4", "two.mp4", "three.mp4", "four.mp4", "broken.mp4"])
+    listener = ProgressListener()
+    converter = BatchConverter(listener, max_workers=5, ffmpeg_path=FAKE_FFMPEG)
+    started = time.monotonic()
+    jobs = converter.submit_many([str(tmp_path)], "mkv")
+    assert converter.wait(10)
+    assert time.monotonic() - started < 2
+    statuses = {job.input_path: job.status for job in jobs}
+    assert statuses.pop(str(tmp_path / "broken.mp4")) == "Conversion Error"
+    assert set(statuses.values()) == {"Conversion Completed"}
+    assert not os.path.exists(tmp_path / "broken.mkv")
+    assert all(os.path.getsize(job.output_path) == 5 * 1024 for job in jobs if job.status == "Conversion Completed")
+    one = next(job for job in jobs if job.input_path.endswith("one.mp4"))
+    first = [entry for entry in listener.progress if entry[0] == one.job_id]
+    assert [round(entry[1]) for entry in first] == [20, 40, 60, 80, 100, 100]
+    assert first[0][3] > first[-2][3] >= 0
+    assert any("Invalid data found" in line for line in listener.logs)
+    converter.shutdown()
+
+def test_cancel_stops_running_and_pending_jobs(tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_FFMPEG_DELAY", "1")
+    make_inputs(tmp_path, ["one.mp4", "two.mp4", "three.mp4"])
+    listener = ProgressListener()
+    converter = BatchConverter(listener, max_workers=1, ffmpeg_path=FAKE_FFMPEG)
+    jobs = converter.submit_many([str(tmp_path)], "mkv")
+    deadline = time.monotonic() + 5
+    while jobs[0].process is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    started = time.monotonic()
+    assert converter.cancel_all() == 3
+    assert converter.wait(5)
+    assert time.monotonic() - started < 2
+    assert [job.status for job in jobs] == ["Conversion Cancelled"] * 3
+    assert not any(os.path.exists(job.output_path) for job in jobs)
+    assert converter.active_count() == 0
+    converter.shutdown()
+
+def probe_json(*streams, duration="12.5"):
+    return json.dumps({"format": {"duration": duration}, "streams": [{"codec_type": kind, "codec_name": codec, "disposition": {"attached_pic": 0}} for kind, codec in streams]})
+
+def test_stream_copy_plan_per_container():
+    assert ffprobe_path_for(FAKE_FFMPEG).endswith("fake_ffprobe.py")
+    assert ffprobe_path_for("/usr/bin/ffmpeg.exe") == "/usr/bin/ffprobe.exe"
+    assert stream_copy_plan([("video", "h264"), ("audio", "aac")], "mkv") == ("copy", ["-c:v", "copy", "-c:a", "copy"])
+    assert stream_copy_plan([("video", "vp9"), ("audio", "opus"), ("subtitle", "webvtt")], "mkv") == ("copy", ["-c:v", "copy", "-c:a", "copy", "-c:s", "copy"])
+    assert stream_copy_plan([("video", "h264"), ("audio", "pcm_s16le")], "mp4") == ("partial copy", ["-c:v", "copy"])
+    assert stream_copy_plan([("video", "vp8"), ("audio", "vorbis")], "mp4") == ("transcode", [])
+    assert stream_copy_plan([("video", "h264"), ("audio", "aac")], "mp3") == ("transcode", ["-vn", "-sn"])
+    assert stream_copy_plan([("audio", "mp3")], "mp3") == ("copy", ["-vn", "-c:a", "copy", "-sn"])
+
+def test_jobs_log_copy_or_transcode_path_and_time(tmp_path):
+    with open(tmp_path / "h264.mp4", "w") as f:
+        f.write(probe_json(("video", "h264"), ("audio", "aac")))
+    with open(tmp_path / "vp8.webm", "w") as f:
+        f.write(probe_json(("video", "vp8"), ("audio", "vorbis")))
+    make_inputs(tmp_path, ["unreadable.mov"])
+    listener = ProgressListener()
+    converter = BatchConverter(listener, max_workers=3, ffmpeg_path=FAKE_FFMPEG)
+    jobs = {os.path.basename(job.input_path): job for job in converter.submit_many([str(tmp_path)], "mp4")}
+    assert converter.wait(10)
+    assert [(name, job.plan, job.status) for name, job in sorted(jobs.items())] == [("h264.mp4", "copy", "Conversion Completed"), ("unreadable.mov", "transcode", "Conversion Completed"), ("vp8.webm", "transcode", "Conversion Completed")]
+    assert jobs["h264.mp4"].command()[6:10] == ["-c:v", "copy", "-c:a", "copy"]
+    assert jobs["h264.mp4"].duration == 12.5
+    assert any(line.startswith("Converted " + jobs["h264.mp4"].input_path) and " by copy in " in line for line in listener.logs)
+    assert any(" by transcode in " in line for line in listener.logs)
+    assert any(line.startswith("Could not probe") for line in listener.logs)
+    converter.shutdown()
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_real_ffmpeg_reports_progress(tmp_path):
+    source = str(tmp_path / "tone.wav")
+    subprocess.run(["ffmpeg", "-hide_banner", "-loglevel", "error", "-f", "lavfi", "-i", "sine=frequency=440:duration=20", source], check=True)
+    listener = ProgressListener()
+    converter = BatchConverter(listener, max_workers=2)
+    job = converter.submit(source, "mp3")
+    assert converter.wait(60)
+    assert job.status == "Conversion Completed"
+    assert job.duration == pytest.approx(20, abs=0.1)
+    assert listener.progress[-1][1] == 100.0
+    assert os.path.getsize(job.output_path) > 0
+    converter.shutdown()
@@ -18,3 +18,24 @@ def test_download_task_attributes():
     assert task.url.startswith("https://")
     assert task.audio_only is True
     assert task.output_format == "mp3"
+
+def test_worker_extracts_once(tmp_path, monkeypatch):
+    from yt_dlp import YoutubeDL
+    from core.downloader import DownloadWorker, WorkerSignals
+    processed = []
+    def fake_extract_info(self, url, download=True, **kwargs):
+        return {"id": "dQw4w9WgXcQ", "title": "Title", "uploader": "Channel"}
+    def fake_process_ie_result(self, info, download=True, extra_info=None):
+        processed.append((info["id"], download))
+        return info
+    monkeypatch.setattr(YoutubeDL, "extract_info", fake_extract_info)
+    monkeypatch.setattr(YoutubeDL, "process_ie_result", fake_process_ie_result)
+    monkeypatch.chdir(tmp_path)
+    task = DownloadTask("https://www.youtube.com/watch?v=dQw4w9WgXcQ", "720p", str(tmp_path))
+    signals = WorkerSignals()
+    statuses = []
+    signals.status.connect(lambda row, status: statuses.append(status))
+    DownloadWorker(task, 0, signals).run()
+    assert processed == [("dQw4w9WgXcQ", True)]
+    assert task.extractor_calls == 1
+    assert statuses[-1] == "Download Completed"
@@ -0,0 +1,129 @@
+import subprocess
+import sys
+import threading
+import time
+from yt_dlp import YoutubeDL
+from yt_dlp.utils import DownloadError
+from core.archive import archive_profile
+from core.engine import DownloadEngine, DownloadJob, DownloadTask, audio_extraction_plan, load_yt_dlp, process_registry
+from tests.helpers import RecordingListener
+
+def make_task(tmp_path):
+    return DownloadTask("https://www.youtube.com/watch?v=dQw4w9WgXcQ", "720p", str(tmp_path))
+
+def fake_youtube_dl(monkeypatch, delay=0):
+    def fake_extract_info(self, url, download=True, **kwargs):
+        return {"id": url[-11:], "title": "Title", "uploader": "Channel"}
+    def fake_process_ie_result(self, info, download=True, extra_info=None):
+        time.sleep(delay)
+        return info
+    monkeypatch.setattr(YoutubeDL, "extract_info", fake_extract_info)
+    monkeypatch.setattr(YoutubeDL, "process_ie_result", fake_process_ie_result)
+
+def test_cancel_wakes_paused_job(tmp_path):
+    listener = RecordingListener()
+    job = DownloadJob(make_task(tmp_path), 7, listener)
+    job.pause_download()
+    errors = []
+    def hook():
+        try:
+            job.progress_hook({"status": "downloading"})
+        except DownloadError as e:
+            errors.append(e)
+    thread = threading.Thread(target=hook)
+    thread.start()
+    thread.join(0.1)
+    assert thread.is_alive()
+    job.cancel_download()
+    thread.join(1)
+    assert not thread.is_alive()
+    assert errors
+    assert any(line.startswith("Cancelled after") for line in listener.logs)
+
+def test_cancel_kills_tracked_ffmpeg_process(tmp_path):
+    job = DownloadJob(make_task(tmp_path), 7)
+    tracked_popen = load_yt_dlp().TrackedPopen
+    results = []
+    def postprocess():
+        job.thread_ident = threading.get_ident()
+        results.append(tracked_popen.run([sys.executable, "-c", "import time; time.sleep(30)"]))
+    thread = threading.Thread(target=postprocess)
+    started = time.monotonic()
+    thread.start()
+    while not process_registry.thread_processes(thread.ident):
+        time.sleep(0.01)
+    job.cancel_download()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert results[0][2] != 0
+    assert time.monotonic() - started < 5
+
+def test_engine_runs_tasks_under_concurrency_limit(tmp_path, monkeypatch):
+    fake_youtube_dl(monkeypatch, delay=0.05)
+    monkeypatch.chdir(tmp_path)
+    listener = RecordingListener()
+    engine = DownloadEngine(2, listener)
+    for index in range(6):
+        engine.submit(DownloadTask("https://youtu.be/video%06d" % index, "720p", str(tmp_path)))
+        assert len(engine.scheduler.running) <= 2
+    assert engine.wait(10)
+    completed = [task_id for task_id, status in listener.statuses if status == "Download Completed"]
+    assert sorted(completed) == [1, 2, 3, 4, 5, 6]
+
+def test_engine_import_does_not_load_qt():
+    code = "import sys, core.engine, core.cli; sys.exit(any(name.startswith('PyQt5') for name in sys.modules))"
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+def test_engine_import_defers_yt_dlp():
+    code = "import sys, core.engine; sys.exit('yt_dlp' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+class PlaylistListener(RecordingListener):
+    def __init__(self):
+        super().__init__()
+        self.entries = []
+    def on_entry(self, parent_id, task_id, url, title):
+        self.entries.append((parent_id, task_id, url))
+
+def test_playlist_entries_stream_into_scheduler(tmp_path, monkeypatch):
+    events = []
+    def entries():
+        for index in range(5):
+            events.append(("yield", index))
+            yield {"_type": "url", "url": "https://www.youtube.com/watch?v=video%06d" % index, "title": "Entry %d" % index}
+            time.sleep(0.05)
+    def fake_extract_info(self, url, download=True, process=True, **kwargs):
+        if "list=" in url:
+            assert not process and self.params["extract_flat"] == "in_playlist"
+            return {"_type": "playlist", "id": "PL1", "title": "Playlist", "entries": entries()}
+        return {"id": url[-11:], "title": "Title", "uploader": "Channel"}
+    def fake_process_ie_result(self, info, download=True, extra_info=None):
+        events.append(("download", info["id"]))
+        time.sleep(0.02)
+        return info
+    monkeypatch.setattr(YoutubeDL, "extract_info", fake_extract_info)
+    monkeypatch.setattr(YoutubeDL, "process_ie_result", fake_process_ie_result)
+    monkeypatch.chdir(tmp_path)
+    listener = PlaylistListener()
+    engine = DownloadEngine(2, listener)
+    parent_id = engine.submit(DownloadTask("https://www.youtube.com/playlist?list=PL1", "720p", str(tmp_path), playlist=True))
+    assert engine.wait(10)
+    assert [parent for parent, task_id, url in listener.entries] == [parent_id] * 5
+    assert events.index(("download", "video000000")) < events.index(("yield", 4))
+    assert (parent_id, "Playlist Completed") in listener.statuses
+    completed = [task_id for task_id, status in listener.statuses if status == "Download Completed"]
+    assert sorted(completed) == sorted(task_id for parent, task_id, url in listener.entries)
+
+def test_audio_format_prefers_stream_copy_and_logs_the_path(tmp_path):
+    assert [audio_extraction_plan(acodec, fmt) for acodec, fmt in [("mp4a.40.2", "m4a"), ("opus", "opus"), ("opus", "mp3"), ("opus", "best"), (None, "m4a")]] == ["copy", "copy", "transcode", "copy", "transcode"]
+    task = DownloadTask.from_dict(DownloadTask("https://youtu.be/dQw4w9WgXcQ", "720p", str(tmp_path), audio_only=True, audio_format="m4a").to_dict())
+    assert task.audio_format == "m4a"
+    assert archive_profile(task) == "audio-m4a"
+    listener = RecordingListener()
+    job = DownloadJob(task, 3, listener)
+    options = job.build_options()
+    assert options["format"].startswith("bestaudio[acodec^=mp4a]")
+    assert options["postprocessors"][0]["preferredcodec"] == "m4a"
+    job.postprocessor_hook({"status": "started", "postprocessor": "ExtractAudio", "info_dict": {}})
+    job.postprocessor_hook({"status": "finished", "postprocessor": "ExtractAudio", "info_dict": {"acodec": "mp4a.40.2", "filepath": "song.m4a"}})
+    assert listener.logs[-1].startswith("ExtractAudio (copy) finished in ") and listener.logs[-1].endswith(" s: song.m4a")
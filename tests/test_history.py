@@ -0,0 +1,55 @@
+import json
+import time
+from core.history import HistoryStore
+from core.profile import UserProfile
+
+def test_add_update_remove(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"))
+    store.add("Fetching...", "Fetching...", "https://youtu.be/dQw4w9WgXcQ", "Queued")
+    store.add("Other", "Channel", "https://example.com/a", "Download Error")
+    store.update("https://youtu.be/dQw4w9WgXcQ", "Title", "Channel", "Download Completed")
+    assert store.find_by_video_id("dQw4w9WgXcQ")[0]["status"] == "Download Completed"
+    assert len(store.entries_with_status("Download Error")) == 1
+    store.remove(["https://example.com/a"])
+    assert store.count() == 1
+
+def test_indexes_are_used(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"))
+    for column in ("url", "video_id", "status"):
+        plan = store.query("EXPLAIN QUERY PLAN SELECT * FROM history WHERE " + column + "=?", ("x",))
+        assert "USING INDEX" in plan[0][3]
+
+def test_migrates_json_history(tmp_path):
+    profile_path = tmp_path / "profile.json"
+    history = [{"title": "T", "channel": "C", "url": "https://youtu.be/dQw4w9WgXcQ", "status": "Download Completed"}]
+    profile_path.write_text(json.dumps({"name": "User", "profile_picture": "", "history": history}))
+    profile = UserProfile(str(profile_path))
+    assert profile.get_history()[0]["video_id"] == "dQw4w9WgXcQ"
+    profile.flush()
+    assert "history" not in json.loads(profile_path.read_text())
+    profile.history.close()
+    assert len(UserProfile(str(profile_path)).get_history()) == 1
+
+def test_history_model_builds_its_index_in_the_background(tmp_path, monkeypatch):
+    monkeypatch.setenv("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    from ui.history_model import HistoryTableModel
+    application = QApplication.instance() or QApplication([])
+    store = HistoryStore(str(tmp_path / "history.db"))
+    store.add_many({"title": "Video %d" % index, "channel": "Channel", "url": "https://example.com/%d" % index, "status": "Download Completed"} for index in range(3000))
+    model = HistoryTableModel(store, ["Title", "Channel", "URL", "Status"])
+    model.set_filter("video 1")
+    model.refresh()
+    assert model.rowCount() == 0
+    deadline = time.time() + 10
+    while model.search_index is None and time.time() < deadline:
+        application.processEvents()
+        time.sleep(0.01)
+    assert model.rowCount() == model.page_size
+    assert model.entry_at(0)["title"] == "Video 1"
+    while model.canFetchMore():
+        model.fetchMore()
+    assert model.rowCount() == 1111
+    model.set_filter("")
+    assert model.rowCount() == model.page_size and model.canFetchMore()
+    store.close()
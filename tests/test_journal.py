@@ -0,0 +1,84 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from core.engine import DownloadEngine, DownloadTask
+from core.journal import QueueJournal
+from benchmarks.media_server import MediaServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_journal_replays_pending_entries(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    journal = QueueJournal(path)
+    first = journal.add({"url": "https://youtu.be/a"})
+    second = journal.add({"url": "https://youtu.be/b"}, state="held")
+    journal.update(second, "queued", title="B")
+    journal.finish(first, "Download Completed")
+    journal.close()
+    replayed = QueueJournal(path)
+    assert [(key, entry["state"], entry["data"]) for key, entry in replayed.pending()] == [(second, "queued", {"url": "https://youtu.be/b", "title": "B"})]
+    assert replayed.add({"url": "https://youtu.be/c"}) == second + 1
+
+def test_journal_ignores_torn_last_line_and_compacts(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = QueueJournal(str(path))
+    key = journal.add({"url": "https://youtu.be/a"})
+    for index in range(5):
+        journal.update(key, title=str(index))
+    journal.close()
+    with open(path, "a") as f:
+        f.write('{"op": "done", "key": 1, "sta')
+    replayed = QueueJournal(str(path))
+    assert replayed.skipped == 1
+    assert replayed.pending()[0][1]["data"]["title"] == "4"
+    assert len(path.read_text().splitlines()) == 1
+
+def test_metadata_updates_skip_fsync(tmp_path, monkeypatch):
+    journal = QueueJournal(str(tmp_path / "journal.jsonl"))
+    synced = []
+    monkeypatch.setattr(os, "fsync", synced.append)
+    key = journal.add({"url": "https://youtu.be/a"})
+    journal.update(key, sync=False, title="A", channel="C")
+    assert len(synced) == 1
+    journal.update(key, "queued")
+    journal.finish(key, "Download Completed")
+    journal.update(key, sync=False, title="B")
+    assert len(synced) == 3
+    journal.close()
+    assert QueueJournal(journal.path).pending() == []
+
+def test_engine_journals_tasks_until_they_finish(tmp_path):
+    journal = QueueJournal(str(tmp_path / "journal.jsonl"))
+    engine = DownloadEngine(1, journal=journal)
+    held = DownloadTask("https://youtu.be/held", "720p", str(tmp_path), priority=2)
+    engine.submit(held, hold=True)
+    engine.cancel(held.task_id)
+    engine.submit(DownloadTask("https://youtu.be/kept", "720p", str(tmp_path), priority=3), hold=True)
+    journal.close()
+    restored = DownloadEngine(1, journal=QueueJournal(journal.path)).restore()
+    assert [(task.url, task.priority) for task in restored] == [("https://youtu.be/kept", 3)]
+
+def test_killed_cli_resumes_partial_download(tmp_path):
+    data = os.urandom(256 * 1024)
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    with MediaServer(rate=96 * 1024) as server:
+        url = server.add_file("/video.mp4", data)
+        command = [sys.executable, "-m", "core.cli", "--journal", "journal.jsonl", "--no-cache", "-o", str(tmp_path)]
+        process = subprocess.Popen(command + [url], cwd=tmp_path, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        partial = tmp_path / "video.mp4.part"
+        deadline = time.monotonic() + 30
+        while not (partial.exists() and partial.stat().st_size > 64 * 1024):
+            assert time.monotonic() < deadline and process.poll() is None
+            time.sleep(0.02)
+        process.kill()
+        process.wait()
+        result = subprocess.run(command, cwd=tmp_path, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=60)
+        ranges = [header for path, header in server.requests if header]
+    events = [json.loads(line) for line in result.stdout.decode().splitlines()]
+    assert events[0]["event"] == "queued" and events[0]["restored"]
+    assert events[-1]["completed"] == 1
+    assert ranges and int(ranges[-1][len("bytes="):-1]) >= 64 * 1024
+    assert (tmp_path / "video.mp4").read_bytes() == data
+    assert QueueJournal(str(tmp_path / "journal.jsonl")).pending() == []
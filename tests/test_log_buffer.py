@@ -0,0 +1,46 @@
+import glob
+import logging
+from yt_dlp import YoutubeDL
+from core.engine import DownloadEngine, DownloadTask
+from core.log_buffer import LogBuffer, RotatingLogWriter, format_entry
+from tests.helpers import LevelListener
+
+def test_ring_buffer_is_bounded_and_drains_in_batches():
+    buffer = LogBuffer(capacity=3)
+    for index in range(5):
+        buffer.append("line %d" % index, logging.DEBUG if index % 2 else logging.INFO)
+    assert len(buffer) == 3
+    entries, dropped = buffer.drain()
+    assert [entry[2] for entry in entries] == ["line 2", "line 3", "line 4"]
+    assert dropped == 2
+    assert buffer.drain() == ([], 0)
+    assert [entry[2] for entry in buffer.snapshot(logging.INFO)] == ["line 2", "line 4"]
+    assert buffer.snapshot(limit=1)[0][2] == "line 4"
+    assert buffer.counts[logging.DEBUG] == 2
+    assert format_entry(entries[0]).endswith(" INFO    line 2")
+
+def test_writer_streams_to_rotating_file(tmp_path):
+    path = str(tmp_path / "session.log")
+    buffer = LogBuffer(capacity=10, writer=RotatingLogWriter(path, max_bytes=2000, backup_count=2))
+    for index in range(200):
+        buffer.append("message %03d" % index, logging.WARNING if index == 199 else logging.INFO)
+    buffer.close()
+    buffer.append("after close")
+    files = sorted(glob.glob(path + "*"))
+    assert files == [path, path + ".1", path + ".2"]
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert lines[-1].endswith("WARNING message 199")
+    assert all(len(line) < 60 for line in lines)
+
+def test_engine_sets_levels_at_the_source(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    def failing_extract_info(self, url, download=True, **kwargs):
+        raise RuntimeError("no such video")
+    monkeypatch.setattr(YoutubeDL, "extract_info", failing_extract_info)
+    listener = LevelListener()
+    engine = DownloadEngine(1, listener)
+    engine.submit(DownloadTask("https://www.youtube.com/watch?v=dQw4w9WgXcQ", "720p", str(tmp_path)))
+    assert engine.wait(10)
+    assert (logging.ERROR, "Failed to fetch info: no such video") in listener.records
+    assert not any("Failed" in text for text in listener.logs)
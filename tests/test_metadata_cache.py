@@ -0,0 +1,38 @@
+import secrets
+import time
+from core.metadata_cache import MetadataCache
+
+def make_info(video_id, padding=0):
+    return {"id": video_id, "extractor_key": "Youtube", "title": "T " + video_id, "uploader": "U", "formats": [{"url": secrets.token_hex(padding)}]}
+
+def test_hit_and_miss_by_video_id(tmp_path):
+    cache = MetadataCache(str(tmp_path / "cache.db"))
+    assert cache.get("https://youtu.be/dQw4w9WgXcQ") is None
+    cache.put("https://youtu.be/dQw4w9WgXcQ", make_info("dQw4w9WgXcQ"))
+    info = cache.get("https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=5", need_formats=True)
+    assert info["title"] == "T dQw4w9WgXcQ"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_format_ttl_keeps_stable_fields(tmp_path):
+    cache = MetadataCache(str(tmp_path / "cache.db"), format_ttl=0)
+    cache.put("https://youtu.be/dQw4w9WgXcQ", make_info("dQw4w9WgXcQ"))
+    time.sleep(0.01)
+    assert cache.get("https://youtu.be/dQw4w9WgXcQ", need_formats=True) is None
+    info = cache.get("https://youtu.be/dQw4w9WgXcQ")
+    assert info["uploader"] == "U"
+    assert "formats" not in info
+
+def test_alias_for_non_youtube_url(tmp_path):
+    cache = MetadataCache(str(tmp_path / "cache.db"))
+    cache.put("https://example.com/clip", {"id": "42", "extractor_key": "Generic", "title": "Clip"})
+    assert cache.get("https://example.com/clip")["title"] == "Clip"
+
+def test_lru_eviction_by_size(tmp_path):
+    cache = MetadataCache(str(tmp_path / "cache.db"), max_bytes=3000)
+    ids = ["aaaaaaaaaa" + c for c in "ABCDE"]
+    for video_id in ids:
+        cache.put("https://youtu.be/" + video_id, make_info(video_id, padding=1000))
+        time.sleep(0.001)
+    assert cache.total_size <= 3000
+    assert cache.get("https://youtu.be/" + ids[0]) is None
+    assert cache.get("https://youtu.be/" + ids[-1]) is not None
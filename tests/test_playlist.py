@@ -0,0 +1,37 @@
+from yt_dlp.utils import OnDemandPagedList
+from core.playlist import PlaylistTracker, entry_url, iter_playlist_entries
+
+def test_iter_paged_entries_fetches_pages_lazily():
+    fetched = []
+    def page(number):
+        fetched.append(number)
+        return [{"url": "https://example.com/%d" % (number * 10 + index)} for index in range(10)] if number < 3 else []
+    entries = iter_playlist_entries(OnDemandPagedList(page, 10), page_size=10)
+    first = next(entries)
+    assert first["url"] == "https://example.com/0"
+    assert fetched == [0]
+    assert len(list(entries)) == 29
+
+def test_entry_url_requires_absolute_url():
+    assert entry_url({"url": "https://www.youtube.com/watch?v=abc"}) == "https://www.youtube.com/watch?v=abc"
+    assert entry_url({"url": "abc", "ie_key": "Youtube"}) is None
+    assert entry_url(None) is None
+
+def test_tracker_aggregates_children():
+    tracker = PlaylistTracker()
+    tracker.add_parent(1)
+    for child_id in (2, 3, 4):
+        tracker.add_child(1, child_id)
+    assert tracker.status_text(1, {2: 50}) == "0/3+ - 16%"
+    assert tracker.finish_child(2, "Download Completed") == (1, False)
+    assert not tracker.finish_enumeration(1)
+    assert tracker.status_text(1, {3: 50}) == "1/3 - 50%"
+    tracker.finish_child(3, "Download Error")
+    assert tracker.finish_child(4, "Download Completed") == (1, True)
+    assert tracker.status_text(1) == "Playlist Completed (1 failed)"
+
+def test_tracker_empty_failed_playlist():
+    tracker = PlaylistTracker()
+    tracker.add_parent(1)
+    assert tracker.finish_enumeration(1, error="boom")
+    assert tracker.status_text(1) == "Playlist Error"
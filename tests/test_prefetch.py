@@ -0,0 +1,109 @@
+import os
+import threading
+import time
+from core.archive import DownloadArchive
+from core.engine import DownloadEngine, DownloadTask
+from core.metadata_cache import MetadataCache
+from core.prefetch import MetadataPrefetcher
+from benchmarks.media_server import MediaServer
+from tests.helpers import ValidationListener
+
+class GatedPrefetcher(MetadataPrefetcher):
+    def __init__(self):
+        super().__init__(metadata_cache=object(), max_workers=1)
+        self.gate = threading.Event()
+        self.order = []
+    def prefetch(self, task_id, url):
+        self.order.append(task_id)
+        self.gate.wait(5)
+
+def wait_until(condition, timeout=20):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.02)
+    return condition()
+
+def test_queued_tasks_are_resolved_before_a_slot_frees(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = MetadataCache(str(tmp_path / "cache.db"))
+    listener = ValidationListener()
+    prefetcher = MetadataPrefetcher(listener, cache, max_workers=2)
+    engine = DownloadEngine(1, listener, cache, prefetcher=prefetcher)
+    with MediaServer() as server:
+        urls = [server.add_video("clip%d" % index, 64 * 1024, title="Clip %d" % index) for index in range(3)]
+        tasks = [DownloadTask(url, "720p", str(tmp_path)) for url in urls]
+        for task in tasks:
+            engine.submit(task, hold=True)
+        assert wait_until(lambda: len(listener.infos) == 1)
+        time.sleep(0.3)
+        assert [info[:2] for info in listener.infos] == [(tasks[0].task_id, "Clip 0")]
+        assert prefetcher.pending_count() == 2
+        engine.start_queue()
+        assert engine.wait(30)
+        pages = [path for path, byte_range in server.requests if path.startswith("/watch/")]
+    assert sorted(pages) == ["/watch/clip0", "/watch/clip1", "/watch/clip2"]
+    assert sorted(status for task_id, status in listener.statuses) == ["Download Completed"] * 3
+    assert [task.extractor_calls for task in tasks] == [0, 0, 0]
+    assert sorted(name for name in os.listdir(tmp_path) if name.endswith(".mp4")) == ["Clip 0.mp4", "Clip 1.mp4", "Clip 2.mp4"]
+    assert prefetcher.prefetched == 3
+    prefetcher.shutdown()
+    cache.close()
+
+def test_lookahead_limits_prefetch_to_the_next_tasks():
+    prefetcher = GatedPrefetcher()
+    prefetcher.lookahead = lambda: 2
+    prefetcher.gate.set()
+    for task_id in range(1, 6):
+        prefetcher.submit(task_id, "https://example.com/%d" % task_id)
+    assert wait_until(lambda: prefetcher.order == [1, 2])
+    time.sleep(0.3)
+    assert prefetcher.order == [1, 2]
+    assert prefetcher.claim(1) is False
+    assert wait_until(lambda: prefetcher.order == [1, 2, 3])
+    prefetcher.discard(3)
+    prefetcher.discard(2)
+    assert wait_until(lambda: prefetcher.order == [1, 2, 3, 4, 5])
+    prefetcher.shutdown()
+
+def test_prefetch_order_claim_and_discard():
+    prefetcher = GatedPrefetcher()
+    prefetcher.submit(1, "https://example.com/1")
+    assert wait_until(lambda: prefetcher.order == [1])
+    prefetcher.submit(2, "https://example.com/2", priority=3)
+    prefetcher.submit(3, "https://example.com/3", priority=1)
+    prefetcher.submit(4, "https://example.com/4", priority=2)
+    prefetcher.submit(5, "https://example.com/5", priority=1)
+    prefetcher.discard(5)
+    assert prefetcher.claim(4) is False
+    claimed = []
+    claimer = threading.Thread(target=lambda: claimed.append(prefetcher.claim(1)))
+    claimer.start()
+    time.sleep(0.2)
+    assert claimed == []
+    prefetcher.gate.set()
+    claimer.join(5)
+    assert claimed == [True]
+    assert wait_until(lambda: prefetcher.pending_count() == 0)
+    assert prefetcher.order == [1, 3, 2]
+    cancelled = threading.Event()
+    prefetcher.gate.clear()
+    prefetcher.submit(6, "https://example.com/6")
+    assert wait_until(lambda: prefetcher.order[-1] == 6)
+    cancelled.set()
+    assert prefetcher.claim(6, cancelled.is_set) is False
+    prefetcher.gate.set()
+    prefetcher.shutdown()
+
+def test_archived_tasks_are_not_prefetched(tmp_path):
+    archive = DownloadArchive(str(tmp_path / "archive.db"))
+    archive.add(("youtube", "aaaaaaaaaaa"), "video-mp4")
+    prefetcher = GatedPrefetcher()
+    prefetcher.gate.set()
+    engine = DownloadEngine(1, ValidationListener(), archive=archive, prefetcher=prefetcher)
+    archived = DownloadTask("https://youtu.be/aaaaaaaaaaa", "720p", str(tmp_path))
+    fresh = DownloadTask("https://youtu.be/bbbbbbbbbbb", "720p", str(tmp_path))
+    engine.submit(archived, hold=True)
+    engine.submit(fresh, hold=True)
+    assert wait_until(lambda: prefetcher.pending_count() == 0 and prefetcher.order == [fresh.task_id])
+    prefetcher.shutdown()
+    archive.close()
@@ -10,4 +10,24 @@ def test_profile_creation(tmp_path):
     profile.set_profile("TestUser", "", str(tmp_path))
     assert profile.data["name"] == "TestUser"
     profile.set_default_resolution("1080p")
-    assert profile.get_default_resolution() == "1080p"
\ No newline at end of file
+    assert profile.get_default_resolution() == "1080p"
+def test_profile_writes_are_coalesced(tmp_path):
+    profile_path = tmp_path / "test_profile.json"
+    profile = UserProfile(str(profile_path), save_delay=60)
+    profile.flush()
+    profile.write_count = 0
+    for index in range(100):
+        profile.set_rate_limit(str(index) + "K")
+        profile.set_theme("Light" if index % 2 else "Dark")
+    assert profile.write_count == 0
+    profile.flush()
+    assert profile.write_count == 1
+    assert json.loads(profile_path.read_text())["rate_limit"] == "99K"
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".tmp")] == []
+
+def test_load_does_not_rewrite_profile(tmp_path):
+    profile_path = tmp_path / "test_profile.json"
+    UserProfile(str(profile_path), save_delay=None).set_profile("TestUser", "", str(tmp_path))
+    profile = UserProfile(str(profile_path), save_delay=None)
+    assert profile.write_count == 0
+    assert profile.data["name"] == "TestUser"
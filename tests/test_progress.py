@@ -0,0 +1,21 @@
+from core.progress import ProgressAggregator
+
+def test_snapshot_aggregates_active_downloads():
+    aggregator = ProgressAggregator()
+    aggregator.update("a", 0, 50, 100, 1000, 5)
+    aggregator.update("b", None, 150, 300, 3000, 9)
+    snapshot = aggregator.snapshot()
+    assert snapshot.active == 2
+    assert snapshot.percent == 50
+    assert snapshot.speed == 4000
+    assert snapshot.eta == 9
+    assert snapshot.rows == {0: 50}
+
+def test_snapshot_coalesces_updates():
+    aggregator = ProgressAggregator()
+    for downloaded in range(1000):
+        aggregator.update("a", 3, downloaded, 1000, 10, 1)
+    assert aggregator.snapshot().rows[3] == 99.9
+    assert aggregator.snapshot() is None
+    aggregator.remove("a")
+    assert aggregator.snapshot().active == 0
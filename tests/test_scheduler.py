@@ -0,0 +1,57 @@
+import random
+from core.downloader import DownloadTask
+from core.scheduler import DownloadScheduler
+
+def make_task(priority=1):
+    return DownloadTask("https://youtu.be/dQw4w9WgXcQ", "720p", "/tmp", priority=priority)
+
+def test_admission_control_and_priority_order():
+    started = []
+    scheduler = DownloadScheduler(2, started.append)
+    low = [make_task(3) for _ in range(3)]
+    for task in low:
+        scheduler.submit(task)
+    high = make_task(1)
+    scheduler.submit(high)
+    assert [task.task_id for task in started] == [low[0].task_id, low[1].task_id]
+    scheduler.finish(low[0].task_id)
+    assert started[-1] is high
+    assert len(scheduler.running) == 2
+
+def test_held_tasks_wait_for_release_and_cancel_is_lazy():
+    started = []
+    scheduler = DownloadScheduler(1, started.append)
+    first, second = make_task(), make_task()
+    scheduler.submit(first, hold=True)
+    scheduler.submit(second, hold=True)
+    assert started == []
+    assert scheduler.cancel(first.task_id)
+    scheduler.release_held()
+    assert started == [second]
+    assert not scheduler.cancel(second.task_id)
+
+def test_ten_thousand_tasks_without_gui():
+    started = []
+    scheduler = DownloadScheduler(10, started.append)
+    random.seed(7)
+    tasks = [make_task(random.randint(1, 3)) for _ in range(10000)]
+    for task in tasks:
+        scheduler.submit(task)
+    while scheduler.running:
+        scheduler.finish(next(iter(scheduler.running)))
+    assert len(started) == 10000
+    assert len(scheduler) == 0
+    after_first_batch = [task.priority for task in started[10:]]
+    assert after_first_batch == sorted(after_first_batch)
+
+def test_playlist_tasks_expand_without_taking_a_slot():
+    started = []
+    expanded = []
+    scheduler = DownloadScheduler(1, started.append, expanded.append)
+    scheduler.submit(make_task())
+    playlist = make_task()
+    playlist.playlist = True
+    scheduler.submit(playlist)
+    assert expanded == [playlist]
+    assert scheduler.state(playlist.task_id) == "expanding"
+    assert len(scheduler.running) == 1
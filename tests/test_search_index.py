@@ -0,0 +1,26 @@
+from core.search_index import SubstringIndex
+
+def test_search_matches_rows_case_insensitively():
+    index = SubstringIndex(["Rick Astley\nNever Gonna", "Daft Punk\nAround the World", "Queen\nBohemian Rhapsody"])
+    assert index.search("NEVER") == [0]
+    assert index.search("o") == [0, 1, 2]
+    assert index.search("missing") == []
+    assert index.search("") == [0, 1, 2]
+
+def test_search_does_not_span_rows_and_sees_new_rows():
+    index = SubstringIndex(["abc", "def"])
+    assert index.search("cd") == []
+    index.extend(["xcdx"])
+    assert index.search("cd") == [2]
+
+def test_search_reports_each_row_once():
+    index = SubstringIndex(["aaaa", "baab"])
+    assert index.search("a") == [0, 1]
+
+def test_search_across_blocks_matches_a_plain_scan():
+    texts = ["Video %d\nChannel %d" % (index, index % 7) for index in range(1000)]
+    index = SubstringIndex(texts[:300])
+    index.extend(texts[300:])
+    for query in ["video 99", "channel 3", "o 1", "zzz", "video 999\nch"]:
+        assert index.search(query) == [row for row, text in enumerate(texts) if query in text.lower()]
+    assert list(zip(range(3), index.iter_search("video"))) == [(0, 0), (1, 1), (2, 2)]
@@ -0,0 +1,32 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROBE = """
+import json, sys
+from core.startup import StartupProfiler
+profiler = StartupProfiler()
+profiler.install()
+import {module}
+profiler.mark("imports")
+profiler.uninstall()
+print(json.dumps({{"report": profiler.report(), "loaded": sorted(name for name in ("yt_dlp", "requests", "PyQt5") if name in sys.modules)}}))
+"""
+
+def import_in_subprocess(module):
+    env = dict(os.environ, PYTHONPATH=ROOT, QT_QPA_PLATFORM="offscreen")
+    output = subprocess.run([sys.executable, "-c", PROBE.format(module=module)], cwd=ROOT, env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+def test_main_window_import_defers_download_libraries():
+    result = import_in_subprocess("ui.main_window")
+    assert result["loaded"] == ["PyQt5"]
+    assert "imports" in result["report"]["marks_ms"]
+    assert result["report"]["import_breakdown_ms"]
+
+def test_cli_import_loads_neither_download_libraries_nor_qt():
+    result = import_in_subprocess("core.cli")
+    assert result["loaded"] == []
+    assert result["report"]["imports_ms"] >= 0
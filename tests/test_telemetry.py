@@ -0,0 +1,106 @@
+import json
+import sqlite3
+import time
+from core.engine import DownloadEngine, DownloadTask
+from core.history import HistoryStore
+from core.telemetry import TelemetryStats, percentile
+from benchmarks.media_server import MediaServer
+from tests.helpers import MetricsListener
+
+def sample(worker, extract, size, seconds, status="Download Completed", retries=0):
+    return {"status": status, "queue_wait": 0.5, "extract": extract, "first_byte": 0.1, "bytes": size, "seconds": seconds, "throughput": int(size / seconds) if seconds else 0, "peak_throughput": 2 * size, "merge": None, "postprocess": None, "total": extract + seconds, "retries": retries, "cache_hit": False, "worker": worker}
+
+def test_summary_percentiles_and_worker_throughput():
+    assert percentile([5, 1, 3, 2, 4], 0.5) == 3
+    assert percentile(list(range(1, 101)), 0.95) == 95
+    assert percentile([], 0.5) == 0
+    stats = TelemetryStats()
+    stats.add_many([sample("worker-0", index / 10, 1000, 1.0) for index in range(1, 11)])
+    stats.add(sample("worker-1", 5.0, 4000, 1.0, retries=2))
+    stats.add(sample("worker-1", 0.3, 0, 0, status="Download Error"))
+    summary = stats.summary()
+    assert summary["statuses"] == {"Download Completed": 11, "Download Error": 1}
+    assert summary["timings"]["extract"]["p50"] == 0.5
+    assert summary["timings"]["extract"]["p95"] == 5.0
+    assert summary["worker_throughput"] == {"worker-0": 1000, "worker-1": 4000}
+    assert summary["mean_throughput"] == 14000 // 11
+    assert summary["retries"] == 2
+
+def test_exports_json_and_prometheus_only_when_changed(tmp_path):
+    stats = TelemetryStats()
+    stats.add(sample("worker-0", 0.25, 2048, 2.0))
+    json_path, prometheus_path = str(tmp_path / "metrics.json"), str(tmp_path / "metrics.prom")
+    assert stats.write(json_path, prometheus_path)
+    assert not stats.write(json_path, prometheus_path)
+    with open(json_path) as f:
+        assert json.load(f)["timings"]["extract"]["p50"] == 0.25
+    with open(prometheus_path) as f:
+        text = f.read()
+    assert 'youtubego_downloads_total{status="Download Completed"} 1' in text
+    assert 'youtubego_extract_seconds{quantile="0.95"} 0.25' in text
+    assert "youtubego_transfer_seconds_count 1" in text
+    assert 'youtubego_worker_bytes_per_second{worker="worker-0"} 1024' in text
+    for line in text.splitlines():
+        assert line.startswith("#") or len(line.rsplit(" ", 1)) == 2
+
+def test_history_stores_metrics_and_migrates_old_tables(tmp_path):
+    path = str(tmp_path / "history.db")
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE history(id INTEGER PRIMARY KEY AUTOINCREMENT,title TEXT,channel TEXT,url TEXT,video_id TEXT,status TEXT,added_at REAL)")
+    connection.execute("INSERT INTO history(title,channel,url,status) VALUES('Old','C','https://example.com/old','Download Completed')")
+    connection.commit()
+    connection.close()
+    history = HistoryStore(path)
+    history.add("New", "C", "https://example.com/new", "Download Completed")
+    history.set_metrics("https://example.com/new", {"extract": 1.5, "status": "Download Completed"})
+    assert history.metrics_for("https://example.com/new")["extract"] == 1.5
+    assert history.metrics_for("https://example.com/old") is None
+    assert history.recent_metrics() == [{"extract": 1.5, "status": "Download Completed"}]
+    assert history.entries()[0]["title"] == "Old"
+
+def test_engine_reports_phase_timings_and_retries(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with MediaServer(rate=512 * 1024) as server:
+        url = server.add_hls(segments=4, segment_size=64 * 1024)
+        server.fail_requests("/stream/segment0001.ts", 2)
+        listener = MetricsListener()
+        engine = DownloadEngine(2, listener)
+        task = DownloadTask(url, "720p", str(tmp_path))
+        engine.submit(task)
+        assert engine.wait(30)
+    metrics = listener.metrics[task.task_id]
+    assert metrics["status"] == listener.statuses[task.task_id] == "Download Completed"
+    assert metrics["url"] == url
+    assert metrics["bytes"] == 256 * 1024
+    assert metrics["retries"] >= 2
+    assert metrics["worker"] == "worker-0"
+    assert 0 <= metrics["queue_wait"] < 1
+    assert 0 < metrics["extract"] < metrics["total"]
+    assert 0 < metrics["first_byte"] < metrics["total"]
+    assert metrics["seconds"] > 0.3
+    assert metrics["peak_throughput"] > 0 and metrics["throughput"] > 0
+    assert task.metrics is metrics
+
+def test_main_window_reports_the_engine_worker(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication, QMessageBox
+    from core.profile import UserProfile
+    from ui.main_window import MainWindow
+    application = QApplication.instance() or QApplication([])
+    profile = UserProfile()
+    profile.set_profile("Tester", "", str(tmp_path))
+    profile.close()
+    monkeypatch.setattr(QMessageBox, "question", lambda *args: QMessageBox.No)
+    monkeypatch.setattr(QMessageBox, "critical", lambda *args: None)
+    window = MainWindow()
+    with MediaServer() as server:
+        url = server.add_video("clip", 64 * 1024, title="Clip")
+        window.submit_task(DownloadTask(url, "720p", str(tmp_path)), "Video")
+        deadline = time.time() + 30
+        while not window.telemetry_stats.samples and time.time() < deadline:
+            application.processEvents()
+            time.sleep(0.02)
+    window.close()
+    assert [sample["worker"] for sample in window.telemetry_stats.samples] == ["worker-0"]
+    assert window.telemetry_stats.summary()["worker_throughput"].keys() == {"worker-0"}
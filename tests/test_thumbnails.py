@@ -0,0 +1,51 @@
+import threading
+import time
+from core.metadata_cache import MetadataCache
+from core.thumbnails import ThumbnailCache, ThumbnailService, youtube_thumbnail_url
+from benchmarks.media_server import MediaServer
+
+def test_youtube_thumbnail_url_needs_no_extraction():
+    assert youtube_thumbnail_url("https://youtu.be/dQw4w9WgXcQ?t=3") == "https://i.ytimg.com/vi/dQw4w9WgXcQ/mqdefault.jpg"
+    assert youtube_thumbnail_url("https://example.com/video.mp4") is None
+
+def test_disk_cache_is_content_addressed_and_persists(tmp_path):
+    cache = ThumbnailCache(str(tmp_path / "thumbs"))
+    first = cache.put("https://a.example/1.jpg", b"same image")
+    second = cache.put("https://b.example/2.jpg", b"same image")
+    assert first == second
+    assert cache.total_size == len(b"same image")
+    cache.close()
+    reopened = ThumbnailCache(str(tmp_path / "thumbs"))
+    assert reopened.get("https://b.example/2.jpg") == b"same image"
+    assert reopened.get("https://c.example/3.jpg") is None
+    assert (reopened.hits, reopened.misses) == (1, 1)
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = ThumbnailCache(str(tmp_path / "thumbs"), max_bytes=250)
+    for index in range(3):
+        cache.put("https://example.com/%d.jpg" % index, bytes([index]) * 100)
+        time.sleep(0.01)
+    assert cache.get("https://example.com/0.jpg") is None
+    assert cache.get("https://example.com/2.jpg") is not None
+    assert cache.total_size == 200
+
+def test_service_dedupes_requests_and_serves_repeats_from_disk(tmp_path):
+    with MediaServer(rate=200 * 1024) as server:
+        thumbnail_url = server.add_file("/thumb.jpg", size=20 * 1024, content_type="image/jpeg")
+        metadata = MetadataCache(str(tmp_path / "metadata.db"))
+        metadata.put("https://example.com/watch/1", {"id": "1", "extractor_key": "Generic", "title": "Clip", "thumbnail": thumbnail_url})
+        service = ThumbnailService(ThumbnailCache(str(tmp_path / "thumbs")), metadata)
+        futures = []
+        threads = [threading.Thread(target=lambda: futures.append(service.submit("https://example.com/watch/1"))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        results = [future.result(10) for future in futures]
+        assert len({id(future) for future in futures}) == 1
+        assert all(len(data) == 20 * 1024 for data in results)
+        assert service.fetch_count == 1
+        assert service.submit("https://example.com/watch/1").result(10) == results[0]
+        assert len(server.requests) == 1
+        assert service.submit("https://example.com/watch/2").result(10) is None
+        service.close()
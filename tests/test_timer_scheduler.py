@@ -0,0 +1,48 @@
+import datetime
+import time
+from core.timer_scheduler import TimerScheduler, add_months, next_occurrence
+
+def at(text):
+    return datetime.datetime.strptime(text, "%Y-%m-%d %H:%M")
+
+def item(when, recurrence=None):
+    return {"time": when + ":00", "url": "https://youtu.be/" + when, "recurrence": recurrence}
+
+def test_next_occurrence_skips_missed_runs():
+    start = at("2026-01-01 08:00")
+    assert next_occurrence(start, "daily", at("2025-12-31 09:00")) == start
+    assert next_occurrence(start, "daily", at("2026-01-10 08:00")) == at("2026-01-11 08:00")
+    assert next_occurrence(start, "weekly", at("2026-01-10 07:00")) == at("2026-01-15 08:00")
+    assert next_occurrence(start, None, at("2026-01-10 07:00")) is None
+
+def test_monthly_recurrence_clamps_without_drifting():
+    start = at("2026-01-31 20:00")
+    assert add_months(start, 1) == at("2026-02-28 20:00")
+    assert next_occurrence(start, "monthly", at("2026-02-28 20:00")) == at("2026-03-31 20:00")
+    assert next_occurrence(start, "monthly", at("2027-12-31 21:00")) == at("2028-01-31 20:00")
+
+def test_pop_due_fires_in_order_and_reschedules_recurring_items():
+    scheduler = TimerScheduler()
+    scheduler.add(1, item("2026-03-01 10:00", "daily"))
+    scheduler.add(2, item("2026-03-01 09:00"))
+    scheduler.add(3, item("2026-03-05 09:00"))
+    assert scheduler.pop_due(at("2026-03-01 08:59")) == []
+    fired = scheduler.pop_due(at("2026-03-02 12:00"))
+    assert [entry.key for entry in fired] == [2, 1]
+    assert scheduler.items[1].data["time"] == "2026-03-03 10:00:00"
+    assert scheduler.items[2].status == "Started"
+    assert scheduler.next_time() == at("2026-03-03 10:00")
+    scheduler.remove(1)
+    assert scheduler.next_time() == at("2026-03-05 09:00")
+    assert scheduler.seconds_until_next(at("2026-03-05 08:59")) == 60
+
+def test_pop_due_cost_does_not_grow_with_pending_items():
+    scheduler = TimerScheduler()
+    now = at("2026-01-01 00:00")
+    for index in range(20000):
+        scheduler.add(index, item((now + datetime.timedelta(minutes=index + 1)).strftime("%Y-%m-%d %H:%M"), "daily"))
+    started = time.perf_counter()
+    for minute in range(100):
+        assert len(scheduler.pop_due(now + datetime.timedelta(minutes=minute, seconds=30))) == (1 if minute else 0)
+    assert time.perf_counter() - started < 0.2
+    assert len(scheduler.heap) == 20000
@@ -1,6 +1,12 @@
 import pytest
-from core.utils import format_time
+from core.utils import extract_video_id, format_time
 
 def test_format_time():
     assert format_time(65000) == "01:05"
-    assert format_time(3605000) == "01:00:05"
\ No newline at end of file
+    assert format_time(3605000) == "01:00:05"
+
+def test_extract_video_id():
+    assert extract_video_id("https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=10") == "dQw4w9WgXcQ"
+    assert extract_video_id("https://youtu.be/dQw4w9WgXcQ") == "dQw4w9WgXcQ"
+    assert extract_video_id("https://www.youtube.com/shorts/dQw4w9WgXcQ") == "dQw4w9WgXcQ"
+    assert extract_video_id("https://example.com/video.mp4") is None
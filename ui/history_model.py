@@ -0,0 +1,141 @@
+import threading
+from itertools import islice
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+from core.search_index import SubstringIndex
+
+class HistoryTableModel(QAbstractTableModel):
+    page_size=500
+    fields=("title","channel","url","status")
+    index_ready=pyqtSignal(int,object,object)
+    def __init__(self,store,headers,parent=None):
+        super().__init__(parent)
+        self.store=store
+        self.headers=headers
+        self.rows=[]
+        self.total=0
+        self.generation=0
+        self.search_rows=[]
+        self.search_index=None
+        self.matches=None
+        self.pending_matches=None
+        self.query=""
+        self.thumbnails=None
+        self.thumbnail_size=None
+        self.waiting={}
+        self.index_ready.connect(self.install_index)
+    def refresh(self):
+        self.beginResetModel()
+        self.rows=[]
+        self.waiting={}
+        self.total=self.store.count()
+        self.generation+=1
+        self.search_rows=[]
+        self.search_index=None
+        self.load_rows(self.page_size)
+        if self.query:
+            self.apply_filter()
+        self.endResetModel()
+        threading.Thread(target=self.build_index,args=(self.generation,),name="history-index",daemon=True).start()
+    def row_tuples(self,entries):
+        return [tuple(entry[field] or "" for field in self.fields) for entry in entries]
+    def load_rows(self,limit=-1):
+        entries=self.store.entries(len(self.rows),limit)
+        self.rows.extend(self.row_tuples(entries))
+        return len(entries)
+    def build_index(self,generation):
+        rows=self.row_tuples(self.store.entries())
+        search_index=SubstringIndex("\n".join(row) for row in rows)
+        search_index.compact()
+        self.index_ready.emit(generation,rows,search_index)
+    def install_index(self,generation,rows,search_index):
+        if generation!=self.generation:
+            return
+        self.search_rows=rows
+        self.search_index=search_index
+        if self.query:
+            self.set_filter(self.query)
+    def rowCount(self,parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.matches) if self.matches is not None else len(self.rows)
+    def columnCount(self,parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.fields)
+    def canFetchMore(self,parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        if self.matches is not None:
+            return self.pending_matches is not None
+        return len(self.rows)<self.total
+    def fetchMore(self,parent=QModelIndex()):
+        if self.matches is not None:
+            self.fetch_matches()
+            return
+        remaining=min(self.page_size,self.total-len(self.rows))
+        if remaining<=0:
+            return
+        self.beginInsertRows(QModelIndex(),len(self.rows),len(self.rows)+remaining-1)
+        loaded=self.load_rows(remaining)
+        self.total=len(self.rows) if loaded<remaining else self.total
+        self.endInsertRows()
+    def fetch_matches(self):
+        if self.pending_matches is None:
+            return
+        matches=list(islice(self.pending_matches,self.page_size))
+        if len(matches)<self.page_size:
+            self.pending_matches=None
+        if matches:
+            self.beginInsertRows(QModelIndex(),len(self.matches),len(self.matches)+len(matches)-1)
+            self.matches.extend(matches)
+            self.endInsertRows()
+    def row_values(self,row):
+        return self.search_rows[self.matches[row]] if self.matches is not None else self.rows[row]
+    def entry_at(self,row):
+        return dict(zip(self.fields,self.row_values(row)))
+    def data(self,index,role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role==Qt.DecorationRole:
+            return self.thumbnail(index.row()) if index.column()==0 else None
+        if role not in (Qt.DisplayRole,Qt.ToolTipRole):
+            return None
+        return self.row_values(index.row())[index.column()]
+    def set_thumbnails(self,loader,size):
+        self.thumbnails=loader
+        self.thumbnail_size=size
+        loader.pixmap_ready.connect(self.thumbnail_ready)
+    def thumbnail(self,row):
+        if self.thumbnails is None:
+            return None
+        url=self.row_values(row)[2]
+        pixmap=self.thumbnails.pixmap(url,self.thumbnail_size)
+        if pixmap is None:
+            self.waiting.setdefault(url,set()).add(row)
+        return pixmap
+    def thumbnail_ready(self,url,size):
+        for row in self.waiting.pop(url,()):
+            if row<self.rowCount():
+                index=self.index(row,0)
+                self.dataChanged.emit(index,index,[Qt.DecorationRole])
+    def headerData(self,section,orientation,role=Qt.DisplayRole):
+        if role==Qt.DisplayRole and orientation==Qt.Horizontal:
+            return self.headers[section]
+        return super().headerData(section,orientation,role)
+    def set_filter(self,text):
+        self.query=text.strip()
+        self.beginResetModel()
+        self.waiting={}
+        if self.query:
+            self.apply_filter()
+        else:
+            self.matches=None
+            self.pending_matches=None
+        self.endResetModel()
+    def apply_filter(self):
+        self.matches=[]
+        self.pending_matches=None
+        if self.search_index is None:
+            return
+        self.pending_matches=self.search_index.iter_search(self.query)
+        self.matches=list(islice(self.pending_matches,self.page_size))
+        if len(self.matches)<self.page_size:
+            self.pending_matches=None
@@ -1,33 +1,36 @@
 import os
 import sys
+import logging
 import platform
 import shutil
-import subprocess
-import requests
+import threading
 import gettext
-from PyQt5.QtCore import Qt, pyqtSignal, QThreadPool, QTimer, QDateTime
-from PyQt5.QtGui import QColor, QFont, QPixmap
-from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QStackedWidget, QListWidget, QDockWidget, QLineEdit, QLabel, QPushButton, QSystemTrayIcon, QStyle, QAction, QMessageBox, QStatusBar, QProgressBar, QTextEdit, QFileDialog, QListWidgetItem, QDialog, QFormLayout, QDialogButtonBox, QCheckBox, QComboBox, QTableWidget, QHeaderView, QTableWidgetItem, QDateTimeEdit, QSlider
-from core.downloader import DownloadTask, WorkerSignals, DownloadWorker
+import importlib
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QDateTime, QTime
+from PyQt5.QtGui import QFont, QIcon, QTextCursor
+from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QStackedWidget, QListWidget, QDockWidget, QLineEdit, QLabel, QPushButton, QSystemTrayIcon, QStyle, QAction, QMessageBox, QStatusBar, QProgressBar, QPlainTextEdit, QFileDialog, QListWidgetItem, QDialog, QFormLayout, QDialogButtonBox, QCheckBox, QComboBox, QTableWidget, QHeaderView, QTableWidgetItem, QDateTimeEdit, QSlider, QTimeEdit, QSpinBox
+from core.downloader import DownloadTask, WorkerSignals, SignalListener
+from core.converter import BatchConverter, FINISHED_STATUSES
 from core.profile import UserProfile
+from core.metadata_cache import MetadataCache
+from core.prefetch import MetadataPrefetcher
+from core.journal import QueueJournal
+from core.log_buffer import LogBuffer, RotatingLogWriter, format_entry
+from core.acceleration import AccelerationSettings
+from core.archive import DownloadArchive
+from core.bulk_import import MetadataValidator, scan_import_file, url_key
+from core.bandwidth_calendar import BandwidthCalendar, TimeWindow, DAY_NAMES
+from core.engine import DownloadEngine
+from core.telemetry import TelemetryStats, describe_metrics
 from core.theming import apply_theme
+from core.thumbnails import ThumbnailCache, ThumbnailService
+from core.timer_scheduler import RECURRENCES, TimerScheduler
 from core.utils import format_time, open_download_path
-from ui.pages.home import create_home_page
-from ui.pages.mp4_page import create_mp4_page
-from ui.pages.mp3_page import create_mp3_page
-from ui.pages.history_page import create_history_page
-from ui.pages.settings_page import create_settings_page
-from ui.pages.profile_page import create_profile_page
-from ui.pages.queue_page import create_queue_page
-from ui.pages.scheduler_page import create_scheduler_page
-from ui.pages.player_page import create_player_page
-from ui.pages.experimental_page import create_experimental_page
+from ui.thumbnails import ROW_THUMBNAIL_SIZE, ThumbnailLoader
 
 class MainWindow(QMainWindow):
-    update_progress_signal=pyqtSignal(int,float,float,int)
-    update_status_signal=pyqtSignal(int,str)
-    update_log_signal=pyqtSignal(str)
-    update_info_signal=pyqtSignal(int,str,str)
+    page_specs=[("ui.pages.home","create_home_page"),("ui.pages.mp4_page","create_mp4_page"),("ui.pages.mp3_page","create_mp3_page"),("ui.pages.history_page","create_history_page"),("ui.pages.settings_page","create_settings_page"),("ui.pages.profile_page","create_profile_page"),("ui.pages.queue_page","create_queue_page"),("ui.pages.scheduler_page","create_scheduler_page"),("ui.pages.player_page","create_player_page"),("ui.pages.experimental_page","create_experimental_page"),("ui.pages.stats_page","create_stats_page")]
+    import_ready_signal=pyqtSignal(object)
     def __init__(self):
         super().__init__()
         self.setWindowTitle("YoutubeGO Experimental")
@@ -36,32 +39,103 @@ class MainWindow(QMainWindow):
         self.ffmpeg_found=bool(self.ffmpeg_path)
         self.status_label=QLabel("Ready")
         self.progress_bar=QProgressBar()
-        self.log_text_edit=QTextEdit()
+        self.log_text_edit=QPlainTextEdit()
         self.log_text_edit.setReadOnly(True)
+        self.log_text_edit.setUndoRedoEnabled(False)
+        self.log_text_edit.setMaximumBlockCount(2000)
         self.user_profile=UserProfile()
-        self.thread_pool=QThreadPool()
-        self.active_workers={}
-        self.all_queue_tasks={}
+        self.log_buffer=LogBuffer(5000,RotatingLogWriter(os.path.splitext(self.user_profile.profile_path)[0]+".log"))
+        self.log_timer=QTimer(self)
+        self.log_timer.setInterval(250)
+        self.log_timer.timeout.connect(self.flush_log)
+        self.log_timer.start()
+        self.metadata_cache=MetadataCache(os.path.splitext(self.user_profile.profile_path)[0]+"_metadata_cache.db")
+        self.download_archive=DownloadArchive(os.path.splitext(self.user_profile.profile_path)[0]+"_archive.db")
+        self.queue_journal=QueueJournal(os.path.splitext(self.user_profile.profile_path)[0]+"_queue.jsonl")
+        self.thumbnail_service=ThumbnailService(ThumbnailCache(os.path.splitext(self.user_profile.profile_path)[0]+"_thumbnails"),self.metadata_cache)
+        self.thumbnail_loader=ThumbnailLoader(self.thumbnail_service,parent=self)
+        self.thumbnail_loader.pixmap_ready.connect(self.show_thumbnail)
+        self.thumbnail_loader.failed.connect(self.thumbnail_failed)
+        self.thumbnail_request=None
+        self.queue_thumbnail_timer=QTimer(self)
+        self.queue_thumbnail_timer.setSingleShot(True)
+        self.queue_thumbnail_timer.setInterval(50)
+        self.queue_thumbnail_timer.timeout.connect(self.request_queue_thumbnails)
+        self.history_search_timer=QTimer(self)
+        self.history_search_timer.setSingleShot(True)
+        self.history_search_timer.setInterval(150)
+        self.history_search_timer.timeout.connect(self.search_history)
+        self.telemetry_stats=TelemetryStats()
+        self.telemetry_stats.add_many(self.user_profile.history.recent_metrics(self.telemetry_stats.samples.maxlen))
+        self.metrics_path=os.path.splitext(self.user_profile.profile_path)[0]+"_metrics.json"
+        self.prometheus_path=os.path.splitext(self.user_profile.profile_path)[0]+"_metrics.prom"
+        self.metrics_timer=QTimer(self)
+        self.metrics_timer.setInterval(15000)
+        self.metrics_timer.timeout.connect(self.export_metrics)
+        self.metrics_timer.start()
+        self.converter_signals=WorkerSignals()
+        self.converter_signals.status.connect(self.update_conversion_status)
+        self.converter_signals.progress.connect(self.update_conversion_progress)
+        self.converter_signals.log.connect(self.append_log)
+        self.batch_converter=BatchConverter(SignalListener(self.converter_signals),ffmpeg_path=self.ffmpeg_path or "ffmpeg")
+        self.conversion_rows={}
+        self.validation_signals=WorkerSignals()
+        self.validation_signals.status.connect(self.update_validation_status)
+        self.validation_signals.info.connect(self.update_queue_info)
+        self.validation_signals.log.connect(self.append_log)
+        self.url_validator=None
+        self.prefetch_signals=WorkerSignals()
+        self.prefetch_signals.info.connect(self.update_queue_info)
+        self.prefetch_signals.log.connect(self.append_log)
+        self.metadata_prefetcher=MetadataPrefetcher(SignalListener(self.prefetch_signals),self.metadata_cache,2)
+        self.url_import=None
+        self.engine_signals=WorkerSignals()
+        self.engine_signals.status.connect(self.update_status,Qt.QueuedConnection)
+        self.engine_signals.log.connect(self.append_log,Qt.QueuedConnection)
+        self.engine_signals.info.connect(self.update_queue_info,Qt.QueuedConnection)
+        self.engine_signals.entry.connect(self.add_playlist_entry,Qt.QueuedConnection)
+        self.engine_signals.metrics.connect(self.record_metrics,Qt.QueuedConnection)
         self.max_concurrent_downloads=3
+        self.download_engine=DownloadEngine(self.max_concurrent_downloads,SignalListener(self.engine_signals),self.metadata_cache,self.user_profile.get_rate_limit(),self.acceleration_defaults(),self.queue_journal,self.active_archive(),self.metadata_prefetcher)
+        self.download_tasks={}
+        self.playlist_parents={}
+        self.queue_entries={}
+        self.queue_rows={}
+        self.built_pages={}
         self.developer_mode=False
         self.verbose_logging=False
-        self.search_map={"proxy":(4,"Proxy configuration is in Settings."),"resolution":(4,"Resolution configuration is in Settings."),"profile":(5,"Profile page for user details."),"queue":(6,"Queue page for multiple downloads."),"mp4":(1,"MP4 page for video downloads."),"mp3":(2,"MP3 page for audio downloads."),"history":(3,"History page for download logs."),"settings":(4,"Settings page for various options."),"scheduler":(7,"Scheduler for planned downloads."),"download path":(4,"Download path is in Settings."),"theme":(4,"Theme switch is in Settings."),"player":(8,"Video Player for downloaded videos.")}
-        self.update_progress_signal.connect(self.update_progress)
-        self.update_status_signal.connect(self.update_status)
-        self.update_log_signal.connect(self.append_log)
-        self.update_info_signal.connect(self.update_queue_info)
+        self.search_map={"proxy":(4,"Proxy configuration is in Settings."),"resolution":(4,"Resolution configuration is in Settings."),"profile":(5,"Profile page for user details."),"queue":(6,"Queue page for multiple downloads."),"mp4":(1,"MP4 page for video downloads."),"mp3":(2,"MP3 page for audio downloads."),"history":(3,"History page for download logs."),"settings":(4,"Settings page for various options."),"scheduler":(7,"Scheduler for planned downloads."),"download path":(4,"Download path is in Settings."),"theme":(4,"Theme switch is in Settings."),"player":(8,"Video Player for downloaded videos."),"stats":(10,"Stats page for download timings and throughput.")}
+        self.progress_timer=QTimer(self)
+        self.progress_timer.setInterval(100)
+        self.progress_timer.timeout.connect(self.flush_progress)
+        self.progress_timer.start()
+        self.timer_scheduler=TimerScheduler()
+        self.scheduler_rows={}
+        for key,entry in self.queue_journal.pending("schedule"):
+            self.timer_scheduler.add(key,entry["data"])
+        self.scheduler_timer=QTimer(self)
+        self.scheduler_timer.setSingleShot(True)
+        self.scheduler_timer.timeout.connect(self.fire_scheduled_downloads)
+        self.arm_scheduler_timer()
+        self.bandwidth_calendar=BandwidthCalendar.from_list(self.user_profile.get_bandwidth_calendar())
+        self.download_engine.set_calendar(self.bandwidth_calendar)
+        self.calendar_timer=QTimer(self)
+        self.calendar_timer.setSingleShot(True)
+        self.calendar_timer.timeout.connect(self.apply_bandwidth_calendar)
+        self.apply_bandwidth_calendar()
+        self.import_ready_signal.connect(self.finish_url_import)
         apply_theme(self,self.user_profile.get_theme())
         if not self.user_profile.is_profile_complete():
             self.prompt_user_profile()
         self.create_tray_icon()
         self.initialize_ui()
-        self.load_history_table()
+        self.restore_queue()
     def initialize_ui(self):
         self.navbar=QListWidget()
         self.navbar.setFixedHeight(50)
         self.navbar.setFlow(QListWidget.LeftToRight)
         self.navbar.setSpacing(5)
-        pages=["Home","MP4","MP3","History","Settings","Profile","Queue","Scheduler","Player","Experimental"]
+        pages=["Home","MP4","MP3","History","Settings","Profile","Queue","Scheduler","Player","Experimental","Stats"]
         for page in pages:
             self.navbar.addItem(self._(page))
         self.navbar.setCurrentRow(0)
@@ -103,16 +177,9 @@ class MainWindow(QMainWindow):
         main_layout=QVBoxLayout(central_widget)
         main_layout.addWidget(self.navbar)
         self.stack_pages=QStackedWidget()
-        self.stack_pages.addWidget(create_home_page(self))
-        self.stack_pages.addWidget(create_mp4_page(self))
-        self.stack_pages.addWidget(create_mp3_page(self))
-        self.stack_pages.addWidget(create_history_page(self))
-        self.stack_pages.addWidget(create_settings_page(self))
-        self.stack_pages.addWidget(create_profile_page(self))
-        self.stack_pages.addWidget(create_queue_page(self))
-        self.stack_pages.addWidget(create_scheduler_page(self))
-        self.stack_pages.addWidget(create_player_page(self))
-        self.stack_pages.addWidget(create_experimental_page(self))
+        for _ in self.page_specs:
+            self.stack_pages.addWidget(QWidget())
+        self.ensure_page(0)
         main_layout.addWidget(self.stack_pages)
         main_layout.addWidget(self.search_line_edit)
         main_layout.addWidget(self.search_button)
@@ -134,7 +201,36 @@ class MainWindow(QMainWindow):
         menu.addAction(quit_action)
         return menu
     def change_page(self,index):
+        self.ensure_page(index)
         self.stack_pages.setCurrentIndex(index)
+        self.schedule_queue_thumbnails()
+    def ensure_page(self,index):
+        if index in self.built_pages or not 0<=index<len(self.page_specs):
+            return self.built_pages.get(index)
+        module_name,factory_name=self.page_specs[index]
+        try:
+            page=getattr(importlib.import_module(module_name),factory_name)(self)
+        except ImportError as e:
+            page=QLabel(self._("This page is unavailable: {error}").format(error=str(e)))
+            page.setAlignment(Qt.AlignCenter)
+            self.append_log(self._("Failed to load page {page}: {error}").format(page=module_name,error=str(e)),logging.ERROR)
+        placeholder=self.stack_pages.widget(index)
+        current=self.stack_pages.currentIndex()
+        self.stack_pages.insertWidget(index,page)
+        self.stack_pages.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.stack_pages.setCurrentIndex(current)
+        self.built_pages[index]=page
+        if module_name=="ui.pages.history_page":
+            self.load_history_table()
+        elif module_name=="ui.pages.queue_page":
+            self.render_queue_table()
+        elif module_name=="ui.pages.scheduler_page":
+            self.render_calendar_table()
+            self.render_scheduler_table()
+        elif module_name=="ui.pages.stats_page":
+            self.render_stats_page()
+        return page
     def top_search(self):
         query=self.search_line_edit.text().lower().strip()
         self.search_results_list.clear()
@@ -155,73 +251,103 @@ class MainWindow(QMainWindow):
         self.navbar.setCurrentRow(page_index)
         self.search_results_list.clear()
         self.search_results_list.setVisible(False)
-    def append_log(self,text):
-        text_lower=text.lower()
-        if "error" in text_lower or "fail" in text_lower:
-            color="red"
-        elif "warning" in text_lower:
-            color="yellow"
-        elif any(keyword in text_lower for keyword in ["completed","started","queued","fetching"]):
-            color="green"
-        elif "cancel" in text_lower:
-            color="orange"
-        else:
-            color="white"
-        self.log_text_edit.setTextColor(QColor(color))
-        self.log_text_edit.append(text)
-        self.log_text_edit.setTextColor(QColor("white"))
+    def append_log(self,text,level=logging.INFO):
+        self.log_buffer.append(text,level)
+    def log_view_level(self):
+        return logging.DEBUG if self.developer_mode or self.verbose_logging else logging.INFO
+    def flush_log(self):
+        entries,dropped=self.log_buffer.drain()
+        level=self.log_view_level()
+        lines=[format_entry(entry) for entry in entries if entry[1]>=level]
+        if dropped:
+            lines.insert(0,self._("... {count} lines skipped, see {path}").format(count=dropped,path=self.log_buffer.writer.path))
+        if lines:
+            self.log_text_edit.appendPlainText("\n".join(lines))
+    def refresh_log_view(self):
+        self.log_buffer.drain()
+        self.log_text_edit.setPlainText("\n".join(format_entry(entry) for entry in self.log_buffer.snapshot(self.log_view_level(),self.log_text_edit.maximumBlockCount())))
+        self.log_text_edit.moveCursor(QTextCursor.End)
     def toggle_logs(self):
         self.log_dock.setVisible(not self.log_dock.isVisible())
     def load_history_table(self):
         if not self.user_profile.is_history_enabled():
             return
-        if not hasattr(self,"history_table"):
+        if not hasattr(self,"history_model"):
             return
-        for entry in self.user_profile.data["history"]:
-            row=self.history_table.rowCount()
-            self.history_table.insertRow(row)
-            self.history_table.setItem(row,0,QTableWidgetItem(entry["title"]))
-            self.history_table.setItem(row,1,QTableWidgetItem(entry["channel"]))
-            self.history_table.setItem(row,2,QTableWidgetItem(entry["url"]))
-            self.history_table.setItem(row,3,QTableWidgetItem(entry["status"]))
+        self.history_model.refresh()
     def delete_selected_history(self):
-        selected_rows=set(item.row() for item in self.history_table.selectedItems())
-        urls_to_remove=[]
-        for row in sorted(selected_rows,reverse=True):
-            url_item=self.history_table.item(row,2)
-            if url_item:
-                urls_to_remove.append(url_item.text())
-            self.history_table.removeRow(row)
+        selected_rows=[index.row() for index in self.history_table.selectionModel().selectedRows()]
+        urls_to_remove=[self.history_model.entry_at(row)["url"] for row in selected_rows]
         if urls_to_remove:
             self.user_profile.remove_history_entries(urls_to_remove)
+            self.history_model.refresh()
         self.append_log(self._("Deleted {count} history entries.").format(count=len(selected_rows)))
     def delete_all_history(self):
         if QMessageBox.question(self,self._("Delete All"),self._("Are you sure?"),QMessageBox.Yes|QMessageBox.No)==QMessageBox.Yes:
-            self.history_table.setRowCount(0)
             self.user_profile.clear_history()
+            self.history_model.refresh()
             self.append_log(self._("All history deleted."))
     def toggle_history_logging(self,state):
         enabled=(state==Qt.Checked)
         self.user_profile.set_history_enabled(enabled)
         self.append_log(self._("History logging {status}.").format(status=self._("enabled") if enabled else self._("disabled")))
+    def active_archive(self):
+        return self.download_archive if self.user_profile.is_archive_enabled() else None
+    def toggle_download_archive(self,state):
+        enabled=(state==Qt.Checked)
+        self.user_profile.set_archive_enabled(enabled)
+        self.download_engine.archive=self.active_archive()
+        self.append_log(self._("Download archive {status}.").format(status=self._("enabled") if enabled else self._("disabled")))
+    def import_history_into_archive(self):
+        count=self.download_archive.import_history(self.user_profile.history)
+        self.update_archive_label()
+        self.append_log(self._("{count} completed downloads imported into the archive.").format(count=count))
+    def update_archive_label(self):
+        if hasattr(self,"archive_count_label"):
+            self.archive_count_label.setText(self._("{count} videos archived").format(count=len(self.download_archive)))
+    def schedule_history_search(self,*args):
+        self.history_search_timer.start()
     def search_history(self):
-        search_text=self.history_search_line_edit.text().lower().strip()
-        for row in range(self.history_table.rowCount()):
-            hide=True
-            for col in range(self.history_table.columnCount()):
-                item=self.history_table.item(row,col)
-                if item and search_text in item.text().lower():
-                    hide=False
-                    break
-            self.history_table.setRowHidden(row,hide)
-    def update_queue_info(self,row,title,channel):
-        if row is not None and hasattr(self,"queue_table"):
-            if row<self.queue_table.rowCount():
-                self.queue_table.setItem(row,0,QTableWidgetItem(title))
-                self.queue_table.setItem(row,1,QTableWidgetItem(channel))
-                url_item=self.queue_table.item(row,2)
-                if url_item:
-                    self.user_profile.update_history_entry(url_item.text(),title,channel)
+        self.history_search_timer.stop()
+        self.history_model.set_filter(self.history_search_line_edit.text())
+    def update_queue_info(self,task_id,title,channel):
+        self.set_queue_cell(task_id,0,title)
+        self.set_queue_cell(task_id,1,channel)
+        task=self.download_engine.task(task_id)
+        if task is not None:
+            self.user_profile.update_history_entry(task.url,title,channel)
+            if task.journal_id is not None:
+                self.queue_journal.update(task.journal_id,sync=False,title=title,channel=channel)
+    def add_queue_row(self,task_id,url,type_text,status):
+        self.queue_entries[task_id]=["Fetching...","Fetching...",url,type_text,status,""]
+        return self.render_queue_row(task_id)
+    def render_queue_row(self,task_id):
+        if not hasattr(self,"queue_table"):
+            return None
+        row=self.queue_table.rowCount()
+        self.queue_table.insertRow(row)
+        for col,text in enumerate(self.queue_entries[task_id]):
+            self.queue_table.setItem(row,col,QTableWidgetItem(text))
+        self.queue_rows[task_id]=row
+        self.schedule_queue_thumbnails()
+        return row
+    def render_queue_table(self):
+        for task_id in self.queue_entries:
+            if task_id not in self.queue_rows:
+                self.render_queue_row(task_id)
+    def set_queue_cell(self,task_id,column,text):
+        values=self.queue_entries.get(task_id)
+        if values is None:
+            return
+        values[column]=text
+        row=self.queue_rows.get(task_id)
+        if row is None or not hasattr(self,"queue_table") or row>=self.queue_table.rowCount():
+            return
+        item=self.queue_table.item(row,column)
+        if item is None:
+            self.queue_table.setItem(row,column,QTableWidgetItem(text))
+        elif item.text()!=text:
+            item.setText(text)
     def add_scheduler_dialog(self):
         dialog=QDialog(self)
         dialog.setWindowTitle(self._("Add Scheduled Download"))
@@ -256,62 +382,160 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(dialog,self._("Error"),self._("No URL provided."))
             return
         priority=int(priority_combo.currentText().split(" - ")[0])
-        recurrence=recurrence_combo.currentText().lower() if recurrence_combo.currentText()!=self._("None") else None
-        row=self.scheduler_table.rowCount()
-        self.scheduler_table.insertRow(row)
-        self.scheduler_table.setItem(row,0,QTableWidgetItem(datetime_edit.dateTime().toString("yyyy-MM-dd HH:mm:ss")))
-        self.scheduler_table.setItem(row,1,QTableWidgetItem(url))
-        self.scheduler_table.setItem(row,2,QTableWidgetItem(self._("Audio") if audio_checkbox.isChecked() else self._("Video")))
-        self.scheduler_table.setItem(row,3,QTableWidgetItem(self._("Yes") if subtitles_checkbox.isChecked() else self._("No")))
-        self.scheduler_table.setItem(row,4,QTableWidgetItem(self._("Scheduled")))
-        self.scheduler_table.setItem(row,5,QTableWidgetItem(str(priority)))
-        self.scheduler_table.setItem(row,6,QTableWidgetItem(recurrence.capitalize() if recurrence else self._("None")))
+        recurrence=RECURRENCES[recurrence_combo.currentIndex()-1] if recurrence_combo.currentIndex()>0 else None
+        when=datetime_edit.dateTime().toString("yyyy-MM-dd HH:mm:ss")
+        data={"time":when,"start":when,"url":url,"audio_only":audio_checkbox.isChecked(),"subtitles":subtitles_checkbox.isChecked(),"priority":priority,"recurrence":recurrence}
+        self.timer_scheduler.add(self.queue_journal.add(data,"schedule","scheduled"),data)
+        self.render_scheduler_table()
+        self.arm_scheduler_timer()
         dialog.accept()
+    def render_scheduler_table(self):
+        if not hasattr(self,"scheduler_table"):
+            return
+        items=[self.timer_scheduler.items[key] for key in sorted(self.timer_scheduler.items)]
+        self.scheduler_table.setRowCount(len(items))
+        self.scheduler_rows={}
+        for row,item in enumerate(items):
+            data=item.data
+            values=[data["time"],data["url"],self._("Audio") if data["audio_only"] else self._("Video"),self._("Yes") if data["subtitles"] else self._("No"),self._(item.status),str(data["priority"]),self._(item.recurrence.capitalize()) if item.recurrence else self._("None")]
+            for col,text in enumerate(values):
+                self.scheduler_table.setItem(row,col,QTableWidgetItem(text))
+            self.scheduler_table.item(row,1).setData(Qt.UserRole,item.key)
+            self.scheduler_rows[item.key]=row
     def remove_scheduler_items(self):
         rows=set(item.row() for item in self.scheduler_table.selectedItems())
-        for row in sorted(rows,reverse=True):
-            self.scheduler_table.removeRow(row)
-    def check_scheduler_downloads(self):
-        if not hasattr(self,"scheduler_table"):
+        for row in rows:
+            key=self.scheduler_table.item(row,1).data(Qt.UserRole)
+            self.timer_scheduler.remove(key)
+            self.queue_journal.finish(key,"Removed")
+        self.render_scheduler_table()
+        self.arm_scheduler_timer()
+    def arm_scheduler_timer(self):
+        seconds=self.timer_scheduler.seconds_until_next()
+        if seconds is None:
+            self.scheduler_timer.stop()
+        else:
+            self.scheduler_timer.start(int(seconds*1000))
+    def fire_scheduled_downloads(self):
+        for item in self.timer_scheduler.pop_due():
+            data=item.data
+            task=DownloadTask(data["url"],self.user_profile.get_default_resolution(),self.user_profile.get_download_path(),data["audio_only"],False,data["subtitles"],"mp4",True,data["priority"],item.recurrence,None,None,self.user_profile.get_audio_format())
+            self.schedule_download(task)
+            if item.recurrence:
+                self.queue_journal.update(item.key,time=data["time"])
+                self.append_log(self._("Scheduled download started, next run at {time}: {url}").format(time=data["time"],url=data["url"]))
+            else:
+                self.queue_journal.finish(item.key,"Started")
+                self.append_log(self._("Scheduled download started: {url}").format(url=data["url"]))
+            row=self.scheduler_rows.get(item.key) if hasattr(self,"scheduler_table") else None
+            if row is not None:
+                self.scheduler_table.item(row,0).setText(data["time"])
+                self.scheduler_table.item(row,4).setText(self._(item.status))
+        self.arm_scheduler_timer()
+    def apply_bandwidth_calendar(self):
+        window=self.download_engine.apply_calendar()
+        if hasattr(self,"calendar_status_label"):
+            if window is None:
+                self.calendar_status_label.setText(self._("No window active, using default limits."))
+            else:
+                self.calendar_status_label.setText(self._("Active window: {window}").format(window=window.describe()))
+        self.calendar_timer.start(int(self.download_engine.calendar.seconds_until_change()*1000))
+    def render_calendar_table(self):
+        if not hasattr(self,"calendar_table"):
             return
-        current_time=QDateTime.currentDateTime()
-        for row in range(self.scheduler_table.rowCount()):
-            dt_str=self.scheduler_table.item(row,0).text()
-            scheduled_time=QDateTime.fromString(dt_str,"yyyy-MM-dd HH:mm:ss")
-            status_item=self.scheduler_table.item(row,4)
-            if status_item and scheduled_time<=current_time and status_item.text()==self._("Scheduled"):
-                url=self.scheduler_table.item(row,1).text()
-                video_type=self.scheduler_table.item(row,2).text().lower()
-                subtitles=(self.scheduler_table.item(row,3).text()==self._("Yes"))
-                audio_only="audio" in video_type
-                priority=int(self.scheduler_table.item(row,5).text())
-                recurrence=self.scheduler_table.item(row,6).text().lower() if self.scheduler_table.item(row,6).text()!=self._("None") else None
-                task=DownloadTask(url,self.user_profile.get_default_resolution(),self.user_profile.get_download_path(),audio_only,False,subtitles,"mp4",True,priority,recurrence,self.user_profile.get_rate_limit())
-                self.schedule_download(task,row)
-                self.scheduler_table.setItem(row,4,QTableWidgetItem(self._("Started")))
-                if recurrence:
-                    new_time=None
-                    if recurrence=="daily":
-                        new_time=scheduled_time.addDays(1)
-                    elif recurrence=="weekly":
-                        new_time=scheduled_time.addDays(7)
-                    elif recurrence=="monthly":
-                        new_time=scheduled_time.addMonths(1)
-                    if new_time:
-                        self.scheduler_table.setItem(row,0,QTableWidgetItem(new_time.toString("yyyy-MM-dd HH:mm:ss")))
-                        self.scheduler_table.setItem(row,4,QTableWidgetItem(self._("Scheduled")))
-    def schedule_download(self,task,scheduler_row):
-        if not hasattr(self,"queue_table"):
+        windows=self.bandwidth_calendar.windows
+        self.calendar_table.setRowCount(len(windows))
+        for row,window in enumerate(windows):
+            concurrency=self._("Pause") if window.max_concurrent==0 else (self._("Default") if window.max_concurrent is None else str(window.max_concurrent))
+            for col,text in enumerate([window.name,self._(window.days_text()),f"{window.start:%H:%M}",f"{window.end:%H:%M}",window.rate or self._("Unlimited"),concurrency]):
+                self.calendar_table.setItem(row,col,QTableWidgetItem(text))
+        self.apply_bandwidth_calendar()
+    def add_calendar_window_dialog(self):
+        dialog=QDialog(self)
+        dialog.setWindowTitle(self._("Add Bandwidth Window"))
+        dialog.setModal(True)
+        layout=QVBoxLayout(dialog)
+        form=QFormLayout()
+        name_line_edit=QLineEdit()
+        name_line_edit.setPlaceholderText(self._("e.g., Business hours"))
+        day_layout=QHBoxLayout()
+        day_checkboxes=[]
+        for index,day in enumerate(DAY_NAMES):
+            checkbox=QCheckBox(self._(day))
+            checkbox.setChecked(index<5)
+            day_checkboxes.append(checkbox)
+            day_layout.addWidget(checkbox)
+        start_edit=QTimeEdit(QTime(9,0))
+        start_edit.setDisplayFormat("HH:mm")
+        end_edit=QTimeEdit(QTime(18,0))
+        end_edit.setDisplayFormat("HH:mm")
+        rate_line_edit=QLineEdit()
+        rate_line_edit.setPlaceholderText(self._("e.g., 500K, 2M (empty = unlimited)"))
+        concurrency_spin=QSpinBox()
+        concurrency_spin.setRange(-1,10)
+        concurrency_spin.setValue(-1)
+        concurrency_spin.setSpecialValueText(self._("Default"))
+        concurrency_spin.setToolTip(self._("0 pauses downloads during this window."))
+        form.addRow(self._("Name:"),name_line_edit)
+        form.addRow(self._("Days:"),day_layout)
+        form.addRow(self._("Start:"),start_edit)
+        form.addRow(self._("End:"),end_edit)
+        form.addRow(self._("Max Rate:"),rate_line_edit)
+        form.addRow(self._("Max Downloads:"),concurrency_spin)
+        layout.addLayout(form)
+        buttons=QDialogButtonBox(QDialogButtonBox.Ok|QDialogButtonBox.Cancel)
+        layout.addWidget(buttons)
+        buttons.accepted.connect(lambda:self.confirm_calendar_window(dialog,name_line_edit,day_checkboxes,start_edit,end_edit,rate_line_edit,concurrency_spin))
+        buttons.rejected.connect(dialog.reject)
+        dialog.exec_()
+    def confirm_calendar_window(self,dialog,name_line_edit,day_checkboxes,start_edit,end_edit,rate_line_edit,concurrency_spin):
+        days=[index for index,checkbox in enumerate(day_checkboxes) if checkbox.isChecked()]
+        if not days:
+            QMessageBox.warning(dialog,self._("Error"),self._("Select at least one day."))
+            return
+        rate=rate_line_edit.text().strip().upper()
+        if rate and not (rate[-1] in "KMG" and rate[:-1].replace(".","",1).isdigit()):
+            QMessageBox.warning(dialog,self._("Invalid Format"),self._("Please enter rate like '500K', '2M', etc."))
             return
-        queue_row=self.queue_table.rowCount()
-        self.queue_table.insertRow(queue_row)
-        for col,text in enumerate(["Fetching...","Fetching...",task.url,self._("Audio") if task.audio_only else self._("Video"),"Queued"]):
-            self.queue_table.setItem(queue_row,col,QTableWidgetItem(text))
-        self.all_queue_tasks[queue_row]=task
+        if start_edit.time()==end_edit.time():
+            QMessageBox.warning(dialog,self._("Error"),self._("Start and end must differ."))
+            return
+        max_concurrent=None if concurrency_spin.value()<0 else concurrency_spin.value()
+        window=TimeWindow(start_edit.time().toString("HH:mm"),end_edit.time().toString("HH:mm"),days,rate or None,max_concurrent,name_line_edit.text().strip())
+        self.bandwidth_calendar.windows.append(window)
+        self.save_bandwidth_calendar()
+        self.append_log(self._("Bandwidth window added: {window}").format(window=window.describe()))
+        dialog.accept()
+    def remove_calendar_windows(self):
+        rows=set(item.row() for item in self.calendar_table.selectedItems())
+        windows=self.bandwidth_calendar.windows
+        for row in sorted(rows,reverse=True):
+            del windows[row]
+        self.save_bandwidth_calendar()
+    def save_bandwidth_calendar(self):
+        self.user_profile.set_bandwidth_calendar(self.bandwidth_calendar.to_list())
+        self.render_calendar_table()
+    def schedule_download(self,task):
         self.user_profile.add_history_entry("Fetching...","Fetching...",task.url,"Queued")
-        if len(self.active_workers)<self.max_concurrent_downloads:
-            self.run_download_task(task,queue_row)
-            self.queue_table.setItem(queue_row,4,QTableWidgetItem("Starting"))
+        self.submit_task(task,self._("Audio") if task.audio_only else self._("Video"))
+    def submit_task(self,task,type_text=None,hold=False,prefetch=True):
+        task_id=self.download_engine.submit(task,hold,prefetch)
+        self.track_task(task,type_text)
+        return task_id
+    def track_task(self,task,type_text=None):
+        self.download_tasks[task.task_id]=(task.url,None)
+        if task.playlist:
+            self.playlist_parents[task.task_id]=task
+        if type_text is not None:
+            self.add_queue_row(task.task_id,task.url,type_text,"Queued")
+    def restore_queue(self):
+        entries=dict(self.queue_journal.pending("queue"))
+        for task in self.download_engine.restore():
+            self.track_task(task,(self._("Audio") if task.audio_only else self._("Video"))+(" - "+self._("Playlist") if task.playlist else ""))
+            data=entries[task.journal_id]["data"]
+            if "title" in data:
+                self.set_queue_cell(task.task_id,0,data["title"])
+                self.set_queue_cell(task.task_id,1,data.get("channel",""))
     def update_position(self,position):
         if not hasattr(self,"position_slider"):
             return
@@ -350,49 +574,95 @@ class MainWindow(QMainWindow):
         if not (url.startswith("http://") or url.startswith("https://")):
             QMessageBox.warning(self,self._("Input Error"),self._("Invalid URL format."))
             return
-        task=DownloadTask(url,self.user_profile.get_default_resolution(),self.user_profile.get_download_path(),audio,playlist,False,"mp4",False,1,None,self.user_profile.get_rate_limit())
+        task=DownloadTask(url,self.user_profile.get_default_resolution(),self.user_profile.get_download_path(),audio,playlist,False,"mp4",False,1,None,None,None,self.user_profile.get_audio_format())
         self.user_profile.add_history_entry("Fetching...","Fetching...",url,self._("Queued"))
-        self.run_download_task(task,None)
-    def run_download_task(self,task,row):
-        if row is not None and len(self.active_workers)>=self.max_concurrent_downloads:
-            if self.queue_table.item(row,4):
-                self.queue_table.setItem(row,4,QTableWidgetItem("Queued"))
-            return
-        signals=WorkerSignals()
-        signals.progress.connect(self.update_progress_signal.emit)
-        signals.status.connect(self.update_status_signal.emit)
-        signals.log.connect(self.update_log_signal.emit)
-        signals.info.connect(self.update_info_signal.emit)
-        worker=DownloadWorker(task,row,signals)
-        if row is not None:
-            self.active_workers[row]=worker
-        if self.developer_mode or self.verbose_logging:
-            self.append_log(self._("Starting task for URL: {url}").format(url=task.url))
-        self.thread_pool.start(worker)
+        self.submit_task(task,self._("Playlist") if playlist else None)
+        if self.download_engine.state(task.task_id)=="queued":
+            self.append_log(self._("Queued: {url}").format(url=url))
+    def change_audio_format(self,audio_format):
+        self.user_profile.set_audio_format(audio_format)
+        self.append_log(self._("Audio format set to {fmt}.").format(fmt=audio_format))
+    def add_playlist_entry(self,parent_id,task_id,url,title):
+        self.download_tasks[task_id]=(url,parent_id)
+        self.user_profile.add_history_entry(title,"Fetching...",url,self._("Queued"))
+        parent=self.playlist_parents.get(parent_id)
+        if parent is not None and parent_id in self.queue_entries:
+            self.add_queue_row(task_id,url,self._("Audio") if parent.audio_only else self._("Video"),"Queued")
+            self.set_queue_cell(task_id,0,title)
+        self.refresh_playlist_rows()
+    def refresh_playlist_rows(self,rows=None):
+        for parent_id,text in self.download_engine.playlist_status(rows).items():
+            self.set_queue_cell(parent_id,4,text)
+    def finish_playlist(self,parent_id,status):
+        self.playlist_parents.pop(parent_id,None)
+        url,_=self.download_tasks.pop(parent_id,(None,None))
+        if url is not None:
+            self.user_profile.set_history_status(url,status)
+        self.append_log(self._("Playlist finished: {status}").format(status=status))
+        self.notify_status(status)
     def start_queue(self):
-        if not hasattr(self,"queue_table"):
+        self.download_engine.start_queue()
+    def flush_progress(self):
+        snapshot=self.download_engine.progress.snapshot()
+        if snapshot is None or not snapshot.active:
             return
-        for row in range(self.queue_table.rowCount()):
-            status_item=self.queue_table.item(row,4)
-            if status_item and status_item.text()=="Queued":
-                if len(self.active_workers)<self.max_concurrent_downloads:
-                    self.run_download_task(self.all_queue_tasks[row],row)
-                    self.queue_table.setItem(row,4,QTableWidgetItem("Starting"))
-    def update_progress(self,row,percent,speed,eta):
-        if row is not None and hasattr(self,"queue_table"):
-            if row<self.queue_table.rowCount():
-                self.queue_table.setItem(row,4,QTableWidgetItem(f"{int(percent)}%"))
-        self.progress_bar.setValue(int(percent))
-        self.progress_bar.setFormat(f"{int(percent)}%")
-        speed_kb=speed/1024 if speed else 0
-        self.status_label.setText(self._("Downloading...")+f" {percent:.2f}% - {speed_kb:.2f} KB/s - ETA: {eta}s")
-    def update_status(self,row,status):
+        for task_id,percent in snapshot.rows.items():
+            self.set_queue_cell(task_id,4,f"{int(percent)}%")
+        self.refresh_playlist_rows(snapshot.rows)
+        self.progress_bar.setValue(int(snapshot.percent))
+        self.progress_bar.setFormat(f"{int(snapshot.percent)}%")
+        speed_kb=snapshot.speed/1024
+        self.status_label.setText(self._("Downloading {count}:").format(count=snapshot.active)+f" {snapshot.percent:.2f}% - {speed_kb:.2f} KB/s - ETA: {snapshot.eta}s")
+    def update_status(self,task_id,status):
         self.status_label.setText(status)
-        if row is not None and hasattr(self,"queue_table"):
-            if row<self.queue_table.rowCount():
-                item=self.queue_table.item(row,4)
-                if item:
-                    item.setText(status)
+        self.set_queue_cell(task_id,4,status)
+        if task_id in self.playlist_parents:
+            if status.startswith("Playlist Completed") or status in ("Playlist Error","Playlist Cancelled"):
+                self.finish_playlist(task_id,status)
+            elif status=="Playlist Enumerated":
+                self.refresh_playlist_rows()
+            return
+        if not any(x in status for x in ["Error","Completed","Cancelled","Already Downloaded","Invalid URL"]) or task_id not in self.download_tasks:
+            return
+        url,parent_id=self.download_tasks.pop(task_id)
+        self.user_profile.set_history_status(url,status)
+        self.update_archive_label()
+        if parent_id is not None:
+            self.refresh_playlist_rows()
+            return
+        self.notify_status(status)
+    def record_metrics(self,task_id,metrics):
+        self.telemetry_stats.add(metrics)
+        self.user_profile.set_history_metrics(metrics["url"],metrics)
+        self.set_queue_cell(task_id,5,describe_metrics(metrics))
+        self.append_log(self._("Metrics for {url}: {metrics}").format(url=metrics["url"],metrics=describe_metrics(metrics)),logging.DEBUG)
+        if 10 in self.built_pages:
+            self.render_stats_page()
+    def render_stats_page(self):
+        if not hasattr(self,"stats_timings_table"):
+            return
+        summary=self.telemetry_stats.summary()
+        statuses=", ".join(f"{self._(status)}: {count}" for status,count in sorted(summary["statuses"].items()))
+        self.stats_summary_label.setText(self._("{count} downloads ({statuses}). {size:.1f} MB at {mean:.2f} MB/s mean, {peak:.2f} MB/s peak. {retries} retries, {hits} metadata cache hits.").format(count=summary["downloads"],statuses=statuses or self._("none yet"),size=summary["bytes"]/1024**2,mean=summary["mean_throughput"]/1024**2,peak=summary["peak_throughput"]/1024**2,retries=summary["retries"],hits=summary["cache_hits"]))
+        labels={"queue_wait":self._("Queue wait"),"extract":self._("Info extraction"),"first_byte":self._("Time to first byte"),"seconds":self._("Transfer"),"merge":self._("Merge"),"postprocess":self._("Postprocess"),"total":self._("Total")}
+        self.stats_timings_table.setRowCount(len(labels))
+        for row,(field,label) in enumerate(labels.items()):
+            timing=summary["timings"][field]
+            for col,text in enumerate([label,f"{timing['p50']:.2f}",f"{timing['p95']:.2f}",str(timing["count"])]):
+                self.stats_timings_table.setItem(row,col,QTableWidgetItem(text))
+        workers=summary["worker_throughput"]
+        self.stats_workers_table.setRowCount(len(workers))
+        for row,(worker,rate) in enumerate(workers.items()):
+            self.stats_workers_table.setItem(row,0,QTableWidgetItem(worker))
+            self.stats_workers_table.setItem(row,1,QTableWidgetItem(f"{rate/1024**2:.2f}"))
+        self.stats_export_label.setText(self._("Exported every {seconds} s to {json} and {prom}").format(seconds=self.metrics_timer.interval()//1000,json=self.metrics_path,prom=self.prometheus_path))
+    def export_metrics(self,force=False):
+        try:
+            if self.telemetry_stats.write(self.metrics_path,self.prometheus_path,force) and force:
+                self.append_log(self._("Metrics exported to {path}").format(path=self.metrics_path))
+        except OSError as e:
+            self.append_log(self._("Failed to export metrics: {error}").format(error=str(e)),logging.ERROR)
+    def notify_status(self,status):
         if "Error" in status:
             QMessageBox.critical(self,self._("Error"),status)
             self.tray_icon.showMessage(self._("Error"),status,QSystemTrayIcon.Information,3000)
@@ -400,32 +670,16 @@ class MainWindow(QMainWindow):
             self.tray_icon.showMessage(self._("Download Completed"),self._("Download finished successfully."),QSystemTrayIcon.Information,3000)
             if QMessageBox.question(self,self._("Download Completed"),self._("Download finished. Open download folder?"),QMessageBox.Yes|QMessageBox.No)==QMessageBox.Yes:
                 open_download_path(self.user_profile.get_download_path())
-        if row is not None and row in self.active_workers:
-            if any(x in status for x in ["Error","Completed","Cancelled"]):
-                del self.active_workers[row]
-                self.start_next_task()
-    def start_next_task(self):
-        if not hasattr(self,"queue_table"):
-            return
-        for row in range(self.queue_table.rowCount()):
-            status_item=self.queue_table.item(row,4)
-            if status_item and status_item.text()=="Queued":
-                if len(self.active_workers)<self.max_concurrent_downloads:
-                    self.run_download_task(self.all_queue_tasks[row],row)
-                    self.queue_table.setItem(row,4,QTableWidgetItem("Starting"))
-                else:
-                    break
     def pause_all_downloads(self):
-        for worker in self.active_workers.values():
-            worker.pause_download()
+        self.download_engine.pause_all()
     def resume_all_downloads(self):
-        for worker in self.active_workers.values():
-            worker.resume_download()
+        self.download_engine.resume_all()
     def cancel_all_downloads(self):
-        for worker in list(self.active_workers.values()):
-            worker.cancel_download()
+        self.download_engine.cancel_all()
     def set_max_concurrent_downloads(self,index):
         self.max_concurrent_downloads=int(self.concurrent_combo.currentText())
+        self.download_engine.set_max_concurrent(self.max_concurrent_downloads)
+        self.apply_bandwidth_calendar()
         self.append_log(self._("Max concurrent downloads set to {val}").format(val=self.concurrent_combo.currentText()))
     def apply_theme_settings(self):
         new_theme=self.theme_combo.currentText()
@@ -452,12 +706,30 @@ class MainWindow(QMainWindow):
                 QMessageBox.warning(self,self._("Invalid Format"),self._("Please enter rate like '500K', '2M', etc."))
                 return
             self.user_profile.set_rate_limit(rate)
+            self.download_engine.set_total_rate(rate)
+            self.apply_bandwidth_calendar()
             self.append_log(self._("Download speed limit set to {rate}").format(rate=rate))
+            self.append_log(self._("Bandwidth shared across {count} active downloads").format(count=len(self.download_engine.bandwidth.rates())))
             QMessageBox.information(self,self._("Rate Limit"),self._("Download speed limited to {rate}").format(rate=rate))
         else:
             self.user_profile.set_rate_limit(None)
+            self.download_engine.set_total_rate(None)
+            self.apply_bandwidth_calendar()
             self.append_log(self._("Download speed limit removed."))
             QMessageBox.information(self,self._("Rate Limit"),self._("Download speed limit removed."))
+    def acceleration_defaults(self):
+        return AccelerationSettings.from_dict(self.user_profile.get_acceleration())
+    def apply_acceleration_settings(self):
+        chunk_size=self.chunk_size_line_edit.text().strip().upper()
+        if chunk_size and not (chunk_size[-1] in "KMG" and chunk_size[:-1].replace(".","",1).isdigit()):
+            QMessageBox.warning(self,self._("Invalid Format"),self._("Please enter chunk size like '10M'."))
+            return
+        acceleration=AccelerationSettings(int(self.fragments_combo.currentText()),chunk_size or None,self.external_downloader_combo.currentData())
+        self.user_profile.set_acceleration(acceleration.to_dict())
+        self.download_engine.acceleration=acceleration
+        self.append_log(self._("Download acceleration set to {settings}").format(settings=acceleration.describe()))
+        if acceleration.external_downloader and not acceleration.external_available():
+            QMessageBox.warning(self,self._("Download Acceleration"),self._("{name} is not installed; the built-in downloader will be used.").format(name=acceleration.external_downloader))
     def apply_language_settings(self):
         selected_lang=self.language_combo.currentText()
         language_code="tr" if selected_lang=="Türkçe" else "en"
@@ -546,18 +818,22 @@ class MainWindow(QMainWindow):
         subtitles_checkbox=QCheckBox(self._("Download Subtitles"))
         format_combo=QComboBox()
         format_combo.addItems(["mp4","mkv","webm","flv","avi"])
+        fragments_combo=QComboBox()
+        fragments_combo.addItems(["1","2","4","8","16"])
+        fragments_combo.setCurrentText(str(self.acceleration_defaults().concurrent_fragments))
         form.addRow(self._("URL:"),url_line_edit)
         form.addRow(audio_checkbox)
         form.addRow(playlist_checkbox)
         form.addRow(self._("Format:"),format_combo)
+        form.addRow(self._("Concurrent Fragments:"),fragments_combo)
         form.addRow(subtitles_checkbox)
         layout.addLayout(form)
         buttons=QDialogButtonBox(QDialogButtonBox.Ok|QDialogButtonBox.Cancel)
         layout.addWidget(buttons)
-        buttons.accepted.connect(lambda:self.confirm_queue(dialog,url_line_edit,audio_checkbox,playlist_checkbox,subtitles_checkbox,format_combo))
+        buttons.accepted.connect(lambda:self.confirm_queue(dialog,url_line_edit,audio_checkbox,playlist_checkbox,subtitles_checkbox,format_combo,fragments_combo))
         buttons.rejected.connect(dialog.reject)
         dialog.exec_()
-    def confirm_queue(self,dialog,url_line_edit,audio_checkbox,playlist_checkbox,subtitles_checkbox,format_combo):
+    def confirm_queue(self,dialog,url_line_edit,audio_checkbox,playlist_checkbox,subtitles_checkbox,format_combo,fragments_combo):
         url=url_line_edit.text().strip()
         if not url:
             QMessageBox.warning(dialog,self._("Error"),self._("No URL provided."))
@@ -566,17 +842,117 @@ class MainWindow(QMainWindow):
         playlist=playlist_checkbox.isChecked()
         subs=subtitles_checkbox.isChecked()
         output_format=format_combo.currentText()
-        row=self.queue_table.rowCount()
-        self.queue_table.insertRow(row)
-        for col,text in enumerate(["Fetching...","Fetching...",url,(self._("Audio") if audio_only else self._("Video"))+(" - "+self._("Playlist") if playlist else ""),"Queued"]):
-            self.queue_table.setItem(row,col,QTableWidgetItem(text))
-        task=DownloadTask(url,self.user_profile.get_default_resolution(),self.user_profile.get_download_path(),audio_only,playlist,subs,output_format,True,1,None,self.user_profile.get_rate_limit())
-        self.all_queue_tasks[row]=task
+        acceleration=self.acceleration_defaults()
+        acceleration.concurrent_fragments=int(fragments_combo.currentText())
+        task=DownloadTask(url,self.user_profile.get_default_resolution(),self.user_profile.get_download_path(),audio_only,playlist,subs,output_format,True,1,None,None,acceleration,self.user_profile.get_audio_format())
+        self.submit_task(task,(self._("Audio") if audio_only else self._("Video"))+(" - "+self._("Playlist") if playlist else ""),hold=True)
         self.user_profile.add_history_entry("Fetching...","Fetching...",url,self._("Queued"))
         dialog.accept()
+    def import_urls_dialog(self):
+        if self.url_import is not None:
+            QMessageBox.information(self,self._("Import URLs"),self._("An import is already running."))
+            return
+        dialog=QDialog(self)
+        dialog.setWindowTitle(self._("Import URLs"))
+        dialog.setModal(True)
+        layout=QVBoxLayout(dialog)
+        form=QFormLayout()
+        path_line_edit=QLineEdit()
+        browse_button=QPushButton(self._("Browse..."))
+        browse_button.clicked.connect(lambda:path_line_edit.setText(QFileDialog.getOpenFileName(dialog,self._("Select URL List"),"",self._("URL lists (*.txt *.csv);;All Files (*)"))[0] or path_line_edit.text()))
+        path_layout=QHBoxLayout()
+        path_layout.addWidget(path_line_edit)
+        path_layout.addWidget(browse_button)
+        audio_checkbox=QCheckBox(self._("Audio Only"))
+        format_combo=QComboBox()
+        format_combo.addItems(["mp4","mkv","webm","flv","avi"])
+        validate_checkbox=QCheckBox(self._("Check metadata in the background"))
+        validate_checkbox.setChecked(True)
+        form.addRow(self._("File:"),path_layout)
+        form.addRow(audio_checkbox)
+        form.addRow(self._("Format:"),format_combo)
+        form.addRow(validate_checkbox)
+        layout.addLayout(form)
+        buttons=QDialogButtonBox(QDialogButtonBox.Ok|QDialogButtonBox.Cancel)
+        layout.addWidget(buttons)
+        buttons.accepted.connect(lambda:self.confirm_url_import(dialog,path_line_edit,audio_checkbox,format_combo,validate_checkbox))
+        buttons.rejected.connect(dialog.reject)
+        dialog.exec_()
+    def confirm_url_import(self,dialog,path_line_edit,audio_checkbox,format_combo,validate_checkbox):
+        path=path_line_edit.text().strip()
+        if not path or not os.path.isfile(path):
+            QMessageBox.warning(dialog,self._("Error"),self._("Select a text or CSV file with one URL per line."))
+            return
+        dialog.accept()
+        self.start_url_import(path,audio_checkbox.isChecked(),format_combo.currentText(),validate_checkbox.isChecked())
+    def start_url_import(self,path,audio_only=False,output_format="mp4",validate=True):
+        self.url_import={"path":path,"audio_only":audio_only,"output_format":output_format,"validate":validate,"pending":set(),"rejected":0,"result":None}
+        known_keys={url_key(task.url) for task in self.download_engine.tasks()}
+        history=self.user_profile.history
+        self.status_label.setText(self._("Importing URLs from {file}...").format(file=os.path.basename(path)))
+        threading.Thread(target=lambda:self.import_ready_signal.emit(scan_import_file(path,history,known_keys)),name="url-import",daemon=True).start()
+    def finish_url_import(self,result):
+        state=self.url_import
+        if state is None:
+            return
+        state["result"]=result
+        if result.error:
+            self.url_import=None
+            self.status_label.setText(self._("Import failed"))
+            QMessageBox.warning(self,self._("Import URLs"),result.error)
+            return
+        type_text=self._("Audio") if state["audio_only"] else self._("Video")
+        tasks=[]
+        for url in result.accepted:
+            task=DownloadTask(url,self.user_profile.get_default_resolution(),self.user_profile.get_download_path(),state["audio_only"],False,False,state["output_format"],True,1,None,None,self.acceleration_defaults(),self.user_profile.get_audio_format())
+            tasks.append(task)
+        for task,key in zip(tasks,self.queue_journal.add_many([task.to_dict() for task in tasks],"queue","held")):
+            task.journal_id=key
+        self.user_profile.add_history_entries([{"title":"Fetching...","channel":"Fetching...","url":task.url,"status":self._("Queued")} for task in tasks])
+        if hasattr(self,"queue_table"):
+            self.queue_table.setUpdatesEnabled(False)
+        for task in tasks:
+            self.submit_task(task,type_text,hold=True,prefetch=not state["validate"])
+        if hasattr(self,"queue_table"):
+            self.queue_table.setUpdatesEnabled(True)
+        self.append_log(self._("Imported {accepted} URLs from {file}, skipped {duplicates} duplicates and {invalid} invalid lines.").format(accepted=len(tasks),file=os.path.basename(result.path),duplicates=result.duplicate_count,invalid=result.invalid_count))
+        for line_number,text in result.invalid:
+            self.append_log(self._("Line {line}: not a URL: {text}").format(line=line_number,text=text),logging.WARNING)
+        if state["validate"] and tasks:
+            if self.url_validator is None:
+                self.url_validator=MetadataValidator(SignalListener(self.validation_signals),self.metadata_cache)
+            state["pending"].update(task.task_id for task in tasks)
+            self.status_label.setText(self._("Checking {count} imported URLs...").format(count=len(tasks)))
+            self.url_validator.submit_many([(task.task_id,task.url) for task in tasks])
+        else:
+            self.show_import_summary()
+    def update_validation_status(self,task_id,status):
+        state=self.url_import
+        if status=="Invalid URL" and self.download_engine.cancel(task_id,status) and state is not None and task_id in state["pending"]:
+            state["rejected"]+=1
+        if state is not None and task_id in state["pending"]:
+            state["pending"].discard(task_id)
+            if not state["pending"]:
+                self.show_import_summary()
+    def show_import_summary(self):
+        state=self.url_import
+        self.url_import=None
+        result=state["result"]
+        accepted=len(result.accepted)-state["rejected"]
+        lines=[self._("{count} URLs added to the queue.").format(count=accepted)]
+        if result.duplicate_count:
+            lines.append(self._("{count} duplicates skipped: {file} repeated in the file, {queue} already queued, {history} already in history.").format(count=result.duplicate_count,file=result.duplicates["file"],queue=result.duplicates["queue"],history=result.duplicates["history"]))
+        if result.invalid_count:
+            lines.append(self._("{count} lines are not valid URLs.").format(count=result.invalid_count))
+        if state["rejected"]:
+            lines.append(self._("{count} URLs failed the metadata check and were removed from the queue.").format(count=state["rejected"]))
+        self.status_label.setText(self._("Import finished"))
+        QMessageBox.information(self,self._("Import URLs"),"\n".join(lines))
     def restart_application(self):
         self.append_log(self._("Restarting application..."))
         QMessageBox.information(self,self._("Restart"),self._("The application will now restart."))
+        self.user_profile.flush()
+        self.log_buffer.close()
         python_executable=sys.executable
         os.execl(python_executable,python_executable,*sys.argv)
     def toggle_developer_mode(self,state):
@@ -585,20 +961,17 @@ class MainWindow(QMainWindow):
             self.append_log(self._("Developer Mode Enabled"))
         else:
             self.append_log(self._("Developer Mode Disabled"))
+        self.refresh_log_view()
     def check_for_updates(self):
         self.append_log(self._("Checking for updates..."))
         QTimer.singleShot(2000,lambda:QMessageBox.information(self,self._("Update Check"),self._("No updates available. You are running the latest version.")))
     def retry_failed_downloads(self):
         count=0
-        if hasattr(self,"history_table"):
-            for row in range(self.history_table.rowCount()):
-                status_item=self.history_table.item(row,3)
-                if status_item and "Error" in status_item.text():
-                    url=self.history_table.item(row,2).text()
-                    task=DownloadTask(url,self.user_profile.get_default_resolution(),self.user_profile.get_download_path(),False,False,False,"mp4",False,1,None,self.user_profile.get_rate_limit())
-                    self.user_profile.add_history_entry("Fetching...","Fetching...",url,self._("Queued"))
-                    self.run_download_task(task,None)
-                    count+=1
+        for entry in self.user_profile.history.entries_with_status_like("%Error%"):
+            task=DownloadTask(entry["url"],self.user_profile.get_default_resolution(),self.user_profile.get_download_path(),False,False,False,"mp4",False,1,None,None)
+            self.user_profile.add_history_entry("Fetching...","Fetching...",entry["url"],self._("Queued"))
+            self.submit_task(task)
+            count+=1
         self.append_log(self._("{count} failed downloads retried.").format(count=count))
     def extract_thumbnail(self):
         if not hasattr(self,"thumbnail_url_line_edit"):
@@ -607,52 +980,114 @@ class MainWindow(QMainWindow):
         if not url:
             QMessageBox.warning(self,self._("Error"),self._("Please enter a video URL."))
             return
-        try:
-            from yt_dlp import YoutubeDL
-            options={"quiet":True,"skip_download":True,"cookiefile":"youtube_cookies.txt"}
-            with YoutubeDL(options) as ydl:
-                info=ydl.extract_info(url,download=False)
-                thumb_url=info.get("thumbnail")
-                if not thumb_url:
-                    QMessageBox.warning(self,self._("Error"),self._("No thumbnail found for this video."))
-                    return
-                self.append_log(self._("Thumbnail URL found: {url}").format(url=thumb_url))
-                with requests.Session() as sess:
-                    response=sess.get(thumb_url)
-                    if response.status_code==200:
-                        img=response.content
-                        pixmap=QPixmap()
-                        pixmap.loadFromData(img)
-                        pixmap=pixmap.scaled(self.thumbnail_label.size(),Qt.KeepAspectRatio,Qt.SmoothTransformation)
-                        self.thumbnail_label.setPixmap(pixmap)
-                        self.append_log(self._("Thumbnail extracted successfully."))
-                    else:
-                        QMessageBox.warning(self,self._("Error"),self._("Failed to download thumbnail image."))
-        except Exception as e:
-            QMessageBox.critical(self,self._("Error"),str(e))
-            self.append_log(self._("Error extracting thumbnail: {error}").format(error=str(e)))
+        self.thumbnail_request=url
+        pixmap=self.thumbnail_loader.pixmap(url,self.thumbnail_label.size(),extract=True)
+        if pixmap is not None:
+            self.thumbnail_label.setPixmap(pixmap)
+            self.append_log(self._("Thumbnail loaded from memory cache."),logging.DEBUG)
+        else:
+            self.append_log(self._("Fetching thumbnail in the background: {url}").format(url=url),logging.DEBUG)
+    def show_thumbnail(self,url,size):
+        if url==self.thumbnail_request and hasattr(self,"thumbnail_label") and size==self.thumbnail_label.size():
+            self.thumbnail_label.setPixmap(self.thumbnail_loader.pixmap(url,size))
+            self.append_log(self._("Thumbnail extracted successfully ({stats}).").format(stats=self.thumbnail_service.cache.stats_text()))
+        self.schedule_queue_thumbnails()
+    def thumbnail_failed(self,url,error):
+        if url==self.thumbnail_request:
+            self.thumbnail_request=None
+            QMessageBox.warning(self,self._("Error"),error)
+            self.append_log(self._("Error extracting thumbnail: {error}").format(error=error),logging.ERROR)
+    def schedule_queue_thumbnails(self,*args):
+        if hasattr(self,"queue_table") and not self.queue_thumbnail_timer.isActive():
+            self.queue_thumbnail_timer.start()
+    def request_queue_thumbnails(self):
+        if not hasattr(self,"queue_table") or self.stack_pages.currentWidget() is not self.built_pages.get(6):
+            return
+        first=self.queue_table.rowAt(0)
+        if first<0:
+            return
+        last=self.queue_table.rowAt(self.queue_table.viewport().height()-1)
+        if last<0:
+            last=self.queue_table.rowCount()-1
+        for row in range(first,last+1):
+            title_item=self.queue_table.item(row,0)
+            url_item=self.queue_table.item(row,2)
+            if title_item is None or url_item is None:
+                continue
+            pixmap=self.thumbnail_loader.pixmap(url_item.text(),ROW_THUMBNAIL_SIZE)
+            if pixmap is not None:
+                title_item.setIcon(QIcon(pixmap))
     def convert_file(self):
-        if not hasattr(self,"converter_input_line_edit") or not hasattr(self,"converter_target_format_line_edit"):
+        if not hasattr(self,"converter_input_line_edit"):
             return
         input_path=self.converter_input_line_edit.text().strip()
-        target_format=self.converter_target_format_line_edit.text().strip().lower()
-        if not input_path or not target_format:
-            QMessageBox.warning(self,self._("Error"),self._("Please provide both file path and target format."))
-            return
-        if target_format not in ["mp4","mp3","mkv"]:
-            QMessageBox.warning(self,self._("Error"),self._("Supported target formats: mp4, mp3, mkv."))
+        if not input_path:
+            QMessageBox.warning(self,self._("Error"),self._("Please provide a file or folder to convert."))
             return
-        output_path=os.path.splitext(input_path)[0]+"."+target_format
+        self.start_conversions([input_path])
+    def add_conversion_files(self):
+        paths,_=QFileDialog.getOpenFileNames(self,self._("Select Files to Convert"))
+        if paths:
+            self.start_conversions(paths)
+    def add_conversion_folder(self):
+        folder=QFileDialog.getExistingDirectory(self,self._("Select Folder to Convert"))
+        if folder:
+            self.start_conversions([folder])
+    def start_conversions(self,paths):
         if not self.ffmpeg_found:
             QMessageBox.critical(self,self._("Error"),self._("FFmpeg not found."))
+            return []
+        target_format=self.converter_target_format_combo.currentText()
+        jobs=self.batch_converter.submit_many(paths,target_format)
+        if not jobs:
+            QMessageBox.warning(self,self._("Error"),self._("No media files found to convert."))
+            return []
+        for job in jobs:
+            row=self.converter_table.rowCount()
+            self.converter_table.insertRow(row)
+            for col,text in enumerate([job.input_path,target_format,job.status,""]):
+                self.converter_table.setItem(row,col,QTableWidgetItem(text))
+            self.conversion_rows[job.job_id]=row
+        self.append_log(self._("Queued {count} conversions to {fmt} on {workers} workers.").format(count=len(jobs),fmt=target_format,workers=self.batch_converter.max_workers))
+        return jobs
+    def set_conversion_cell(self,job_id,column,text):
+        row=self.conversion_rows.get(job_id)
+        if row is None or not hasattr(self,"converter_table"):
             return
-        cmd=["ffmpeg","-i",input_path,output_path]
-        try:
-            subprocess.run(cmd,check=True)
-            self.append_log(self._("Converted file {file} to format {fmt}.").format(file=input_path,fmt=target_format))
-            QMessageBox.information(self,self._("Conversion"),self._("File converted successfully to {fmt}").format(fmt=target_format))
-        except Exception as e:
-            QMessageBox.critical(self,self._("Error"),str(e))
-            self.append_log(self._("Conversion error: {error}").format(error=str(e)))
+        item=self.converter_table.item(row,column)
+        if item is not None:
+            item.setText(text)
+    def update_conversion_status(self,job_id,status):
+        self.set_conversion_cell(job_id,2,status)
+        if status in FINISHED_STATUSES:
+            self.set_conversion_cell(job_id,3,"")
+            if not self.batch_converter.active_count():
+                self.tray_icon.showMessage(self._("Conversion"),self._("All conversions finished."),QSystemTrayIcon.Information,3000)
+    def update_conversion_progress(self,job_id,percent,speed,eta):
+        self.set_conversion_cell(job_id,2,f"{percent:.1f}% ({speed:.1f}x)")
+        self.set_conversion_cell(job_id,3,format_time(eta*1000) if eta>=0 else "")
+    def cancel_selected_conversions(self):
+        rows={index.row() for index in self.converter_table.selectionModel().selectedRows()}
+        for job_id,row in self.conversion_rows.items():
+            if row in rows:
+                self.batch_converter.cancel(job_id)
+    def cancel_all_conversions(self):
+        count=self.batch_converter.cancel_all()
+        if count:
+            self.append_log(self._("Cancelling {count} conversions.").format(count=count))
+    def closeEvent(self,event):
+        self.export_metrics()
+        self.download_engine.suspend()
+        self.user_profile.close()
+        self.metadata_cache.close()
+        self.queue_journal.close()
+        self.download_archive.close()
+        self.thumbnail_service.close()
+        self.batch_converter.shutdown()
+        self.metadata_prefetcher.shutdown()
+        if self.url_validator is not None:
+            self.url_validator.shutdown()
+        self.log_buffer.close()
+        super().closeEvent(event)
     def _(self,text):
         return gettext.gettext(text)
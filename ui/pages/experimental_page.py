@@ -1,6 +1,7 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QCheckBox, QGroupBox, QPushButton, QLineEdit
+from PyQt5.QtWidgets import QComboBox, QHBoxLayout, QHeaderView, QTableWidget
 from PyQt5.QtGui import QPixmap
-import requests
+from core.converter import CONVERT_FORMATS
 
 def create_experimental_page(main_window):
     page=QWidget()
@@ -38,14 +39,37 @@ def create_experimental_page(main_window):
     converter_group=QGroupBox(main_window._("Format Converter"))
     converter_layout=QVBoxLayout(converter_group)
     main_window.converter_input_line_edit=QLineEdit()
-    main_window.converter_input_line_edit.setPlaceholderText(main_window._("Enter file path to convert"))
-    main_window.converter_target_format_line_edit=QLineEdit()
-    main_window.converter_target_format_line_edit.setPlaceholderText(main_window._("Enter target format (mp4, mp3, mkv)"))
-    converter_button=QPushButton(main_window._("Convert File"))
+    main_window.converter_input_line_edit.setPlaceholderText(main_window._("Enter a file or folder path to convert"))
+    main_window.converter_target_format_combo=QComboBox()
+    main_window.converter_target_format_combo.addItems(list(CONVERT_FORMATS))
+    input_layout=QHBoxLayout()
+    input_layout.addWidget(main_window.converter_input_line_edit)
+    input_layout.addWidget(main_window.converter_target_format_combo)
+    main_window.converter_table=QTableWidget()
+    main_window.converter_table.setColumnCount(4)
+    main_window.converter_table.setHorizontalHeaderLabels([main_window._("File"),main_window._("Format"),main_window._("Progress"),main_window._("ETA")])
+    main_window.converter_table.setSelectionBehavior(QTableWidget.SelectRows)
+    header=main_window.converter_table.horizontalHeader()
+    header.setSectionResizeMode(0,QHeaderView.Stretch)
+    header.setSectionResizeMode(1,QHeaderView.ResizeToContents)
+    header.setSectionResizeMode(2,QHeaderView.Stretch)
+    header.setSectionResizeMode(3,QHeaderView.ResizeToContents)
+    converter_button=QPushButton(main_window._("Convert"))
     converter_button.clicked.connect(main_window.convert_file)
-    converter_layout.addWidget(main_window.converter_input_line_edit)
-    converter_layout.addWidget(main_window.converter_target_format_line_edit)
-    converter_layout.addWidget(converter_button)
+    add_files_button=QPushButton(main_window._("Add Files..."))
+    add_files_button.clicked.connect(main_window.add_conversion_files)
+    add_folder_button=QPushButton(main_window._("Add Folder..."))
+    add_folder_button.clicked.connect(main_window.add_conversion_folder)
+    cancel_selected_button=QPushButton(main_window._("Cancel Selected"))
+    cancel_selected_button.clicked.connect(main_window.cancel_selected_conversions)
+    cancel_all_button=QPushButton(main_window._("Cancel All"))
+    cancel_all_button.clicked.connect(main_window.cancel_all_conversions)
+    button_layout=QHBoxLayout()
+    for btn in [converter_button,add_files_button,add_folder_button,cancel_selected_button,cancel_all_button]:
+        button_layout.addWidget(btn)
+    converter_layout.addLayout(input_layout)
+    converter_layout.addLayout(button_layout)
+    converter_layout.addWidget(main_window.converter_table)
     layout.addWidget(converter_group)
     layout.addStretch()
     return page
@@ -1,14 +1,20 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QTableWidget, QHBoxLayout, QPushButton, QCheckBox, QLineEdit
-from PyQt5.QtWidgets import QTableWidgetItem, QHeaderView
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QTableView, QHBoxLayout, QPushButton, QCheckBox, QLineEdit
+from PyQt5.QtWidgets import QHeaderView, QAbstractItemView
+from ui.history_model import HistoryTableModel
+from ui.thumbnails import ROW_THUMBNAIL_SIZE
 
 def create_history_page(main_window):
     page=QWidget()
     layout=QVBoxLayout(page)
     label=QLabel(main_window._("Download History"))
     layout.addWidget(label)
-    main_window.history_table=QTableWidget()
-    main_window.history_table.setColumnCount(4)
-    main_window.history_table.setHorizontalHeaderLabels([main_window._("Title"),main_window._("Channel"),main_window._("URL"),main_window._("Status")])
+    main_window.history_model=HistoryTableModel(main_window.user_profile.history,[main_window._("Title"),main_window._("Channel"),main_window._("URL"),main_window._("Status")])
+    main_window.history_table=QTableView()
+    main_window.history_model.set_thumbnails(main_window.thumbnail_loader,ROW_THUMBNAIL_SIZE)
+    main_window.history_table.setModel(main_window.history_model)
+    main_window.history_table.setIconSize(ROW_THUMBNAIL_SIZE)
+    main_window.history_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+    main_window.history_table.verticalHeader().setDefaultSectionSize(24)
     header=main_window.history_table.horizontalHeader()
     header.setSectionResizeMode(0,QHeaderView.Stretch)
     header.setSectionResizeMode(1,QHeaderView.ResizeToContents)
@@ -29,10 +35,23 @@ def create_history_page(main_window):
     search_layout=QHBoxLayout()
     main_window.history_search_line_edit=QLineEdit()
     main_window.history_search_line_edit.setPlaceholderText(main_window._("Search in history..."))
+    main_window.history_search_line_edit.textChanged.connect(main_window.schedule_history_search)
     search_button=QPushButton(main_window._("Search"))
     search_button.clicked.connect(main_window.search_history)
     search_layout.addWidget(main_window.history_search_line_edit)
     search_layout.addWidget(search_button)
     layout.addLayout(search_layout)
+    archive_layout=QHBoxLayout()
+    archive_toggle=QCheckBox(main_window._("Skip Videos Already Downloaded"))
+    archive_toggle.setChecked(main_window.user_profile.is_archive_enabled())
+    archive_toggle.stateChanged.connect(main_window.toggle_download_archive)
+    main_window.archive_count_label=QLabel()
+    import_button=QPushButton(main_window._("Import History into Archive"))
+    import_button.clicked.connect(main_window.import_history_into_archive)
+    archive_layout.addWidget(archive_toggle)
+    archive_layout.addWidget(main_window.archive_count_label)
+    archive_layout.addWidget(import_button)
+    layout.addLayout(archive_layout)
+    main_window.update_archive_label()
     layout.addStretch()
     return page
@@ -1,4 +1,5 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QHBoxLayout, QPushButton
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QHBoxLayout, QPushButton, QComboBox
+from core.engine import AUDIO_FORMATS
 from ui.widgets import DragAndDropLineEdit
 
 def create_mp3_page(main_window):
@@ -8,6 +9,16 @@ def create_mp3_page(main_window):
     layout.addWidget(label)
     mp3_url_line_edit=DragAndDropLineEdit(main_window._("Paste or drag a link here..."))
     layout.addWidget(mp3_url_line_edit)
+    format_layout=QHBoxLayout()
+    format_layout.addWidget(QLabel(main_window._("Audio Format:")))
+    audio_format_combo=QComboBox()
+    audio_format_combo.addItems(list(AUDIO_FORMATS))
+    audio_format_combo.setCurrentText(main_window.user_profile.get_audio_format())
+    audio_format_combo.setToolTip(main_window._("m4a, opus and best keep the original audio stream without re-encoding when it already matches"))
+    audio_format_combo.currentTextChanged.connect(main_window.change_audio_format)
+    format_layout.addWidget(audio_format_combo)
+    format_layout.addStretch()
+    layout.addLayout(format_layout)
     button_layout=QHBoxLayout()
     download_single=QPushButton(main_window._("Download Single MP3"))
     download_single.clicked.connect(lambda:main_window.start_download(mp3_url_line_edit,True,False))
@@ -1,6 +1,6 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QTableWidget, QHBoxLayout, QPushButton
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QTableWidget, QHBoxLayout, QPushButton, QGroupBox
 from PyQt5.QtWidgets import QTableWidgetItem, QHeaderView, QDialog, QDialogButtonBox, QFormLayout, QComboBox, QCheckBox
-from PyQt5.QtCore import QTimer, QDateTime
+from PyQt5.QtCore import QDateTime
 from ui.widgets import DragAndDropLineEdit
 
 def create_scheduler_page(main_window):
@@ -23,8 +23,25 @@ def create_scheduler_page(main_window):
     button_layout.addWidget(add_scheduler_button)
     button_layout.addWidget(remove_scheduler_button)
     layout.addLayout(button_layout)
-    main_window.scheduler_timer=QTimer()
-    main_window.scheduler_timer.timeout.connect(main_window.check_scheduler_downloads)
-    main_window.scheduler_timer.start(10000)
+    calendar_group=QGroupBox(main_window._("Bandwidth Calendar"))
+    calendar_layout=QVBoxLayout(calendar_group)
+    main_window.calendar_status_label=QLabel()
+    calendar_layout.addWidget(main_window.calendar_status_label)
+    main_window.calendar_table=QTableWidget()
+    main_window.calendar_table.setColumnCount(6)
+    main_window.calendar_table.setHorizontalHeaderLabels([main_window._("Name"),main_window._("Days"),main_window._("Start"),main_window._("End"),main_window._("Max Rate"),main_window._("Max Downloads")])
+    calendar_header=main_window.calendar_table.horizontalHeader()
+    for i in range(6):
+        calendar_header.setSectionResizeMode(i,QHeaderView.ResizeToContents)
+    calendar_layout.addWidget(main_window.calendar_table)
+    calendar_button_layout=QHBoxLayout()
+    add_window_button=QPushButton(main_window._("Add Window"))
+    add_window_button.clicked.connect(main_window.add_calendar_window_dialog)
+    remove_window_button=QPushButton(main_window._("Remove Selected"))
+    remove_window_button.clicked.connect(main_window.remove_calendar_windows)
+    calendar_button_layout.addWidget(add_window_button)
+    calendar_button_layout.addWidget(remove_window_button)
+    calendar_layout.addLayout(calendar_button_layout)
+    layout.addWidget(calendar_group)
     layout.addStretch()
     return page
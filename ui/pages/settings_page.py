@@ -1,3 +1,4 @@
+import shutil
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QGroupBox, QHBoxLayout, QFormLayout
 from PyQt5.QtWidgets import QComboBox, QLineEdit, QPushButton, QFileDialog
 
@@ -59,10 +60,31 @@ def create_settings_page(main_window):
         main_window.rate_limit_line_edit.setText(main_window.user_profile.get_rate_limit())
     apply_rate_button=QPushButton(main_window._("Apply"))
     apply_rate_button.clicked.connect(main_window.apply_rate_limit_settings)
-    speed_layout.addWidget(LabelWrapper(main_window._("Max Rate:")))
+    speed_layout.addWidget(LabelWrapper(main_window._("Total Max Rate:")))
     speed_layout.addWidget(main_window.rate_limit_line_edit)
     speed_layout.addWidget(apply_rate_button)
     layout.addWidget(speed_group)
+    acceleration=main_window.acceleration_defaults()
+    acceleration_group=QGroupBox(main_window._("Download Acceleration"))
+    acceleration_layout=QFormLayout(acceleration_group)
+    main_window.fragments_combo=QComboBox()
+    main_window.fragments_combo.addItems(["1","2","4","8","16"])
+    main_window.fragments_combo.setCurrentText(str(acceleration.concurrent_fragments))
+    main_window.chunk_size_line_edit=QLineEdit()
+    main_window.chunk_size_line_edit.setPlaceholderText(main_window._("e.g., 10M (empty = off)"))
+    main_window.chunk_size_line_edit.setText(acceleration.http_chunk_size or "")
+    main_window.external_downloader_combo=QComboBox()
+    main_window.external_downloader_combo.addItem(main_window._("Built-in"),None)
+    for name in ["aria2c","axel"]:
+        main_window.external_downloader_combo.addItem(name if shutil.which(name) else name+" "+main_window._("(not installed)"),name)
+    main_window.external_downloader_combo.setCurrentIndex(max(main_window.external_downloader_combo.findData(acceleration.external_downloader),0))
+    apply_acceleration_button=QPushButton(main_window._("Apply"))
+    apply_acceleration_button.clicked.connect(main_window.apply_acceleration_settings)
+    acceleration_layout.addRow(main_window._("Concurrent Fragments:"),main_window.fragments_combo)
+    acceleration_layout.addRow(main_window._("HTTP Chunk Size:"),main_window.chunk_size_line_edit)
+    acceleration_layout.addRow(main_window._("External Downloader:"),main_window.external_downloader_combo)
+    acceleration_layout.addWidget(apply_acceleration_button)
+    layout.addWidget(acceleration_group)
     language_group=QGroupBox(main_window._("Language"))
     language_layout=QHBoxLayout(language_group)
     main_window.language_combo=QComboBox()
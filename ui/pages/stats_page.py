@@ -0,0 +1,39 @@
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QTableWidget, QHBoxLayout, QPushButton, QGroupBox, QHeaderView
+
+def create_stats_page(main_window):
+    page=QWidget()
+    layout=QVBoxLayout(page)
+    label=QLabel(main_window._("Download Statistics"))
+    layout.addWidget(label)
+    main_window.stats_summary_label=QLabel()
+    main_window.stats_summary_label.setWordWrap(True)
+    layout.addWidget(main_window.stats_summary_label)
+    timings_group=QGroupBox(main_window._("Phase Timings"))
+    timings_layout=QVBoxLayout(timings_group)
+    main_window.stats_timings_table=QTableWidget()
+    main_window.stats_timings_table.setColumnCount(4)
+    main_window.stats_timings_table.setHorizontalHeaderLabels([main_window._("Phase"),main_window._("p50 (s)"),main_window._("p95 (s)"),main_window._("Samples")])
+    main_window.stats_timings_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+    timings_layout.addWidget(main_window.stats_timings_table)
+    layout.addWidget(timings_group)
+    workers_group=QGroupBox(main_window._("Throughput per Worker"))
+    workers_layout=QVBoxLayout(workers_group)
+    main_window.stats_workers_table=QTableWidget()
+    main_window.stats_workers_table.setColumnCount(2)
+    main_window.stats_workers_table.setHorizontalHeaderLabels([main_window._("Worker"),main_window._("MB/s")])
+    main_window.stats_workers_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+    workers_layout.addWidget(main_window.stats_workers_table)
+    layout.addWidget(workers_group)
+    main_window.stats_export_label=QLabel()
+    main_window.stats_export_label.setWordWrap(True)
+    layout.addWidget(main_window.stats_export_label)
+    button_layout=QHBoxLayout()
+    refresh_button=QPushButton(main_window._("Refresh"))
+    refresh_button.clicked.connect(main_window.render_stats_page)
+    export_button=QPushButton(main_window._("Export Now"))
+    export_button.clicked.connect(lambda:main_window.export_metrics(True))
+    button_layout.addWidget(refresh_button)
+    button_layout.addWidget(export_button)
+    layout.addLayout(button_layout)
+    layout.addStretch()
+    return page
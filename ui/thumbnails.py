@@ -0,0 +1,63 @@
+from collections import OrderedDict
+from PyQt5.QtCore import Qt, QObject, QSize, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap
+
+ROW_THUMBNAIL_SIZE=QSize(42,24)
+
+class PixmapCache:
+    def __init__(self,max_items=300):
+        self.max_items=max_items
+        self.items=OrderedDict()
+    def get(self,key):
+        pixmap=self.items.get(key)
+        if pixmap is not None:
+            self.items.move_to_end(key)
+        return pixmap
+    def put(self,key,pixmap):
+        self.items[key]=pixmap
+        self.items.move_to_end(key)
+        while len(self.items)>self.max_items:
+            self.items.popitem(last=False)
+    def __len__(self):
+        return len(self.items)
+
+class ThumbnailLoader(QObject):
+    image_ready=pyqtSignal(str,object,QImage)
+    failed=pyqtSignal(str,str)
+    pixmap_ready=pyqtSignal(str,QSize)
+    def __init__(self,service,max_items=300,parent=None):
+        super().__init__(parent)
+        self.service=service
+        self.pixmaps=PixmapCache(max_items)
+        self.pending=set()
+        self.missing=set()
+        self.image_ready.connect(self.store_image)
+    def pixmap(self,url,size,extract=False):
+        key=(url,size.width(),size.height())
+        if extract:
+            self.missing.discard(key)
+        pixmap=self.pixmaps.get(key)
+        if pixmap is None and key not in self.pending and key not in self.missing:
+            self.pending.add(key)
+            self.service.submit(url,extract).add_done_callback(lambda future:self.decode(key,size,future))
+        return pixmap
+    def decode(self,key,size,future):
+        try:
+            data=future.result()
+        except Exception as e:
+            self.failed.emit(key[0],str(e))
+            data=None
+        else:
+            if data is None:
+                self.failed.emit(key[0],"No thumbnail found for this video.")
+        image=QImage.fromData(data) if data else QImage()
+        if not image.isNull():
+            image=image.scaled(size,Qt.KeepAspectRatio,Qt.SmoothTransformation)
+        self.image_ready.emit(key[0],key,image)
+    def store_image(self,url,key,image):
+        self.pending.discard(key)
+        if image.isNull():
+            self.missing.add(key)
+            return
+        self.pixmaps.put(key,QPixmap.fromImage(image))
+        self.pixmap_ready.emit(url,QSize(key[1],key[2]))
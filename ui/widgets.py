@@ -1,5 +1,5 @@
 from PyQt5.QtWidgets import QLineEdit
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QObject, QEvent, QTimer
 
 class DragAndDropLineEdit(QLineEdit):
     def __init__(self,placeholder="Enter or drag a link here..."):
@@ -15,3 +15,16 @@ class DragAndDropLineEdit(QLineEdit):
             self.setText(text)
         else:
             self.setText(text.replace("file://",""))
+
+class FirstPaintWatcher(QObject):
+    def __init__(self,widget,callback):
+        super().__init__(widget)
+        self.callback=callback
+        widget.installEventFilter(self)
+    def eventFilter(self,watched,event):
+        if event.type()==QEvent.Paint and self.callback is not None:
+            callback=self.callback
+            self.callback=None
+            watched.removeEventFilter(self)
+            QTimer.singleShot(0,callback)
+        return False